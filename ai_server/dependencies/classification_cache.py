@@ -0,0 +1,189 @@
+"""
+Classification Cache Module
+정규화한 본문 해시와 URL로 분류 결과를 재사용하는 2단 캐시 (프로세스 내 LRU + DB)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from dependencies.database import DbSession
+from models.models import ClassificationCache as CacheRow
+
+logger = logging.getLogger(__name__)
+
+# DB에 보관할 최대 항목 수 (넘으면 오래 안 쓴 것부터 삭제)
+CLASSIFICATION_CACHE_MAX = int(os.getenv("CLASSIFICATION_CACHE_MAX", "100000"))
+# 프로세스 내 LRU 크기
+CLASSIFICATION_MEMORY_MAX = int(os.getenv("CLASSIFICATION_MEMORY_MAX", "10000"))
+# URL로 찾은 결과를 크롤링 없이 쓰는 기간 (지나면 다시 크롤링해서 본문 해시로 확인, 수정된 글 반영)
+URL_CACHE_TTL = timedelta(days=7)
+# 이 간격보다 오래됐을 때만 last_used_at 갱신 (조회마다 쓰지 않도록)
+TOUCH_INTERVAL = timedelta(hours=1)
+# 몇 번 저장할 때마다 크기 확인 후 정리할지
+EVICT_EVERY = 100
+
+
+class CachedClassification:
+    """캐시된 분류 결과 DTO"""
+    __slots__ = ("content_hash", "url", "title", "topics", "created_at", "tags")
+
+    def __init__(self, content_hash: str, url: str, title: str, topics: List[str], created_at: datetime, tags: Optional[List[str]] = None):
+        self.content_hash = content_hash
+        self.url = url
+        self.title = title
+        self.topics = topics
+        self.created_at = created_at
+        self.tags = tags
+
+
+def content_hash(text: str) -> str:
+    """공백과 대소문자 차이를 무시한 본문 해시"""
+    normalized = re.sub(r"\s+", " ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    분류 결과 캐시
+
+    version(프롬프트 + 모델 해시)이 다른 항목은 없는 것으로 보므로,
+    프롬프트나 UPSTAGE_MODEL을 바꾸면 예전 결과는 자연히 무효가 되고 LRU 정리로 빠진다.
+    DB 장애 시에는 캐시 없이 동작한다 (조회는 miss, 저장은 건너뜀).
+    """
+
+    def __init__(self, version: str, max_entries: int = CLASSIFICATION_CACHE_MAX, memory_entries: int = CLASSIFICATION_MEMORY_MAX):
+        self.version = version
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        # ("hash", content_hash) / ("url", url) -> CachedClassification
+        self._memory: OrderedDict = OrderedDict()
+        self._writes = 0
+
+    def _remember(self, entry: CachedClassification):
+        for key in (("hash", entry.content_hash), ("url", entry.url)):
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _recall(self, key) -> Optional[CachedClassification]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+    def _load(self, **filters) -> Optional[CachedClassification]:
+        """DB에서 현재 버전 항목 조회 (오래 안 쓴 항목이면 last_used_at 갱신)"""
+        db: Session = DbSession()
+        try:
+            row = db.query(CacheRow).filter_by(version=self.version, **filters).order_by(CacheRow.created_at.desc()).first()
+            if row is None:
+                return None
+
+            entry = CachedClassification(row.content_hash, row.url, row.title, row.topics.split(","), row.created_at)
+            now = datetime.utcnow()
+            if row.last_used_at < now - TOUCH_INTERVAL:
+                row.last_used_at = now
+                db.commit()
+            return entry
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to read classification cache: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, entry: CachedClassification):
+        db: Session = DbSession()
+        try:
+            values = {
+                "content_hash": entry.content_hash,
+                "url": entry.url,
+                "title": entry.title,
+                "tags": json.dumps(entry.tags, ensure_ascii=False) if entry.tags else None,
+                "topics": ",".join(entry.topics),
+                "version": self.version,
+                "created_at": entry.created_at,
+                "last_used_at": entry.created_at,
+            }
+            stmt = insert(CacheRow).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CacheRow.content_hash],
+                set_={key: stmt.excluded[key] for key in values if key != "content_hash"}
+            )
+            db.execute(stmt)
+
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to write classification cache: {e}")
+        finally:
+            db.close()
+
+    def _evict(self, db: Session):
+        """최대 크기를 넘은 만큼 오래 안 쓴 항목 삭제 (커밋은 호출자가)"""
+        excess = db.query(func.count(CacheRow.content_hash)).scalar() - self.max_entries
+        if excess <= 0:
+            return
+
+        oldest = db.query(CacheRow.content_hash).order_by(CacheRow.last_used_at).limit(excess).subquery()
+        deleted = db.query(CacheRow).filter(CacheRow.content_hash.in_(db.query(oldest.c.content_hash))).delete(synchronize_session=False)
+        logger.info(f"Evicted {deleted} classification cache entries")
+
+    async def get_by_url(self, url: str) -> Optional[CachedClassification]:
+        """
+        URL로 조회 (URL_CACHE_TTL 안에 분류한 결과만, 크롤링 전에 사용)
+
+        Returns:
+            CachedClassification, 없으면 None
+        """
+        entry = self._recall(("url", url))
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, url=url)
+            if entry is not None:
+                self._remember(entry)
+
+        if entry is None or entry.created_at < datetime.utcnow() - URL_CACHE_TTL:
+            return None
+        return entry
+
+    async def get(self, hash_: str, url: str) -> Optional[List[str]]:
+        """
+        본문 해시로 조회
+
+        Args:
+            hash_: content_hash()로 만든 본문 해시
+            url: 지금 처리 중인 글 URL (다른 URL의 같은 본문이면 이 URL로도 찾을 수 있게 기억)
+
+        Returns:
+            카테고리 목록, 없으면 None
+        """
+        entry = self._recall(("hash", hash_))
+        if entry is None:
+            entry = await asyncio.to_thread(self._load, content_hash=hash_)
+            if entry is None:
+                return None
+        if entry.url != url:
+            entry = CachedClassification(entry.content_hash, url, entry.title, entry.topics, entry.created_at)
+        self._remember(entry)
+        return entry.topics
+
+    async def put(self, hash_: str, url: str, title: str, topics: List[str], tags: Optional[List[str]] = None):
+        """분류 결과 저장 (빈 결과는 저장하지 않음, 태그는 로컬 분류기 학습용으로 함께 보관)"""
+        if not topics:
+            return
+        entry = CachedClassification(hash_, url, title, topics, datetime.utcnow(), tags)
+        self._remember(entry)
+        await asyncio.to_thread(self._store, entry)
@@ -0,0 +1,168 @@
+"""
+Shared Rate Limiter Module
+여러 워커(파드)가 DB의 토큰 버킷 하나를 나눠 쓰는 외부 API 호출 속도 제한
+"""
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from dependencies.database import DbSession
+from models.models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# 버킷이 비어 있을 때 한 번에 기다리는 최대 시간 (초, 다른 워커가 반납한 토큰을 다시 확인)
+MAX_WAIT_SECONDS = 5.0
+# 429 이후 줄일 수 있는 최소 채움 속도 배율 / 성공할 때마다 되돌리는 양
+MIN_RATE_SCALE = 0.1
+RATE_SCALE_RECOVERY = 0.05
+# Retry-After가 없을 때 모든 워커가 쉬는 시간 (초)
+DEFAULT_RETRY_AFTER = 5.0
+
+
+class BucketState:
+    """버킷 한 시점의 상태 (DB 행과 분리된 계산용)"""
+
+    def __init__(self, request_tokens: float, token_tokens: float, rate_scale: float, throttled_until: Optional[datetime]):
+        self.request_tokens = request_tokens
+        self.token_tokens = token_tokens
+        self.rate_scale = rate_scale
+        self.throttled_until = throttled_until
+
+
+class SharedRateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 지키는 공유 토큰 버킷
+
+    버킷 상태는 RATE_LIMIT_BUCKET 행 하나에 두고 SELECT ... FOR UPDATE로 갱신하므로,
+    워커가 몇 개든 합산 속도가 할당량을 넘지 않는다. 시각은 DB 시계를 쓴다 (파드 간 시계 차이 무시).
+    429를 받으면 채움 속도를 절반으로 줄이고 Retry-After 동안 모든 워커가 멈추며,
+    성공할 때마다 조금씩 원래 속도로 되돌린다 (AIMD).
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float, burst_seconds: float = 10.0):
+        self.name = name
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        # 버킷 크기: burst_seconds 동안 채워지는 양 (최소 요청 하나)
+        self.request_capacity = max(1.0, self.request_rate * burst_seconds)
+        self.token_capacity = max(1.0, self.token_rate * burst_seconds)
+
+    def _refill(self, state: BucketState, elapsed: float) -> BucketState:
+        """경과 시간만큼 채운 상태"""
+        elapsed = max(0.0, elapsed)
+        state.request_tokens = min(self.request_capacity, state.request_tokens + elapsed * self.request_rate * state.rate_scale)
+        state.token_tokens = min(self.token_capacity, state.token_tokens + elapsed * self.token_rate * state.rate_scale)
+        return state
+
+    def _take(self, state: BucketState, now: datetime, tokens: float) -> float:
+        """
+        요청 하나와 tokens만큼 차감 시도
+
+        Returns:
+            성공하면 0, 부족하면 채워질 때까지 기다릴 시간 (초)
+        """
+        if state.throttled_until is not None and state.throttled_until > now:
+            return (state.throttled_until - now).total_seconds()
+
+        # 버킷보다 큰 요청은 가득 찼을 때 보내도록 상한
+        tokens = min(tokens, self.token_capacity)
+
+        if state.request_tokens >= 1 and state.token_tokens >= tokens:
+            state.request_tokens -= 1
+            state.token_tokens -= tokens
+            return 0.0
+
+        request_wait = max(0.0, 1 - state.request_tokens) / (self.request_rate * state.rate_scale)
+        token_wait = max(0.0, tokens - state.token_tokens) / (self.token_rate * state.rate_scale)
+        return max(request_wait, token_wait)
+
+    def _locked(self, db: Session):
+        """버킷 행을 잠그고 (없으면 가득 찬 상태로 생성) DB 기준 현재 시각과 함께 반환"""
+        now = db.query(func.localtimestamp()).scalar()
+        db.execute(insert(RateLimitBucket).values(
+            name=self.name,
+            request_tokens=self.request_capacity,
+            token_tokens=self.token_capacity,
+            updated_at=now,
+            rate_scale=1.0
+        ).on_conflict_do_nothing(index_elements=[RateLimitBucket.name]))
+
+        row = db.query(RateLimitBucket).filter(RateLimitBucket.name == self.name).with_for_update().one()
+        state = self._refill(
+            BucketState(row.request_tokens, row.token_tokens, row.rate_scale, row.throttled_until),
+            (now - row.updated_at).total_seconds()
+        )
+        return row, state, now
+
+    @staticmethod
+    def _store(row: RateLimitBucket, state: BucketState, now: datetime):
+        row.request_tokens = state.request_tokens
+        row.token_tokens = state.token_tokens
+        row.rate_scale = state.rate_scale
+        row.throttled_until = state.throttled_until
+        row.updated_at = now
+
+    def _update(self, apply) -> float:
+        """버킷을 잠근 채 apply(state, now)를 적용하고 커밋, apply의 반환값을 돌려줌"""
+        db: Session = DbSession()
+        try:
+            row, state, now = self._locked(db)
+            result = apply(state, now)
+            self._store(row, state, now)
+            db.commit()
+            return result
+        except Exception as e:
+            db.rollback()
+            # DB 장애로 전체 처리가 멈추지 않도록 통과시키고, 초과분은 429 처리에 맡김
+            logger.warning(f"Rate limiter '{self.name}' unavailable, passing through: {e}")
+            return 0.0
+        finally:
+            db.close()
+
+    async def acquire(self, tokens: float):
+        """요청 하나와 예상 토큰 수만큼 얻을 때까지 대기"""
+        while True:
+            wait = await asyncio.to_thread(self._update, lambda state, now: self._take(state, now, tokens))
+            if wait <= 0:
+                return
+            # 여러 워커가 같은 순간에 다시 몰리지 않도록 지터
+            await asyncio.sleep(min(wait, MAX_WAIT_SECONDS) + random.uniform(0, 0.2))
+
+    async def record_success(self, estimated_tokens: float, actual_tokens: Optional[float]):
+        """
+        성공한 호출 반영: 예상과 실제 토큰 수 차이를 정산하고 채움 속도를 조금 되돌림
+
+        Args:
+            estimated_tokens: acquire에서 차감한 토큰 수
+            actual_tokens: 응답의 usage (없으면 정산하지 않음)
+        """
+        def apply(state: BucketState, now: datetime):
+            if actual_tokens is not None:
+                state.token_tokens = min(self.token_capacity, state.token_tokens + estimated_tokens - actual_tokens)
+            state.rate_scale = min(1.0, state.rate_scale + RATE_SCALE_RECOVERY)
+            return 0.0
+
+        await asyncio.to_thread(self._update, apply)
+
+    async def record_throttled(self, retry_after: Optional[float]):
+        """
+        429 반영: 채움 속도를 절반으로 줄이고 Retry-After 동안 모든 워커를 멈춤
+
+        Args:
+            retry_after: 응답의 Retry-After (초, 없으면 DEFAULT_RETRY_AFTER)
+        """
+        def apply(state: BucketState, now: datetime):
+            state.rate_scale = max(MIN_RATE_SCALE, state.rate_scale / 2)
+            until = now + timedelta(seconds=retry_after if retry_after is not None else DEFAULT_RETRY_AFTER)
+            if state.throttled_until is None or state.throttled_until < until:
+                state.throttled_until = until
+            logger.warning(f"Throttled on '{self.name}', rate lowered to {state.rate_scale:.2f}x until {state.throttled_until}")
+            return 0.0
+
+        await asyncio.to_thread(self._update, apply)
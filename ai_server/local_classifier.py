@@ -0,0 +1,229 @@
+#로컬 1차 분류기: 제목 + RSS 태그로 카테고리를 먼저 추정하고, 확신이 낮은 글만 Upstage로 보냄
+#
+# 사용법
+#   python local_classifier.py train                  # POSTS + CLASSIFICATION_CACHE 전체로 학습해 LOCAL_CLASSIFIER_PATH에 저장
+#   python local_classifier.py evaluate --threshold 0.95   # 80%로 학습, 20%로 정확도와 임계값별 처리 비율 확인
+#
+# DATABASE_URL이 설정되어 있어야 함
+import os
+import re
+import json
+import math
+import hashlib
+import logging
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 모델 파일 경로 (없으면 로컬 분류 없이 모두 Upstage로)
+LOCAL_CLASSIFIER_PATH = os.getenv("LOCAL_CLASSIFIER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_classifier.json"))
+# 1위 카테고리 확률이 이 값 이상일 때만 로컬 결과 사용
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.95"))
+# 학습 예시가 이보다 적은 라벨은 버림 (예전 응답의 오타 등)
+MIN_CLASS_EXAMPLES = 20
+# 라플라스 스무딩
+ALPHA = 1.0
+# 글자 n-gram 범위
+NGRAM_RANGE = (2, 3)
+MODEL_FORMAT_VERSION = 1
+
+Example = Tuple[str, Optional[List[str]], str]  # (제목, 태그, 카테고리)
+
+
+def extract_features(title: str, tags: Optional[List[str]] = None) -> Counter:
+    """
+    제목의 단어별 글자 n-gram + 태그 전체를 특징으로
+
+    한국어 제목은 띄어쓰기가 제각각이라 단어 대신 글자 n-gram을 쓰고,
+    태그(예: react, 맛집)는 그 자체로 강한 신호라 통째로 하나의 특징으로 둔다.
+    """
+    features = Counter()
+    for word in re.findall(r"[0-9a-z가-힣]+", (title or "").lower()):
+        padded = f" {word} "
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            for i in range(len(padded) - n + 1):
+                features[padded[i:i + n]] += 1
+    for tag in tags or []:
+        tag = re.sub(r"\s+", "", tag.lower())
+        if tag:
+            features[f"#{tag}"] += 1
+    return features
+
+
+class LocalClassifier:
+    """
+    다항 나이브 베이즈 분류기
+
+    외부 의존성 없이 카운트만 저장하며, 예측은 특징마다 dict 조회 한 번이라 글 하나에 수십 마이크로초 수준이다.
+    """
+
+    def __init__(self, class_counts: Dict[str, int], feature_counts: Dict[str, Dict[str, int]]):
+        self.class_counts = class_counts
+        self.feature_counts = feature_counts
+        self.categories = sorted(class_counts)
+
+        vocab = set()
+        for counts in feature_counts.values():
+            vocab.update(counts)
+        total = sum(class_counts.values())
+
+        # 예측용 로그 확률 (특징이 없는 카테고리는 unseen 값)
+        self._log_prior = {c: math.log(class_counts[c] / total) for c in self.categories}
+        self._log_unseen = {}
+        self._log_likelihood = {}
+        for c in self.categories:
+            denominator = sum(feature_counts[c].values()) + ALPHA * len(vocab)
+            self._log_unseen[c] = math.log(ALPHA / denominator)
+            self._log_likelihood[c] = {f: math.log((n + ALPHA) / denominator) for f, n in feature_counts[c].items()}
+        self._vocab = vocab
+
+    @classmethod
+    def train(cls, examples: Iterable[Example]) -> "LocalClassifier":
+        class_counts = Counter()
+        feature_counts = defaultdict(Counter)
+        for title, tags, category in examples:
+            class_counts[category] += 1
+            feature_counts[category].update(extract_features(title, tags))
+
+        class_counts = {c: n for c, n in class_counts.items() if n >= MIN_CLASS_EXAMPLES}
+        if len(class_counts) < 2:
+            raise ValueError(f"Not enough training data: {dict(class_counts)}")
+        return cls(class_counts, {c: dict(feature_counts[c]) for c in class_counts})
+
+    def predict_proba(self, title: str, tags: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        카테고리별 확률
+
+        Returns:
+            {카테고리: 확률}, 확률 높은 순
+        """
+        features = [(f, n) for f, n in extract_features(title, tags).items() if f in self._vocab]
+        scores = {}
+        for c in self.categories:
+            likelihood = self._log_likelihood[c]
+            unseen = self._log_unseen[c]
+            scores[c] = self._log_prior[c] + sum(n * likelihood.get(f, unseen) for f, n in features)
+
+        top = max(scores.values())
+        exp = {c: math.exp(s - top) for c, s in scores.items()}
+        total = sum(exp.values())
+        return dict(sorted(((c, v / total) for c, v in exp.items()), key=lambda item: item[1], reverse=True))
+
+    def classify(self, title: str, tags: Optional[List[str]] = None, threshold: float = LOCAL_CLASSIFIER_THRESHOLD) -> Optional[List[str]]:
+        """
+        확신이 충분하면 상위 2개 카테고리, 아니면 None (Upstage로 분류)
+        """
+        if not title and not tags:
+            return None
+        proba = self.predict_proba(title, tags)
+        ranked = list(proba)
+        if proba[ranked[0]] < threshold:
+            return None
+        return ranked[:2]
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "format": MODEL_FORMAT_VERSION,
+                "class_counts": self.class_counts,
+                "feature_counts": self.feature_counts,
+            }, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str = LOCAL_CLASSIFIER_PATH) -> Optional["LocalClassifier"]:
+        """모델 파일 로드, 없거나 읽을 수 없으면 None"""
+        if not os.path.exists(path):
+            logger.info(f"Local classifier model not found ({path}), every article goes to Upstage")
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != MODEL_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {data.get('format')}")
+            model = cls(data["class_counts"], data["feature_counts"])
+            logger.info(f"Loaded local classifier ({sum(model.class_counts.values())} examples, {len(model._vocab)} features)")
+            return model
+        except Exception as e:
+            logger.error(f"Failed to load local classifier {path}: {e}")
+            return None
+
+
+def load_examples() -> List[Tuple[str, Example]]:
+    """
+    학습 데이터: POSTS의 제목과 카테고리, 태그는 분류 캐시에 남은 것
+
+    Returns:
+        [(url, (title, tags, category))]
+    """
+    from dependencies.database import DbSession
+    from models.models import Posts, ClassificationCache
+
+    db = DbSession()
+    try:
+        examples = {}
+        for url, title, category in db.query(Posts.url, Posts.title, Posts.category).yield_per(1000):
+            examples[url] = (title, None, category.strip().lower())
+        # 캐시에는 태그가 있으므로 같은 URL이면 캐시 쪽을 사용
+        for row in db.query(ClassificationCache.url, ClassificationCache.title, ClassificationCache.tags, ClassificationCache.topics).yield_per(1000):
+            tags = json.loads(row.tags) if row.tags else None
+            examples[row.url] = (row.title, tags, row.topics.split(",")[0].strip().lower())
+        return list(examples.items())
+    finally:
+        db.close()
+
+
+def _is_holdout(url: str) -> bool:
+    # URL 해시로 나눠 실행마다 같은 평가 세트
+    return int(hashlib.md5(url.encode("utf-8")).hexdigest(), 16) % 5 == 0
+
+
+def evaluate(threshold: float):
+    examples = load_examples()
+    train_set = [example for url, example in examples if not _is_holdout(url)]
+    test_set = [example for url, example in examples if _is_holdout(url)]
+    model = LocalClassifier.train(train_set)
+    test_set = [example for example in test_set if example[2] in model.class_counts]
+
+    logger.info(f"Train {len(train_set)} / test {len(test_set)} examples")
+    if not test_set:
+        return
+
+    correct = 0
+    confident = 0
+    confident_correct = 0
+    for title, tags, category in test_set:
+        proba = model.predict_proba(title, tags)
+        best = next(iter(proba))
+        correct += best == category
+        if proba[best] >= threshold:
+            confident += 1
+            confident_correct += best == category
+
+    logger.info(f"Top-1 accuracy (all): {correct / len(test_set):.3f}")
+    logger.info(f"Threshold {threshold}: {confident / len(test_set):.1%} handled locally, accuracy {confident_correct / max(confident, 1):.3f}")
+
+
+def train(output: str):
+    examples = [example for _, example in load_examples()]
+    model = LocalClassifier.train(examples)
+    model.save(output)
+    logger.info(f"Trained on {len(examples)} examples {model.class_counts}, saved to {output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    parser = argparse.ArgumentParser(description="로컬 1차 분류기 학습 / 평가")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train_parser = commands.add_parser("train")
+    train_parser.add_argument("--output", default=LOCAL_CLASSIFIER_PATH)
+    evaluate_parser = commands.add_parser("evaluate")
+    evaluate_parser.add_argument("--threshold", type=float, default=LOCAL_CLASSIFIER_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        train(args.output)
+    else:
+        evaluate(args.threshold)
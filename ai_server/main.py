@@ -1,15 +1,16 @@
-import pika
+import aio_pika
+import asyncio
 import json
 import os
+import signal
 from dotenv import load_dotenv
 import ssl
 import logging
 from enum import Enum
-from service import consume_message_queue, refresh_materialized_view
+from aio_pika.abc import AbstractIncomingMessage, AbstractChannel
+from service import consume_message_queue, refresh_materialized_view, create_http_client
 from dependencies.database import Base, engine
 from models.models import Posts
-from pika.channel import Channel
-from threading import Thread
 
 Base.metadata.create_all(bind=engine)
 
@@ -23,10 +24,22 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+# 동시에 처리할 글 수 (크롤링 + 분류 + 저장), new_posts 채널의 prefetch도 같은 값
+AI_CONCURRENCY = int(os.getenv("AI_CONCURRENCY", "32"))
+# refresh 큐 prefetch (처리는 락으로 한 번에 하나씩)
+REFRESH_PREFETCH = 100
+
 
 total_article_count = 0
 current_article_count = 0
 
+# observer 샤드별 init 집계 (같은 run_id의 init을 shard_count개 모두 받아야 총합이 확정됨)
+current_run_id = None
+received_init_shards = set()
+expected_shard_count = 1
+# 직전 실행이 refresh까지 끝났는지 (끝났다면 그 뒤의 progress는 새 실행의 것)
+run_completed = True
+
 # 오타 방지
 class Channels(Enum):
     NEW_POSTS = 'new_posts'
@@ -34,13 +47,195 @@ class Channels(Enum):
     PLATFORM_REGISTER = 'platform_register'
 
 
-def get_rabbitmq_connection():
-    
+class Worker:
+    """
+    asyncio 기반 메시지 처리기
+
+    메시지마다 태스크를 만들어 동시에 처리하고, 글 단위 동시 처리 수는 세마포어로 제한한다.
+    ack는 각 메시지 처리가 끝나는 대로 보낸다 (순서 무관).
+    """
+
+    def __init__(self, channel: AbstractChannel, http, concurrency: int = AI_CONCURRENCY):
+        self.channel = channel
+        self.http = http
+        self._article_slots = asyncio.Semaphore(concurrency)
+        # refresh 집계는 전역 카운터를 바꾸므로 한 번에 하나씩
+        self._refresh_lock = asyncio.Lock()
+        self._tasks = set()
+
+    def spawn(self, handler):
+        """메시지 핸들러를 태스크로 실행 (aio-pika 콜백은 바로 반환)"""
+        async def on_message(message: AbstractIncomingMessage):
+            task = asyncio.create_task(handler(message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return on_message
+
+    async def drain(self):
+        """진행 중인 메시지 처리가 끝날 때까지 대기"""
+        if self._tasks:
+            logger.info(f"Waiting for {len(self._tasks)} in-flight messages")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def consume_article(self, link: str, user_id: str, platform: str, published_at: str, tags=None):
+        async with self._article_slots:
+            await consume_message_queue(self.http, link, user_id, platform, published_at, tags)
+
+    async def publish_progress(self, count: int = 1):
+        # count: 처리를 마친 글 수 (묶음 메시지는 한 번에 보고)
+        msg = json.dumps({"type": "progress", "count": count}, ensure_ascii=False)
+        await self.channel.default_exchange.publish(aio_pika.Message(body=msg.encode()), routing_key=Channels.REFRESH.value)
+
+    async def callback_new_posts(self, message: AbstractIncomingMessage):
+        data = json.loads(message.body)
+        logger.info(f"Received message: {data}")
+
+        # version 2: 한 사용자-플랫폼의 새 글 묶음
+        if data.get('version', 1) >= 2:
+            await self._consume_new_posts_batch(message, data)
+            return
+
+        try:
+            await self.consume_article(data['article']['link'], data['user_id'], data['platform'], data['article']['published_at'], data['article'].get('tags'))
+            await self.publish_progress()
+            await message.ack()
+        except Exception as e:
+            logger.error(f"Failed to process message(new_posts): {e}")
+            # 실패한 경우라도 카운팅은 해야하니 publish_progress를 호출
+            await self.publish_progress()
+            await message.nack()
+
+    async def _consume_new_posts_batch(self, message: AbstractIncomingMessage, data):
+        """
+        묶음 메시지 처리 (글마다 동시에 처리하되 ack와 progress 발행은 묶음당 한 번)
+
+        한 글이 실패해도 나머지 글은 계속 처리하고, 실패한 글도 카운팅은 해야 하므로
+        progress는 묶음의 전체 글 수로 보낸다. 다시 넣으면 성공한 글까지 progress가
+        중복되므로 묶음은 항상 ack한다.
+        """
+        articles = data['articles']
+        results = await asyncio.gather(*[
+            self.consume_article(article['link'], data['user_id'], data['platform'], article['published_at'], article.get('tags'))
+            for article in articles
+        ], return_exceptions=True)
+
+        failed = 0
+        for article, result in zip(articles, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.error(f"Failed to process article(new_posts): {article.get('link')}: {result}")
+
+        logger.info(f"Processed batch of {len(articles)} articles for {data['platform']}/{data['user_id']} ({failed} failed)")
+
+        if data.get('source') == 'websub':
+            # 푸시로 들어온 글은 observer 실행의 init 집계에 포함되지 않으므로 바로 뷰 갱신
+            await asyncio.to_thread(refresh_materialized_view)
+        else:
+            await self.publish_progress(len(articles))
+        await message.ack()
+
+    async def callback_refresh(self, message: AbstractIncomingMessage):
+        async with self._refresh_lock:
+            await self._handle_refresh(message)
+
+    async def _handle_refresh(self, message: AbstractIncomingMessage):
+        global total_article_count, current_article_count
+        global current_run_id, received_init_shards, expected_shard_count, run_completed
+        data = json.loads(message.body)
+        logger.info(f"Received message: {data}")
+
+        try:
+            msg_type = data.get('type')
+            logger.info(f"Processing message type: {msg_type}")
+
+            if msg_type == 'init':
+                run_id = data.get('run_id')
+                shard_index = data.get('shard_index', 0)
+
+                # 새 실행의 첫 init이면 집계 초기화 (run_id가 없는 이전 형식은 항상 새 실행)
+                # 다른 샤드의 init보다 먼저 도착한 progress는 보존하되,
+                # 직전 실행이 끝나지 않았다면 남은 카운트를 구분할 수 없으므로 초기화
+                if run_id is None or run_id != current_run_id:
+                    current_run_id = run_id
+                    total_article_count = 0
+                    if run_id is None or not run_completed:
+                        current_article_count = 0
+                    received_init_shards = set()
+                    run_completed = False
+
+                expected_shard_count = data.get('shard_count', 1)
+
+                # 같은 샤드의 init이 재전달되어도 한 번만 합산
+                if shard_index not in received_init_shards:
+                    received_init_shards.add(shard_index)
+                    total_article_count += data['count']
+
+                logger.info(f"Init received: {len(received_init_shards)}/{expected_shard_count} shards, total={total_article_count}")
+
+                # 다른 샤드의 글이 먼저 모두 처리된 경우
+                if _all_init_received() and 0 < total_article_count == current_article_count:
+                    await _complete_run()
+
+                await message.ack()
+                return
+
+            # 이전 형식의 progress는 count 없이 글 하나
+            current_article_count += data.get('count', 1)
+            logger.info(f"Current article count: {current_article_count}")
+            logger.info(f"Total article count: {total_article_count}")
+            if not run_completed and _all_init_received() and current_article_count == total_article_count:
+                await _complete_run()
+
+            await message.ack()
+
+        except Exception as e:
+            logger.error(f"Failed to process message(refresh): {e}")
+            await message.nack(requeue=False)
+
+    async def callback_platform_register(self, message: AbstractIncomingMessage):
+        """
+        등록한 플랫폼의 기존 글 처리 (글마다 동시에)
+
+        한 글이 실패해도 나머지는 계속 처리하고 로그만 남긴다. 메시지를 다시 넣으면
+        성공한 글까지 다시 처리하고, 계속 실패하는 글 때문에 무한히 재전달되기 때문이다.
+        """
+        data = json.loads(message.body)
+        logger.info(f"Received message: {data}")
+        try:
+            results = await asyncio.gather(*[
+                self.consume_article(article['link'], article['user_id'], article['platform'], article['published_at'], article.get('tags'))
+                for article in data
+            ], return_exceptions=True)
+
+            for article, result in zip(data, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to process article(platform_register): {article.get('link')}: {result}")
+
+            await asyncio.to_thread(refresh_materialized_view)
+            await message.ack()
+        except Exception as e:
+            logger.error(f"Failed to process message(platform_register): {e}")
+            await message.nack()
+
+
+def _all_init_received() -> bool:
+    return len(received_init_shards) >= expected_shard_count
+
+async def _complete_run():
+    global current_article_count, run_completed
+    logger.info("All articles processed")
+    await asyncio.to_thread(refresh_materialized_view)
+    logger.info("Materialized view refreshed")
+    current_article_count = 0
+    run_completed = True
+
+
+async def get_rabbitmq_connection():
     """
-    RabbitMQ 연결 생성
+    RabbitMQ 연결 생성 (끊기면 자동 재연결)
 
     Returns:
-        pika.BlockingConnection: RabbitMQ 연결 객체
+        aio_pika.RobustConnection: RabbitMQ 연결 객체
     """
     rabbitmq_url = os.getenv("RABBITMQ_HOST")
 
@@ -48,113 +243,54 @@ def get_rabbitmq_connection():
         raise ValueError("RABBITMQ_HOST environment variable not set")
 
     try:
-        # URL 파싱하여 연결 파라미터 생성
-        params = pika.URLParameters(rabbitmq_url)
-
         # SSL 인증서 검증 비활성화 (CloudAMQP 연결용)
         ssl_context = ssl.create_default_context()
         ssl_context.check_hostname = False
         ssl_context.verify_mode = ssl.CERT_NONE
-        params.ssl_options = pika.SSLOptions(ssl_context)
 
-        connection = pika.BlockingConnection(params)
-        return connection
+        return await aio_pika.connect_robust(rabbitmq_url, ssl_context=ssl_context)
     except Exception as e:
         logger.error(f"Failed to connect to RabbitMQ: {e}")
         raise
 
 
+async def start_worker():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
 
-def publish_progress(ch):
-    msg = json.dumps({"type": "progress"}, ensure_ascii=False)
-    ch.basic_publish(exchange='', routing_key=Channels.REFRESH.value, body=msg)
+    connection = await get_rabbitmq_connection()
+    async with connection, create_http_client(AI_CONCURRENCY) as http:
+        # 글 처리 채널: prefetch만큼 메시지를 동시에 받아 처리
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=AI_CONCURRENCY)
+        # refresh 채널: 글 처리가 밀려도 progress 집계가 막히지 않도록 분리
+        refresh_channel = await connection.channel()
+        await refresh_channel.set_qos(prefetch_count=REFRESH_PREFETCH)
 
-def publish_platform_register_progress(ch, user_id: str, platform: str):
-    msg = json.dumps({"type": "progress_platform_register", "user_id": user_id, "platform": platform}, ensure_ascii=False)
-    ch.basic_publish(exchange='', routing_key=Channels.REFRESH.value, body=msg)
+        worker = Worker(channel, http)
 
-def callback_new_posts(ch: Channel, method, properties, body):
-    data = json.loads(body)
-    logger.info(f"Received message: {data}")
-    logger.info(f"type: {type(data)}")
-    try:
-        consume_message_queue(data['article']['link'], data['user_id'], data['platform'], data['article']['published_at'])
-        publish_progress(ch)
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-    except Exception as e:
-        logger.error(f"Failed to process message(new_posts): {e}")
-        # 실패한 경우라도 카운팅은 해야하니 publish_progress(ch)를 호출
-        publish_progress(ch)
-        ch.basic_nack(delivery_tag=method.delivery_tag)
-        return
-    
-
-def callback_refresh(ch: Channel, method, properties, body):
-    global total_article_count, current_article_count
-    data = json.loads(body)
-    logger.info(f"Received message: {data}")
+        new_posts = await channel.declare_queue(Channels.NEW_POSTS.value)
+        platform_register = await channel.declare_queue(Channels.PLATFORM_REGISTER.value)
+        refresh = await refresh_channel.declare_queue(Channels.REFRESH.value)
 
-    try:
-        msg_type = data.get('type')
-        logger.info(f"Processing message type: {msg_type}")
+        consumers = [
+            (new_posts, await new_posts.consume(worker.spawn(worker.callback_new_posts))),
+            (platform_register, await platform_register.consume(worker.spawn(worker.callback_platform_register))),
+            (refresh, await refresh.consume(worker.spawn(worker.callback_refresh))),
+        ]
+        logger.info(f"Worker started (concurrency {AI_CONCURRENCY})")
 
-        if msg_type == 'init':
-            total_article_count = data['count']
-            current_article_count = 0
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+        await stop.wait()
 
-            platform_register_map[user_id]['current_count'] += 1
-            logger.info(f"Current article count: {platform_register_map[user_id]['current_count']}")
-            logger.info(f"Total article count: {platform_register_map[user_id]['total_count']}")
-            if platform_register_map[user_id]['current_count'] == platform_register_map[user_id]['total_count']:
-                platform_register_map.pop(user_id)
-                refresh_materialized_view()
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+        # 새 메시지 수신을 멈추고 진행 중인 메시지를 마친 뒤 종료 (ack 못 한 메시지는 브로커가 재전달)
+        logger.info("Received shutdown signal, draining in-flight messages")
+        for queue, consumer_tag in consumers:
+            await queue.cancel(consumer_tag)
+        await worker.drain()
 
-        current_article_count += 1
-        logger.info(f"Current article count: {current_article_count}")
-        logger.info(f"Total article count: {total_article_count}")
-        if current_article_count == total_article_count:
-            logger.info("All articles processed")
-            refresh_materialized_view()
-            logger.info("Materialized view refreshed")
+    logger.info("Worker stopped")
 
-        ch.basic_ack(delivery_tag=method.delivery_tag)
 
-    except Exception as e:
-        logger.error(f"Failed to process message(refresh): {e}")
-        ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
-
-
-def callback_platform_register(ch: Channel, method, properties, body):
-    data = json.loads(body)
-    logger.info(f"Received message: {data}")
-    try:
-        threads = []
-        for article in data:
-            thread = Thread(target=consume_message_queue, args=(article['link'], article['user_id'], article['platform'], article['published_at']))
-            thread.start()
-            threads.append(thread)
-        for thread in threads:
-            thread.join()
-        refresh_materialized_view()
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-    except Exception as e:
-        logger.error(f"Failed to process message(platform_register): {e}")
-        ch.basic_nack(delivery_tag=method.delivery_tag)
-        return
-
-def start_worker():
-    channel = get_rabbitmq_connection().channel()
-    channel.queue_declare(queue=Channels.NEW_POSTS.value)
-    channel.basic_consume(queue=Channels.NEW_POSTS.value, on_message_callback=callback_new_posts)
-    channel.queue_declare(queue=Channels.REFRESH.value)
-    channel.basic_consume(queue=Channels.REFRESH.value, on_message_callback=callback_refresh)
-    channel.queue_declare(queue=Channels.PLATFORM_REGISTER.value)
-    channel.basic_consume(queue=Channels.PLATFORM_REGISTER.value, on_message_callback=callback_platform_register)
-    channel.start_consuming()
-
-
-start_worker()
+asyncio.run(start_worker())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Float
 from sqlalchemy.dialects.postgresql import UUID  # Postgres 전용 UUID 타입
 from dependencies.database import Base
 import uuid
@@ -55,4 +55,35 @@ class UserStat(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("USER.user_id"), primary_key=True)
     category = Column(String(255), primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    count = Column(Integer, default=0)
\ No newline at end of file
+    count = Column(Integer, default=0)
+
+class RateLimitBucket(Base):
+    # 워커(파드) 사이에서 공유하는 외부 API 토큰 버킷 (요청 수 / 토큰 수)
+    __tablename__ = "RATE_LIMIT_BUCKET"
+
+    name = Column(String(255), primary_key=True)
+    # 지금 남은 요청 / 토큰 (updated_at 기준, 읽을 때 경과 시간만큼 채워서 계산)
+    request_tokens = Column(Float, nullable=False)
+    token_tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    # 429를 받으면 줄이고 성공하면 되돌리는 채움 속도 배율 (0~1)
+    rate_scale = Column(Float, nullable=False, default=1.0)
+    # 429의 Retry-After 동안 모든 워커가 요청을 멈춤
+    throttled_until = Column(DateTime, nullable=True)
+
+class ClassificationCache(Base):
+    # 분류 결과 캐시 (정규화한 본문 해시 기준, URL로도 조회)
+    __tablename__ = "CLASSIFICATION_CACHE"
+
+    content_hash = Column(String(64), primary_key=True)
+    url = Column(String, nullable=False, index=True)
+    title = Column(String, nullable=False)
+    # RSS 태그 (JSON 배열, 로컬 분류기 학습용)
+    tags = Column(String, nullable=True)
+    # 쉼표로 구분한 카테고리 (가능성 높은 순)
+    topics = Column(String, nullable=False)
+    # 프롬프트 + 모델 해시, 다르면 무효
+    version = Column(String(16), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # LRU 정리 기준 (조회할 때 갱신)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
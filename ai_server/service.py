@@ -1,12 +1,17 @@
-import requests
+import asyncio
+import hashlib
+import json
+import httpx
 from bs4 import BeautifulSoup
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
 import re  
 from dependencies.database import DbSession
+from dependencies.rate_limiter import SharedRateLimiter
+from dependencies.classification_cache import ClassificationCache, content_hash
+from local_classifier import LocalClassifier
 from models.models import Posts, Platform
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -14,13 +19,33 @@ import logging
 
 load_dotenv()
 
-# Upstage API 설정
-client = OpenAI(
+# Upstage API 설정 (비동기 클라이언트, 동시 요청 수는 consumer의 세마포어로 제한)
+# 429 재시도는 공유 속도 제한기가 맡으므로 SDK 자체 재시도는 끔
+client = AsyncOpenAI(
     api_key=os.environ.get("UPSTAGE_API_KEY"),
-    base_url="https://api.upstage.ai/v1/solar"
+    base_url="https://api.upstage.ai/v1/solar",
+    max_retries=0
 )
 UPSTAGE_MODEL = 'solar-1-mini-chat'
 
+# Upstage 할당량 (모든 ai_server 워커 합산)
+UPSTAGE_RPM = float(os.getenv("UPSTAGE_RPM", "100"))
+UPSTAGE_TPM = float(os.getenv("UPSTAGE_TPM", "100000"))
+# 429를 받은 요청의 최대 재시도 횟수
+UPSTAGE_MAX_RETRIES = int(os.getenv("UPSTAGE_MAX_RETRIES", "5"))
+# 토큰 수 추정: 한국어 본문은 글자 2개당 토큰 하나 정도로 보수적으로 잡고, 응답(카테고리 이름) 몫을 더함
+CHARS_PER_TOKEN = 2
+COMPLETION_TOKENS = 20
+
+upstage_limiter = SharedRateLimiter("upstage", UPSTAGE_RPM, UPSTAGE_TPM)
+
+# 묶음 분류: 한 요청에 담을 최대 글 수 / 묶음을 모으는 최대 대기 / 묶음 안에서 글 하나당 최대 글자 수
+UPSTAGE_BATCH_SIZE = int(os.getenv("UPSTAGE_BATCH_SIZE", "8"))
+UPSTAGE_BATCH_WAIT = float(os.getenv("UPSTAGE_BATCH_WAIT_MS", "200")) / 1000
+BATCH_ARTICLE_CHARS = 1500
+
+CATEGORIES = ("tech", "life", "food", "travel", "review")
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,62 +63,78 @@ def _normalize_date(date_str: str) -> str:
     return date_str # 변환 실패 시 원본 반환
 
 
-def _crawl_webpage(url: str) -> Dict[str, str]:
-    print(f"크롤링 시작: {url}")
-    
+def _to_mobile_url(url: str) -> str:
+    # 네이버 블로그는 모바일 페이지에 본문이 바로 들어 있음
     if "blog.naver.com" in url and "m.blog.naver.com" not in url:
         url = url.replace("blog.naver.com", "m.blog.naver.com")
+    return url
+
+
+def _extract_content(html: bytes) -> Dict[str, str]:
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # 제목 추출
+    og_title = soup.find('meta', property='og:title')
+    if og_title and og_title.get('content'):
+        title = og_title['content']
+    else:
+        title = soup.title.string if soup.title else "제목 없음"
+
+    # 날짜 추출 (원본 문자열 확보)
+    # raw_date = ""
+    # published_time = soup.find('meta', property='article:published_time')
+    # naver_date = soup.find('p', class_='blog_date')
+    # common_date = soup.find(class_='date')
+
+    # if published_time and published_time.get('content'):
+    #     raw_date = published_time['content']
+    # elif naver_date:
+    #     raw_date = naver_date.get_text().strip()
+    # elif common_date:
+    #     raw_date = common_date.get_text().strip()
+        
+    # # 날짜 포맷팅 적용 (YYYY-MM-DD)
+    # formatted_date = _normalize_date(raw_date)
+
+    # 본문 추출
+    paragraphs = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
+    content = " ".join(paragraphs)
+
+    return {
+        "title": title,
+        # "date": formatted_date, # 포맷팅된 날짜 반환
+        "content": content[:5000]
+    }
+
+
+def create_http_client(max_connections: int) -> httpx.AsyncClient:
+    """크롤링용 공유 AsyncClient (동시 처리 수만큼 연결 유지)"""
+    return httpx.AsyncClient(
+        headers={'User-Agent': 'Mozilla/5.0'},
+        timeout=10.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+
+async def _crawl_webpage(http: httpx.AsyncClient, url: str) -> Dict[str, str]:
+    logger.info(f"크롤링 시작: {url}")
+    url = _to_mobile_url(url)
 
     try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = await http.get(url)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # 제목 추출
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            title = og_title['content']
-        else:
-            title = soup.title.string if soup.title else "제목 없음"
-
-        # 날짜 추출 (원본 문자열 확보)
-        # raw_date = ""
-        # published_time = soup.find('meta', property='article:published_time')
-        # naver_date = soup.find('p', class_='blog_date')
-        # common_date = soup.find(class_='date')
-
-        # if published_time and published_time.get('content'):
-        #     raw_date = published_time['content']
-        # elif naver_date:
-        #     raw_date = naver_date.get_text().strip()
-        # elif common_date:
-        #     raw_date = common_date.get_text().strip()
-            
-        # # 날짜 포맷팅 적용 (YYYY-MM-DD)
-        # formatted_date = _normalize_date(raw_date)
-
-        # 본문 추출
-        paragraphs = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
-        content = " ".join(paragraphs)
-
-        return {
-            "title": title,
-            # "date": formatted_date, # 포맷팅된 날짜 반환
-            "content": content[:5000]
-        }
+        # HTML 파싱은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서
+        return await asyncio.to_thread(_extract_content, response.content)
 
     except Exception as e:
-        print(f"크롤링 오류 발생: {e}")
+        logger.error(f"크롤링 오류 발생: {url}: {e}")
         return {}
 
 
-def _classify_topics_with_upstage(text: str) -> List[str]:
-    if not text:
-        return []
-
-    prompt = (
+def _build_prompt(text: str) -> str:
+    return (
         "다음 텍스트를 분석하여 아래 5가지 카테고리 중 가장 연관성이 높은 2가지를 선택하세요.\n"
         "1. tech\n"
         "2. life\n"
@@ -106,42 +147,215 @@ def _classify_topics_with_upstage(text: str) -> List[str]:
         f"분석할 텍스트:\n---\n{text}"
     )
 
+
+def _build_batch_prompt(texts: List[str]) -> str:
+    # 카테고리 설명은 한 번만, 글마다 번호를 붙여 응답과 짝지음
+    articles = "\n\n".join(f"[{i}]\n{text[:BATCH_ARTICLE_CHARS]}" for i, text in enumerate(texts, start=1))
+    return (
+        f"다음 {len(texts)}개의 텍스트를 각각 분석하여 아래 5가지 카테고리 중 가장 연관성이 높은 2가지를 선택하세요.\n"
+        "1. tech\n"
+        "2. life\n"
+        "3. food\n"
+        "4. travel\n"
+        "5. review\n"
+        "반드시 위 목록에 있는 단어만 사용해야 하며, 가장 가능성이 높은 순서대로 2개를 고르세요.\n"
+        "텍스트 번호를 키로 하는 JSON 객체 하나만 출력하고, 다른 설명이나 문장은 절대 포함하지 마세요.\n"
+        '예시: {"1": ["tech", "life"], "2": ["food", "travel"]}\n\n'
+        f"분석할 텍스트:\n---\n{articles}"
+    )
+
+
+def _parse_batch_response(content: str, count: int) -> List[Optional[List[str]]]:
+    """
+    묶음 응답을 글 순서대로 파싱
+
+    Args:
+        content: 모델 응답 ({"1": [...], "2": [...]} 형식)
+        count: 요청한 글 수
+
+    Returns:
+        글마다 카테고리 목록, 빠졌거나 목록에 없는 카테고리만 있으면 None
+    """
+    results: List[Optional[List[str]]] = [None] * count
     try:
-        response = client.chat.completions.create(
-            model=UPSTAGE_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a text classifier. Output only the category names."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1
-        )
-        
-        content = response.choices[0].message.content
-        topics = [topic.strip() for topic in content.split(',') if topic.strip()]
-        return topics[:2]
+        # 코드 블록 등으로 감싸진 경우를 위해 가장 바깥 객체만
+        parsed = json.loads(content[content.index('{'):content.rindex('}') + 1])
+    except ValueError:
+        return results
+    if not isinstance(parsed, dict):
+        return results
+
+    for key, topics in parsed.items():
+        try:
+            index = int(key) - 1
+        except ValueError:
+            continue
+        if not 0 <= index < count or not isinstance(topics, list):
+            continue
+        valid = [topic.strip().lower() for topic in topics if isinstance(topic, str) and topic.strip().lower() in CATEGORIES]
+        if valid:
+            results[index] = valid[:2]
+    return results
 
-    except Exception as e:
-        print(f"Upstage API 오류 발생: {e}")
-        return []
 
+def _estimate_tokens(*texts: str, completions: int = 1) -> int:
+    return sum(len(t) for t in texts) // CHARS_PER_TOKEN + COMPLETION_TOKENS * completions
+
+
+def _retry_after(error: RateLimitError):
+    # Retry-After 헤더 (초), 없거나 날짜 형식이면 None
     try:
-        response = client.chat.completions.create(
-            model=UPSTAGE_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a text classifier. Output only the category names."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1
-        )
-        
-        content = response.choices[0].message.content
-        topics = [topic.strip() for topic in content.split(',') if topic.strip()]
-        return topics[:2]
+        return float(error.response.headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        return None
 
-    except Exception as e:
-        print(f"Upstage API 오류 발생: {e}")
+
+async def _chat_with_upstage(prompt: str, completions: int = 1) -> Optional[str]:
+    """
+    Upstage 채팅 요청 하나 (공유 속도 제한 + 429 재시도)
+
+    Args:
+        prompt: 사용자 메시지
+        completions: 응답에 담길 분류 결과 수 (토큰 추정용)
+
+    Returns:
+        응답 본문, 실패하면 None
+    """
+    messages = [
+        {"role": "system", "content": "You are a text classifier. Output only the category names."},
+        {"role": "user", "content": prompt}
+    ]
+    estimated_tokens = _estimate_tokens(*(m["content"] for m in messages), completions=completions)
+
+    for attempt in range(UPSTAGE_MAX_RETRIES + 1):
+        # 모든 워커가 나눠 쓰는 RPM/TPM 버킷에서 요청 하나와 예상 토큰만큼 확보
+        await upstage_limiter.acquire(estimated_tokens)
+        try:
+            response = await client.chat.completions.create(
+                model=UPSTAGE_MODEL,
+                messages=messages,
+                temperature=0.1
+            )
+        except RateLimitError as e:
+            # 버킷 속도를 줄이고 Retry-After 동안 모든 워커가 쉰 뒤 재시도
+            logger.warning(f"Upstage 429 (attempt {attempt + 1}/{UPSTAGE_MAX_RETRIES + 1})")
+            await upstage_limiter.record_throttled(_retry_after(e))
+            continue
+        except Exception as e:
+            logger.error(f"Upstage API 오류 발생: {e}")
+            return None
+
+        usage = getattr(response, "usage", None)
+        await upstage_limiter.record_success(estimated_tokens, usage.total_tokens if usage else None)
+        return response.choices[0].message.content
+
+    logger.error(f"Upstage API 재시도 초과 ({UPSTAGE_MAX_RETRIES + 1}회 429)")
+    return None
+
+
+async def _classify_topics_with_upstage(text: str) -> List[str]:
+    if not text:
         return []
 
+    content = await _chat_with_upstage(_build_prompt(text))
+    if content is None:
+        return []
+
+    topics = [topic.strip() for topic in content.split(',') if topic.strip()]
+    return topics[:2]
+
+
+async def _classify_batch_with_upstage(texts: List[str]) -> List[List[str]]:
+    """
+    여러 글을 한 요청으로 분류하고, 받은 응답에서 결과가 빠졌거나 잘못된 글만 하나씩 다시 분류
+
+    Args:
+        texts: 분류할 글 목록
+
+    Returns:
+        texts와 같은 순서의 카테고리 목록
+    """
+    if len(texts) == 1:
+        return [await _classify_topics_with_upstage(texts[0])]
+
+    content = await _chat_with_upstage(_build_batch_prompt(texts), completions=len(texts))
+    if content is None:
+        # 요청 자체가 실패하면 하나씩 다시 보내도 같은 이유로 실패하므로 (장애, 한도 초과) 빈 결과로
+        return [[] for _ in texts]
+
+    results = _parse_batch_response(content, len(texts))
+
+    retry = [i for i, topics in enumerate(results) if topics is None]
+    if retry:
+        logger.warning(f"Batch classification incomplete, retrying {len(retry)}/{len(texts)} articles one by one")
+        retried = await asyncio.gather(*[_classify_topics_with_upstage(texts[i]) for i in retry])
+        for i, topics in zip(retry, retried):
+            results[i] = topics
+
+    return results
+
+
+class TopicBatcher:
+    """
+    동시에 들어온 분류 요청을 묶어 한 번에 보내는 마이크로 배처
+
+    요청이 max_batch개 모이거나 첫 요청 후 max_wait초가 지나면 묶음을 보낸다.
+    platform_register 백필이나 new_posts가 몰릴 때는 동시 처리 중인 글들이 함께 묶이고,
+    한가할 때는 max_wait만큼만 늦어진다.
+    """
+
+    def __init__(self, max_batch: int = UPSTAGE_BATCH_SIZE, max_wait: float = UPSTAGE_BATCH_WAIT):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def classify(self, text: str) -> List[str]:
+        if not text:
+            return []
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            results = await _classify_batch_with_upstage([text for text, _ in batch])
+        except Exception as e:
+            logger.error(f"Batch classification failed: {e}")
+            results = [[] for _ in batch]
+
+        for (_, future), topics in zip(batch, results):
+            if not future.done():
+                future.set_result(topics)
+
+
+topic_batcher = TopicBatcher()
+
+# 프롬프트나 모델이 바뀌면 버전이 바뀌어 예전 캐시 항목은 무효
+CLASSIFICATION_VERSION = hashlib.sha256(
+    "\0".join([UPSTAGE_MODEL, _build_prompt(""), _build_batch_prompt([""])]).encode("utf-8")
+).hexdigest()[:16]
+classification_cache = ClassificationCache(CLASSIFICATION_VERSION)
+
+# 제목 + 태그로 먼저 분류해 보고 확신이 낮을 때만 Upstage로 (모델 파일이 없으면 None)
+local_classifier = LocalClassifier.load()
+
 def _save_to_db(url: str, title: str, date: str, topics: List[str], user_id: str, platform_name: str):
     if topics:
         print(f"   - 제목: {title}")
@@ -190,23 +404,47 @@ def refresh_materialized_view():
     finally:
         db.close()
 
-def consume_message_queue(link: str, user_id: str, platform_name: str, date: str):
-    print("\n========================================")
-    if _check_exist_post(link):
+async def consume_message_queue(http: httpx.AsyncClient, link: str, user_id: str, platform_name: str, date: str, tags: Optional[List[str]] = None):
+    """
+    글 하나 처리: 크롤링 -> 분류 (캐시 -> 로컬 분류기 -> Upstage) -> 저장 (DB 작업은 스레드에서)
+
+    Args:
+        http: 크롤링용 공유 AsyncClient
+        link: 글 URL
+        user_id: 사용자 ID
+        platform_name: 플랫폼 이름
+        date: 발행 시각
+        tags: RSS 태그 (로컬 분류기 특징)
+    """
+    if await asyncio.to_thread(_check_exist_post, link):
+        return
+
+    # 최근에 분류한 URL (저장 실패 후 재처리 등)이면 크롤링과 분류 없이 저장
+    cached = await classification_cache.get_by_url(link)
+    if cached is not None:
+        logger.info(f"Classification cache hit (url): {link}")
+        await asyncio.to_thread(_save_to_db, link, cached.title, date, cached.topics, user_id, platform_name)
         return
-    crawled_data = _crawl_webpage(link)
+
+    crawled_data = await _crawl_webpage(http, link)
     
     content = crawled_data.get("content", "")
     title = crawled_data.get("title", "")
 
     if content:
         input_text = f"제목: {title}\n본문: {content}"
-        topics = _classify_topics_with_upstage(input_text)
-        _save_to_db(link, title, date, topics, user_id, platform_name)
+        hash_ = content_hash(input_text)
+        topics = await classification_cache.get(hash_, link)
+        if topics is not None:
+            logger.info(f"Classification cache hit (content): {link}")
+        elif local_classifier is not None and (topics := local_classifier.classify(title, tags)) is not None:
+            logger.info(f"Classified locally: {link} -> {topics}")
+        else:
+            topics = await topic_batcher.classify(input_text)
+            await classification_cache.put(hash_, link, title, topics, tags)
+        await asyncio.to_thread(_save_to_db, link, title, date, topics, user_id, platform_name)
     else:
-        logger.info("No content found for URL: {url}")
-
-    time.sleep(2) 
+        logger.info(f"No content found for URL: {link}")
 
 
 if __name__ == "__main__":
@@ -214,5 +452,10 @@ if __name__ == "__main__":
         ["https://blog.naver.com/gurwn1725/224009540423", "test_id", "naver"], 
         ["https://zio2017.tistory.com/99", "test_id", "tistory"], 
     ]
-    for link in sample_links:
-        consume_message_queue(*link)
\ No newline at end of file
+
+    async def _run_samples():
+        async with create_http_client(len(sample_links)) as http:
+            for link in sample_links:
+                await consume_message_queue(http, *link, None)
+
+    asyncio.run(_run_samples())
\ No newline at end of file
@@ -3,11 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .routers.auth_router import router as auth_router
 from .dependencies.database import Base, engine, get_db
-from .models import user_models, post_models
+from .models import user_models, post_models, websub_models
 from .routers.platform_router import router as platform_router 
 from .routers.jandi_router import router as jandi_router
 from .routers.user_router import router as user_router
 from .routers.ui import router as ui_router
+from .routers.websub_router import router as websub_router
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI()
@@ -28,6 +29,7 @@ app.include_router(router=jandi_router)
 app.include_router(router=platform_router)
 app.include_router(user_router)
 app.include_router(ui_router)
+app.include_router(websub_router)
 
 get_db()
 
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Integer
+from sqlalchemy import Column, String, ForeignKey, DateTime, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID  # Postgres 전용 UUID 타입
 from app.dependencies.database import Base
 from pydantic import BaseModel
@@ -21,6 +21,10 @@ class Platform(Base):
 
 class UserPlatform(Base):
     __tablename__ = "USER_PLATFORM"
+    __table_args__ = (
+        # post_observer의 피드 순서 키셋 조회용 (같은 피드를 등록한 행을 연속으로 읽음)
+        Index("ix_user_platform_feed", "platform_id", "id", "user_id"),
+    )
     
     user_id = Column(UUID(as_uuid=True), ForeignKey("USER.user_id"), primary_key=True)
     platform_id = Column(UUID(as_uuid=True), ForeignKey("PLATFORM.platform_id"), primary_key=True)
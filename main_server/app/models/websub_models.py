@@ -0,0 +1,35 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, BigInteger, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID  # Postgres 전용 UUID 타입
+from app.dependencies.database import Base
+
+
+class WebSubSubscription(Base):
+    # post_observer가 허브 탐색/구독 요청을 기록하고, 콜백 확인은 main_server가 반영
+    __tablename__ = "WEBSUB_SUBSCRIPTION"
+    __table_args__ = (
+        UniqueConstraint("platform_name", "account_id", name="uq_websub_subscription_feed"),
+    )
+
+    subscription_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    platform_name = Column(String(255), nullable=False)
+    account_id = Column(String(255), nullable=False)
+    topic = Column(String(1024), nullable=False)
+    hub_url = Column(String(1024), nullable=True)
+    secret = Column(String(64), nullable=True)
+    # unsupported / pending / active / denied / failed
+    state = Column(String(32), nullable=False)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    requested_at = Column(DateTime, nullable=True)
+    verified_at = Column(DateTime, nullable=True)
+    checked_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+class WebSubInbox(Base):
+    # 서명을 검증한 푸시 본문 (post_observer가 가져가서 새 글 처리 후 삭제)
+    __tablename__ = "WEBSUB_INBOX"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    subscription_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    content = Column(LargeBinary, nullable=False)
+    received_at = Column(DateTime, nullable=False)
@@ -63,6 +63,7 @@ def register_platform(
             "link": article.link,
             "published_at": article.published_at,
             "title": article.title,
+            "tags": article.tags,
             "user_id": user_id,
             "platform": req.platform_name
         })
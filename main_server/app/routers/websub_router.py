@@ -0,0 +1,147 @@
+import hashlib
+import hmac
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from app.dependencies.database import get_db
+from app.models.websub_models import WebSubSubscription, WebSubInbox
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/websub",
+    tags=["WebSub"]
+)
+
+# 푸시 본문 최대 크기 (피드 전체를 보내는 허브도 있으므로 넉넉하게)
+WEBSUB_MAX_CONTENT_BYTES = int(os.getenv("WEBSUB_MAX_CONTENT_BYTES", str(2 * 1024 * 1024)))
+
+# X-Hub-Signature 알고리즘 (WebSub 권고 순서)
+_SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+def _verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    """X-Hub-Signature: {method}={hexdigest} 검증"""
+    if not header or "=" not in header:
+        return False
+
+    method, signature = header.split("=", 1)
+    digest = _SIGNATURE_ALGORITHMS.get(method.lower())
+    if digest is None:
+        return False
+
+    expected = hmac.new(secret.encode(), body, digest).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+@router.get("/callback/{subscription_id}")
+def verify_intent(
+    subscription_id: UUID,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: Optional[str] = Query(None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    reason: Optional[str] = Query(None, alias="hub.reason"),
+    db: Session = Depends(get_db)
+):
+    """허브의 구독 확인 요청 (우리가 요청한 구독이면 challenge를 그대로 돌려줌)"""
+    subscription = db.query(WebSubSubscription).filter(
+        WebSubSubscription.subscription_id == subscription_id
+    ).first()
+
+    if not subscription or subscription.topic != topic:
+        raise HTTPException(status_code=404, detail="알 수 없는 구독")
+
+    now = datetime.now()
+
+    if mode == "denied":
+        subscription.state = "denied"
+        subscription.last_error = (reason or "denied by hub")[:500]
+        db.commit()
+        logger.warning(f"WebSub subscription denied for {topic}: {reason}")
+        return Response(status_code=200)
+
+    if mode == "subscribe" and subscription.state in ("pending", "active") and challenge:
+        subscription.state = "active"
+        subscription.verified_at = now
+        subscription.lease_expires_at = now + timedelta(seconds=lease_seconds) if lease_seconds else None
+        subscription.last_error = None
+        db.commit()
+        logger.info(f"WebSub subscription verified for {topic} (lease {lease_seconds}s)")
+        return PlainTextResponse(challenge)
+
+    # 해지는 요청하지 않으므로 unsubscribe 확인은 모두 거절 (제3자의 해지 시도 방지)
+    raise HTTPException(status_code=404, detail="요청하지 않은 확인")
+
+@router.post("/callback/{subscription_id}", status_code=202)
+async def receive_content(
+    subscription_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    허브의 콘텐츠 알림 수신
+
+    서명이 맞는 본문만 WEBSUB_INBOX에 넣고, 파싱과 새 글 판별은 post_observer가 한다.
+    서명이 틀려도 허브가 재전송하지 않도록 2xx로 응답하고 본문은 버린다 (WebSub 권고).
+    본문은 크기 상한까지만 비동기로 읽고, 동기 DB 작업은 스레드풀에서 실행한다 (이벤트 루프를 막지 않도록).
+    """
+    body = await _read_body(request, WEBSUB_MAX_CONTENT_BYTES)
+    await run_in_threadpool(_store_notification, db, subscription_id, body, request.headers.get("X-Hub-Signature"))
+    return Response(status_code=202)
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """
+    본문을 limit 바이트까지만 읽음 (넘으면 413, 큰 본문을 메모리에 다 올리지 않도록)
+
+    Content-Length가 있으면 읽기 전에 거절하고, 없거나 (chunked) 거짓이어도
+    스트림을 읽는 도중 누적 크기가 limit을 넘으면 바로 중단한다.
+    """
+    content_length = request.headers.get("Content-Length")
+    if content_length is not None:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 Content-Length")
+        if declared > limit:
+            raise HTTPException(status_code=413, detail="본문이 너무 큼")
+
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail="본문이 너무 큼")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def _store_notification(db: Session, subscription_id: UUID, body: bytes, signature: Optional[str]):
+    """구독 확인 + 서명 검증 후 수신함에 저장 (동기, 스레드풀에서 호출)"""
+    subscription = db.query(WebSubSubscription).filter(
+        WebSubSubscription.subscription_id == subscription_id
+    ).first()
+
+    if not subscription or subscription.state != "active":
+        # 410이면 허브가 구독을 정리함
+        raise HTTPException(status_code=410, detail="구독 중이 아님")
+
+    if not subscription.secret or not _verify_signature(subscription.secret, body, signature):
+        logger.warning(f"Ignored WebSub notification with invalid signature for {subscription.topic}")
+        return
+
+    try:
+        db.add(WebSubInbox(subscription_id=subscription_id, content=body, received_at=datetime.now()))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to store WebSub notification for {subscription.topic}: {e}")
+        raise HTTPException(status_code=500, detail="알림 저장 실패")
@@ -9,7 +9,8 @@ DATABASE_URL = os.getenv(
     "DATABASE_URL"
 )
 
-engine = create_engine(DATABASE_URL)
+# 데몬 모드에서 오래 쉬는 동안 끊긴 연결을 다시 쓰지 않도록 사용 전에 확인
+engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
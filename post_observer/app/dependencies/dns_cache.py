@@ -0,0 +1,170 @@
+"""
+DNS Cache Module
+HTTP 클라이언트가 공유하는 TTL 기반 DNS 캐시 및 httpcore 네트워크 백엔드
+"""
+
+import os
+import time
+import socket
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import httpcore
+
+logger = logging.getLogger(__name__)
+
+# 조회 결과 유지 시간 (초) / 최대 보관 호스트 수
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+DNS_CACHE_SIZE = int(os.getenv("DNS_CACHE_SIZE", "10000"))
+
+
+class DNSCache:
+    """
+    호스트 이름 -> IP 주소 목록 캐시 (TTL + LRU)
+
+    티스토리처럼 계정마다 호스트가 다른 피드도 실행 간에는 같은 호스트를
+    반복해서 조회하므로, 데몬 모드에서 조회 비용을 TTL 동안 한 번으로 줄인다.
+    같은 호스트를 동시에 조회하면 한 번만 질의하고 결과를 함께 쓴다.
+    """
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL, max_entries: int = DNS_CACHE_SIZE):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, host: str) -> Optional[List[str]]:
+        entry = self._entries.get(host)
+        if entry is None:
+            return None
+
+        expires_at, addresses = entry
+        if expires_at < time.monotonic():
+            del self._entries[host]
+            return None
+
+        self._entries.move_to_end(host)
+        self.hits += 1
+        return addresses
+
+    def put(self, host: str, addresses: List[str]):
+        self._entries[host] = (time.monotonic() + self._ttl, addresses)
+        self._entries.move_to_end(host)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, host: str):
+        """연결에 실패한 호스트의 캐시 제거 (다음 연결 때 다시 조회)"""
+        self._entries.pop(host, None)
+
+    @staticmethod
+    def _addresses(infos) -> List[str]:
+        # getaddrinfo 결과에서 중복 없이 순서를 유지한 주소 목록
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """동기 조회 (캐시에 없으면 socket.getaddrinfo)"""
+        addresses = self.get(host)
+        if addresses is None:
+            self.misses += 1
+            addresses = self._addresses(socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+            self.put(host, addresses)
+        return addresses
+
+    async def resolve_async(self, host: str, port: int) -> List[str]:
+        """비동기 조회 (캐시에 없으면 이벤트 루프의 getaddrinfo, 동시 조회는 하나로 합침)"""
+        addresses = self.get(host)
+        if addresses is not None:
+            return addresses
+
+        pending = self._pending.get(host)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[host] = future
+        try:
+            self.misses += 1
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = self._addresses(infos)
+            self.put(host, addresses)
+            future.set_result(addresses)
+            return addresses
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        finally:
+            del self._pending[host]
+
+
+class AsyncCachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """DNSCache로 호스트를 조회한 뒤 IP로 연결하는 httpcore 비동기 네트워크 백엔드 (SNI/인증서 검증은 원래 호스트 이름 사용)"""
+
+    def __init__(self, cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self._cache = cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._cache.resolve_async(host, port)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(e) from e
+
+        last_error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        self._cache.invalidate(host)
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class CachingDNSBackend(httpcore.NetworkBackend):
+    """DNSCache를 사용하는 httpcore 동기 네트워크 백엔드"""
+
+    def __init__(self, cache: DNSCache, backend: Optional[httpcore.NetworkBackend] = None):
+        self._cache = cache
+        self._backend = backend or httpcore.SyncBackend()
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = self._cache.resolve(host, port)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(e) from e
+
+        last_error = None
+        for address in addresses:
+            try:
+                return self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+
+        self._cache.invalidate(host)
+        raise last_error
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds: float):
+        self._backend.sleep(seconds)
+
+
+# 프로세스 전체에서 공유하는 DNS 캐시 (동기/비동기 클라이언트 공용)
+dns_cache = DNSCache()
@@ -0,0 +1,221 @@
+"""
+HTTP Client Module
+RSS 수집용 공유 HTTP 클라이언트
+"""
+
+import os
+import ssl
+import logging
+import importlib.util
+from contextlib import contextmanager
+from typing import Optional
+import certifi
+import httpcore
+import httpx
+from app.dependencies.dns_cache import dns_cache, AsyncCachingDNSBackend, CachingDNSBackend
+
+logger = logging.getLogger(__name__)
+
+# 유휴 keep-alive 연결 유지 시간 (초)
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 사용 여부 (velog / naver처럼 한 호스트에 요청이 몰리는 플랫폼은 연결 하나로 다중화)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+# 모든 클라이언트가 공유하는 SSL 컨텍스트 (CA 번들을 한 번만 읽음)
+SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
+
+# 동기 수집 경로(BaseRSSParser.parse)에서 재사용하는 클라이언트
+_sync_client: Optional[httpx.Client] = None
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return False
+    return True
+
+
+# httpcore 예외 -> httpx 예외 (하위 클래스부터 검사)
+_EXCEPTION_MAP = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _map_exceptions():
+    """httpcore 예외를 httpx 예외로 바꿔서 올림 (호출자는 httpx.HTTPError만 처리하면 됨)"""
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _EXCEPTION_MAP:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e)) from e
+        raise
+
+
+def _to_core_request(request: httpx.Request) -> httpcore.Request:
+    return httpcore.Request(
+        method=request.method,
+        url=httpcore.URL(
+            scheme=request.url.raw_scheme,
+            host=request.url.raw_host,
+            port=request.url.port,
+            target=request.url.raw_path,
+        ),
+        headers=request.headers.raw,
+        content=request.stream,
+        extensions=request.extensions,
+    )
+
+
+class _AsyncResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aiter__(self):
+        with _map_exceptions():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self):
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __iter__(self):
+        with _map_exceptions():
+            for chunk in self._stream:
+                yield chunk
+
+    def close(self):
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+
+
+class AsyncPoolTransport(httpx.AsyncBaseTransport):
+    """
+    직접 만든 httpcore 커넥션 풀로 요청을 보내는 httpx 비동기 전송 계층
+
+    httpx.AsyncHTTPTransport는 네트워크 백엔드를 받지 않으므로, DNS 캐시 백엔드를 쓰는
+    풀을 이 전송 계층이 소유한다. 풀 설정(연결 수, keep-alive, HTTP/2)은 모두 여기서 정한다.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with _map_exceptions():
+            response = await self._pool.handle_async_request(_to_core_request(request))
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_AsyncResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+
+class PoolTransport(httpx.BaseTransport):
+    """AsyncPoolTransport의 동기 버전"""
+
+    def __init__(self, pool: httpcore.ConnectionPool):
+        self._pool = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with _map_exceptions():
+            response = self._pool.handle_request(_to_core_request(request))
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self._pool.close()
+
+
+def create_async_client(max_connections: int, timeout: float) -> httpx.AsyncClient:
+    """
+    RSS 수집에 사용할 공유 httpx.AsyncClient 생성
+
+    커넥션 풀은 공유 DNS 캐시를 거쳐 연결하고 (호스트별 조회는 TTL 동안 한 번),
+    같은 호스트로 가는 요청은 keep-alive 또는 HTTP/2 연결 하나를 재사용한다.
+    TLS 핸드셰이크를 줄이는 것은 이 연결 재사용뿐이다. 새 연결의 TLS 세션 재개는 하지 않는데,
+    httpcore가 쓰는 anyio TLS 스트림이 세션(ssl.SSLSession)을 넘길 방법을 제공하지 않기 때문이다.
+
+    Args:
+        max_connections: 전체 동시 연결 수 상한
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        httpx.AsyncClient: 커넥션 풀을 공유하는 비동기 클라이언트
+    """
+    http2 = _http2_available()
+    pool = httpcore.AsyncConnectionPool(
+        ssl_context=SSL_CONTEXT,
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+        http1=True,
+        http2=http2,
+        network_backend=AsyncCachingDNSBackend(dns_cache),
+    )
+    return httpx.AsyncClient(
+        transport=AsyncPoolTransport(pool),
+        timeout=timeout,
+    )
+
+
+def get_sync_client(timeout: float = 10.0) -> httpx.Client:
+    """
+    동기 수집 경로에서 재사용하는 httpx.Client (없으면 생성)
+
+    요청마다 httpx.get을 호출하면 매번 DNS 조회, TCP 연결, TLS 핸드셰이크를
+    새로 하므로, 프로세스 단위로 클라이언트 하나를 유지한다.
+
+    Args:
+        timeout: 요청 타임아웃 (초)
+
+    Returns:
+        httpx.Client
+    """
+    global _sync_client
+
+    if _sync_client is None or _sync_client.is_closed:
+        http2 = _http2_available()
+        pool = httpcore.ConnectionPool(
+            ssl_context=SSL_CONTEXT,
+            max_connections=10,
+            max_keepalive_connections=10,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+            http1=True,
+            http2=http2,
+            network_backend=CachingDNSBackend(dns_cache),
+        )
+        _sync_client = httpx.Client(transport=PoolTransport(pool), timeout=timeout)
+
+    return _sync_client
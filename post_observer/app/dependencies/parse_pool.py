@@ -0,0 +1,36 @@
+"""
+Parse Pool Module
+RSS 본문 파싱용 프로세스 풀
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# 파싱 워커 프로세스 수 (기본값: CPU 코어 수, 0이면 프로세스 풀 없이 이벤트 루프에서 파싱)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+
+def create_parse_pool(workers: int = PARSE_WORKERS) -> Optional[ProcessPoolExecutor]:
+    """
+    RSS 파싱에 사용할 프로세스 풀 생성
+
+    feedparser와 normalize()는 순수 파이썬이라 GIL 아래에서는 한 코어만 쓰므로
+    수집(I/O)과 분리된 프로세스에서 파싱한다. 워커는 fork로 만들며 (__main__을
+    다시 import하지 않도록), 생성 직후 모든 워커를 띄워 이후 열리는 연결을
+    물려받지 않게 한다.
+
+    Args:
+        workers: 워커 프로세스 수 (0 이하이면 풀을 만들지 않음)
+
+    Returns:
+        ProcessPoolExecutor, workers가 0 이하이면 None
+    """
+    if workers <= 0:
+        return None
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    # 첫 제출 시 워커가 모두 만들어지므로 빈 작업으로 미리 띄움
+    pool.submit(int).result()
+    return pool
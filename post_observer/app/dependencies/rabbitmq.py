@@ -5,13 +5,23 @@ RabbitMQ 연결 및 메시지 발행
 
 import os
 import ssl
+import time
+import asyncio
+import threading
 import pika
+import aio_pika
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 한 번에 확인(confirm)까지 마치는 메시지 수 / 재연결 재시도 횟수
+PUBLISH_BATCH_SIZE = int(os.getenv("PUBLISH_BATCH_SIZE", "100"))
+PUBLISH_MAX_RETRIES = int(os.getenv("PUBLISH_MAX_RETRIES", "3"))
+# 배치 하나의 브로커 확인을 기다리는 최대 시간 (초, 넘으면 재연결 후 재시도)
+PUBLISH_CONFIRM_TIMEOUT = float(os.getenv("PUBLISH_CONFIRM_TIMEOUT", "30"))
+
 def get_rabbitmq_connection():
     """
     RabbitMQ 연결 생성
@@ -74,4 +84,242 @@ def publish_message(queue_name: str, message: Dict[str, Any]):
         raise
     finally:
         if connection and not connection.is_closed:
-            connection.close()
\ No newline at end of file
+            connection.close()
+
+async def _connect_async():
+    """
+    발행기용 RabbitMQ 연결 생성 (aio-pika, get_rabbitmq_connection과 같은 주소/SSL 설정)
+
+    Returns:
+        aio_pika.Connection: RabbitMQ 연결 객체
+    """
+    rabbitmq_url = os.getenv("RABBITMQ_HOST")
+
+    if not rabbitmq_url:
+        raise ValueError("RABBITMQ_HOST environment variable not set")
+
+    # SSL 인증서 검증 비활성화 (CloudAMQP 연결용)
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    return await aio_pika.connect(rabbitmq_url, ssl_context=ssl_context)
+
+class RabbitMQPublisher:
+    """
+    실행 단위로 연결/채널을 유지하는 RabbitMQ 발행기
+
+    publisher confirm을 켠 aio-pika 채널 하나로 메시지를 배치 단위로 발행한다.
+    배치의 메시지를 확인을 기다리지 않고 연달아 보낸 뒤 delivery tag별 확인을 한꺼번에 기다리므로,
+    브로커 왕복은 메시지마다가 아니라 배치마다 한 번이다 (pika BlockingChannel은 메시지마다 기다림).
+    연결이 끊기거나 nack을 받으면 재연결 후 확인받지 못한 메시지만 다시 발행한다.
+
+    호출자는 동기 코드이므로 연결은 발행기 전용 스레드의 이벤트 루프에서 돌리고,
+    그 루프가 유휴 중 하트비트도 처리한다.
+
+    사용 예:
+        with RabbitMQPublisher() as publisher:
+            publisher.publish("new_posts", {...})
+    """
+
+    def __init__(self, batch_size: int = PUBLISH_BATCH_SIZE, max_retries: int = PUBLISH_MAX_RETRIES):
+        self._batch_size = batch_size
+        self._max_retries = max_retries
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+        self._channel = None
+        self._declared_queues = set()
+        self._buffer: List[Tuple[str, str]] = []
+        # 여러 스레드에서 불려도 배치가 섞이지 않도록
+        self._lock = threading.Lock()
+        # 큐별 발행 통계 {queue_name: {"count", "batches", "seconds"}}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _run(self, coro):
+        """발행기 이벤트 루프에서 코루틴을 실행하고 결과를 기다림 (처음 호출 시 루프 스레드 시작)"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="rabbitmq-publisher", daemon=True)
+            self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _ensure_channel(self):
+        if self._channel is not None and not self._channel.is_closed:
+            return self._channel
+
+        await self._close_connection()
+        self._connection = await _connect_async()
+        self._channel = await self._connection.channel(publisher_confirms=True)
+        self._declared_queues.clear()
+        return self._channel
+
+    async def _close_connection(self):
+        try:
+            if self._connection is not None and not self._connection.is_closed:
+                await self._connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close RabbitMQ connection: {e}")
+        finally:
+            self._connection = None
+            self._channel = None
+
+    def _record(self, queue_name: str, seconds: float):
+        stats = self._stats.setdefault(queue_name, {"count": 0, "batches": 0, "seconds": 0.0})
+        stats["count"] += 1
+        stats["seconds"] += seconds
+
+    def publish(self, queue_name: str, message: Dict[str, Any]):
+        """
+        메시지를 버퍼에 넣고, 배치 크기에 도달하면 확인까지 발행
+
+        Args:
+            queue_name: 큐 이름
+            message: 발행할 메시지 (dict)
+        """
+        self._buffer.append((queue_name, json.dumps(message, ensure_ascii=False)))
+
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        버퍼의 메시지를 모두 발행하고 브로커 확인을 받을 때까지 대기
+
+        실패하면 확인받지 못한 메시지를 버퍼에 되돌려 다음 flush()에서 다시 시도한다.
+        """
+        if not self._buffer:
+            return
+
+        batch = self._buffer
+        self._buffer = []
+        unconfirmed, error = self._send(batch)
+        if error is not None:
+            self._buffer = unconfirmed + self._buffer
+            raise error
+
+    def publish_batch(self, messages: List[Tuple[str, str]]):
+        """
+        직렬화된 메시지 묶음을 버퍼를 거치지 않고 발행 (아웃박스 릴레이용)
+
+        실패해도 아무것도 남기지 않는다. 원본은 아웃박스에 남아 있으므로
+        버퍼에 되돌리면 다음 릴레이 때 같은 메시지가 두 번 나간다.
+
+        Args:
+            messages: [(큐 이름, JSON 문자열)]
+
+        Raises:
+            aio_pika.exceptions.AMQPError 등: 재시도 후에도 확인받지 못한 경우
+        """
+        if not messages:
+            return
+
+        _, error = self._send(messages)
+        if error is not None:
+            raise error
+
+    def _send(self, batch: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], Optional[Exception]]:
+        """
+        batch_size개씩 확인까지 발행 (연결이 끊기거나 nack을 받으면 재연결 후 확인받지 못한 메시지만 재시도)
+
+        Returns:
+            (확인받지 못한 메시지, 재시도 후에도 실패했으면 마지막 오류 아니면 None)
+        """
+        with self._lock:
+            for i in range(0, len(batch), self._batch_size):
+                pending, error = self._run(self._send_window(batch[i:i + self._batch_size]))
+                if error is not None:
+                    return pending + batch[i + self._batch_size:], error
+            return [], None
+
+    async def _send_window(self, window: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], Optional[Exception]]:
+        pending = window
+        attempt = 0
+
+        while pending:
+            try:
+                channel = await self._ensure_channel()
+
+                for queue_name in {queue_name for queue_name, _ in pending} - self._declared_queues:
+                    # 큐 선언 (존재하지 않으면 생성)
+                    await channel.declare_queue(queue_name, durable=False)
+                    self._declared_queues.add(queue_name)
+
+                # 확인을 기다리지 않고 모두 보낸 뒤 한꺼번에 확인 대기 (순서는 채널이 보장)
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        *[self._publish_one(channel, queue_name, body) for queue_name, body in pending],
+                        return_exceptions=True
+                    ),
+                    timeout=PUBLISH_CONFIRM_TIMEOUT
+                )
+                failed = [message for message, result in zip(pending, results) if isinstance(result, BaseException)]
+                if failed:
+                    error = next(result for result in results if isinstance(result, BaseException))
+                    pending = failed
+                    raise error
+
+                for queue_name in {queue_name for queue_name, _ in window}:
+                    self._stats[queue_name]["batches"] += 1
+                pending = []
+
+            except (aio_pika.exceptions.AMQPError, ConnectionError, OSError, asyncio.TimeoutError) as e:
+                attempt += 1
+                await self._close_connection()
+
+                if attempt > self._max_retries:
+                    logger.error(f"Failed to publish batch to RabbitMQ after {attempt} attempts: {e}")
+                    return pending, e
+
+                logger.warning(f"RabbitMQ publish failed ({e!r}), reconnecting (attempt {attempt}/{self._max_retries})")
+                await asyncio.sleep(min(2 ** attempt, 30))
+
+        return [], None
+
+    async def _publish_one(self, channel, queue_name: str, body: str):
+        """메시지 하나를 보내고 브로커 확인(ack)까지 대기 (nack이면 DeliveryError)"""
+        started = time.monotonic()
+        await channel.default_exchange.publish(
+            aio_pika.Message(
+                body=body.encode("utf-8"),
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,  # 메시지 영구 저장
+            ),
+            routing_key=queue_name
+        )
+        self._record(queue_name, time.monotonic() - started)
+
+    def log_stats(self):
+        """큐별 발행 건수와 평균 확인 지연 로그 출력"""
+        if not self._stats:
+            logger.info("RabbitMQ publisher: no messages published")
+            return
+
+        for queue_name, stats in sorted(self._stats.items()):
+            avg_ms = stats["seconds"] / stats["count"] * 1000 if stats["count"] else 0.0
+            logger.info(
+                f"RabbitMQ publisher: queue '{queue_name}' - {stats['count']} messages, "
+                f"{stats['batches']} batches, avg confirm latency {avg_ms:.1f}ms"
+            )
+
+    def close(self):
+        """남은 메시지를 발행하고 통계를 남긴 뒤 연결과 이벤트 루프 종료"""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush RabbitMQ publisher on close: {e}")
+        finally:
+            self.log_stats()
+            if self._loop is not None:
+                self._run(self._close_connection())
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = None
+                self._thread = None
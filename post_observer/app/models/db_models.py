@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import Column, String, ForeignKey, DateTime, Float, Integer, BigInteger, Text, LargeBinary, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from app.dependencies.database import Base
 
@@ -17,9 +17,126 @@ class Platform(Base):
 
 class UserPlatform(Base):
     __tablename__ = "USER_PLATFORM"
+    # 피드 순서 키셋 조회용 인덱스 ix_user_platform_feed는 테이블을 소유한 main_server 모델에 정의
+    # (기존 DB에는 main.py --migrate가 CREATE INDEX CONCURRENTLY로 추가)
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("USER.user_id"), primary_key=True)
     platform_id = Column(UUID(as_uuid=True), ForeignKey("PLATFORM.platform_id"), primary_key=True)
 
     account_id = Column("id", String(255))
     last_upload = Column(DateTime, nullable=True)
+
+class FeedCache(Base):
+    __tablename__ = "FEED_CACHE"
+
+    # 피드 식별자 (플랫폼 이름 + 계정 ID)
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    # 조건부 요청용 검증자 및 본문 해시
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(255), nullable=True)
+    body_hash = Column(String(64), nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+class FeedSchedule(Base):
+    __tablename__ = "FEED_SCHEDULE"
+
+    # 피드 식별자 (플랫폼 이름 + 계정 ID) - 같은 피드를 등록한 USER_PLATFORM 행은 일정을 공유
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    # 발행 빈도 통계 (최근 글 발행 시각, 글 간격 지수이동평균)
+    last_published_at = Column(DateTime, nullable=True)
+    avg_interval_seconds = Column(Float, nullable=True)
+
+    # 다음 수집 예정 시각
+    next_check_at = Column(DateTime, nullable=True, index=True)
+    last_checked_at = Column(DateTime, nullable=True)
+
+class FeedFailure(Base):
+    __tablename__ = "FEED_FAILURE"
+
+    # 피드 식별자 (플랫폼 이름 + 계정 ID)
+    platform_name = Column(String(255), primary_key=True)
+    account_id = Column(String(255), primary_key=True)
+
+    # 연속 실패 횟수와 마지막 실패 원인 (성공하면 행 삭제)
+    failure_count = Column(Integer, nullable=False, default=0)
+    first_failed_at = Column(DateTime, nullable=True)
+    last_failed_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+    # 이 시각까지 수집 대상에서 제외 (격리 중이 아니면 None)
+    quarantined_until = Column(DateTime, nullable=True, index=True)
+
+class ObserverCheckpoint(Base):
+    __tablename__ = "OBSERVER_CHECKPOINT"
+
+    # 실행 ID + 샤드 번호
+    run_id = Column(String(255), primary_key=True)
+    shard_index = Column(Integer, primary_key=True)
+    shard_count = Column(Integer, nullable=False)
+
+    # 이 키까지의 피드는 처리 완료 (재시작 시 다음 피드부터 수집)
+    last_platform_id = Column(UUID(as_uuid=True), nullable=True)
+    last_account_id = Column(String(255), nullable=True)
+
+    # 지금까지 발행한 새 글 수 / 처리한 피드 수
+    published_count = Column(Integer, nullable=False, default=0)
+    feeds_processed = Column(Integer, nullable=False, default=0)
+
+    # refresh init까지 보내고 실행을 마친 시각 (진행 중이면 None)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+
+class ObserverOutbox(Base):
+    __tablename__ = "OBSERVER_OUTBOX"
+
+    # 기록 순서 (릴레이는 이 순서대로 발행)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # 발행할 큐와 JSON 본문
+    queue_name = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+class WebSubSubscription(Base):
+    __tablename__ = "WEBSUB_SUBSCRIPTION"
+    __table_args__ = (
+        UniqueConstraint("platform_name", "account_id", name="uq_websub_subscription_feed"),
+    )
+
+    # 콜백 URL에 들어가는 구독 ID
+    subscription_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # 피드 식별자 (플랫폼 이름 + 계정 ID)
+    platform_name = Column(String(255), nullable=False)
+    account_id = Column(String(255), nullable=False)
+
+    # 피드가 광고한 허브와 구독 주소 (허브가 없으면 hub_url은 None)
+    topic = Column(String(1024), nullable=False)
+    hub_url = Column(String(1024), nullable=True)
+    # 푸시 본문 서명(X-Hub-Signature) 검증용 비밀값
+    secret = Column(String(64), nullable=True)
+
+    # unsupported / pending / active / denied / failed
+    state = Column(String(32), nullable=False)
+    # 허브가 확인한 구독 만료 시각 (active일 때만)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    requested_at = Column(DateTime, nullable=True)
+    verified_at = Column(DateTime, nullable=True)
+    # 마지막으로 허브를 탐색한 시각 / 마지막 오류
+    checked_at = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+class WebSubInbox(Base):
+    __tablename__ = "WEBSUB_INBOX"
+
+    # 수신 순서 (observer는 이 순서대로 처리)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # 서명 검증을 통과한 푸시 본문 (피드 XML)
+    subscription_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    content = Column(LargeBinary, nullable=False)
+    received_at = Column(DateTime, nullable=False)
@@ -11,8 +11,31 @@ class ArticleSchema(BaseModel):
     thumbnail: Optional[str] = None
     tags: Optional[List[str]] = None
 
+# new_posts 메시지 버전 (1: 글 하나당 메시지 하나 / 2: 사용자-플랫폼 하나의 새 글을 묶어서)
+NEW_POSTS_MESSAGE_VERSION = 2
+
 class NewPostMessageSchema(BaseModel):
-    # RabbitMQ 메시지 스키마 (새 글 발견 시 발행)
+    # RabbitMQ 메시지 스키마 (새 글 발견 시 발행, version 1)
     user_id: str
     platform: str
     article: ArticleSchema
+
+class NewPostsBatchMessageSchema(BaseModel):
+    # RabbitMQ 메시지 스키마 (한 사용자-플랫폼의 새 글을 한 메시지로 발행, version 2)
+    version: int = NEW_POSTS_MESSAGE_VERSION
+    user_id: str
+    platform: str
+    articles: List[ArticleSchema]
+    # 실행 밖에서 들어온 글 (예: "websub" 푸시) - ai_server가 progress 대신 직접 뷰를 갱신
+    source: Optional[str] = None
+
+class FeedCacheSchema(BaseModel):
+    # 피드별 조건부 요청 캐시 (ETag / Last-Modified / 본문 해시)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+
+class FeedScheduleSchema(BaseModel):
+    # 피드별 발행 빈도 통계 (적응형 수집 주기 계산용)
+    last_published_at: Optional[datetime] = None
+    avg_interval_seconds: Optional[float] = None
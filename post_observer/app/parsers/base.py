@@ -1,13 +1,92 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, NamedTuple, Optional
+import hashlib
+from xml.etree.ElementTree import ParseError
 import feedparser
+from pydantic import ValidationError
 import httpx
 from datetime import datetime
 import logging
-from app.models.schemas import ArticleSchema
+from app.models.schemas import ArticleSchema, FeedCacheSchema
+from app.parsers.stream import StreamingFeedParser
+from app.dependencies.http_client import get_sync_client
 
 logger = logging.getLogger(__name__)
 
+class ArticleRecord(NamedTuple):
+    """
+    파싱한 글 레코드 (검증 전)
+
+    피드 엔트리 대부분은 last_upload 이전 글이라 바로 버려지므로, 파싱 단계에서는
+    검증 없이 튜플로만 만들고 파싱 워커와도 그대로 주고받는다.
+    pydantic 검증은 실제로 발행할 글에만 to_schema()로 한다.
+    """
+    title: str
+    link: str
+    published_at: datetime
+    thumbnail: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+    def to_schema(self) -> ArticleSchema:
+        """
+        ArticleSchema로 변환 (메시지 발행 직전 검증)
+
+        Raises:
+            pydantic.ValidationError: 필드 형식이 맞지 않는 경우
+        """
+        return ArticleSchema(**self._asdict())
+
+def validate_articles(records: List[ArticleRecord]) -> List[ArticleSchema]:
+    """
+    레코드를 검증하여 ArticleSchema 리스트로 변환 (검증에 실패한 글은 로그만 남기고 제외)
+
+    Args:
+        records: 발행할 글 레코드
+
+    Returns:
+        List of ArticleSchema
+    """
+    articles = []
+    for record in records:
+        try:
+            articles.append(record.to_schema())
+        except ValidationError as e:
+            logger.error(f"Invalid article {record.link!r}: {e}")
+    return articles
+
+class EmptyFeedError(Exception):
+    """
+    응답은 받았지만 피드로 읽을 수 없는 본문 (오류 페이지, 삭제/비공개/잘못 등록된 계정 등)
+
+    형식이 올바른 피드에 글이 없는 경우 (새로 만든 블로그 등)는 오류가 아니다.
+    """
+
+class FeedFetchResult:
+    """RSS 수집 결과 DTO (조건부 요청 캐시 포함)"""
+    def __init__(
+        self,
+        articles: List[ArticleRecord],
+        not_modified: bool = False,
+        cache: Optional[FeedCacheSchema] = None,
+        error: Optional[Exception] = None,
+        skipped: bool = False,
+        content: Optional[bytes] = None,
+    ):
+        self.articles = articles
+        # 304 또는 본문 해시 동일로 파싱을 건너뛴 경우
+        self.not_modified = not_modified
+        # 다음 요청에 사용할 캐시 (None이면 저장할 내용 없음)
+        self.cache = cache
+        # 수집/파싱 실패 시 원인 (성공이면 None)
+        self.error = error
+        # 호스트 서킷이 열려 요청을 보내지 않은 경우 (다음 실행에서 재시도)
+        self.skipped = skipped
+        # 파싱 단계로 넘길 원본 본문 (defer_parse로 파싱을 미룬 경우, 파싱 후 None)
+        self.content = content
+
+    def __repr__(self):
+        return f"FeedFetchResult(articles={len(self.articles)}, not_modified={self.not_modified}, error={self.error!r}, skipped={self.skipped})"
+
 class BaseRSSParser(ABC):
 
     @abstractmethod
@@ -24,18 +103,87 @@ class BaseRSSParser(ABC):
         pass
 
     @abstractmethod
-    def normalize(self, entry) -> ArticleSchema:
+    def normalize(self, entry) -> ArticleRecord:
         """
-        RSS 엔트리를 ArticleSchema로 변환
+        RSS 엔트리를 ArticleRecord로 변환 (검증은 발행 직전에)
 
         Args:
             entry: feedparser entry object
 
         Returns:
-            ArticleSchema instance
+            ArticleRecord
         """
         pass
 
+    def parse_content(self, content: bytes, rss_url: str) -> List[ArticleRecord]:
+        """
+        RSS 응답 본문을 파싱하여 ArticleRecord 리스트 반환
+
+        Args:
+            content: RSS 응답 본문
+            rss_url: 로그용 RSS URL
+
+        Returns:
+            List of ArticleRecord (형식이 올바른 빈 피드면 빈 리스트)
+
+        Raises:
+            EmptyFeedError: 피드 형식이 아니거나 엔트리를 하나도 읽지 못한 경우
+        """
+        # feedparser로 파싱
+        feed = feedparser.parse(content)
+
+        if not feed.entries:
+            # feedparser가 RSS/Atom으로 인식한 문서면 아직 글이 없는 피드
+            if feed.get("version"):
+                logger.info(f"Feed has no entries yet: {rss_url}")
+                return []
+            logger.warning(f"No entries found in RSS feed: {rss_url}")
+            raise EmptyFeedError(rss_url)
+
+        # 각 엔트리를 ArticleRecord로 변환
+        articles = []
+        for entry in feed.entries:
+            article = self._normalize_entry(entry)
+            if article is not None:
+                articles.append(article)
+
+        if not articles:
+            raise EmptyFeedError(rss_url)
+
+        logger.info(f"Parsed {len(articles)} articles from {rss_url}")
+        return articles
+
+    def parse_records(self, content: bytes, rss_url: str, cutoff: Optional[datetime] = None) -> List[ArticleRecord]:
+        """
+        응답 본문을 파싱하여 프로세스 간 전달용 튜플 리스트 반환 (파싱 워커용)
+
+        Args:
+            content: RSS 응답 본문
+            rss_url: 로그용 RSS URL
+            cutoff: 주어지면 이 시각 이후에 발행된 글만 반환
+
+        Returns:
+            List of ArticleRecord
+
+        Raises:
+            EmptyFeedError: 피드로 읽을 수 없는 본문인 경우
+        """
+        articles = self.parse_content(content, rss_url)
+
+        return [
+            article
+            for article in articles
+            if cutoff is None or article.published_at > cutoff
+        ]
+
+    def _normalize_entry(self, entry) -> Optional[ArticleRecord]:
+        """normalize() 실패 시 로그만 남기고 None 반환"""
+        try:
+            return self.normalize(entry)
+        except Exception as e:
+            logger.error(f"Failed to normalize entry: {e}")
+            return None
+
     def parse(self, account_id: str) -> List[ArticleSchema]:
         """
         RSS 피드를 파싱하여 ArticleSchema 리스트 반환 (공통 로직)
@@ -44,39 +192,201 @@ class BaseRSSParser(ABC):
             account_id: 플랫폼별 사용자 식별자
 
         Returns:
-            List of ArticleSchema
+            List of ArticleSchema (검증을 통과한 글만)
         """
         try:
             rss_url = self.get_rss_url(account_id)
             logger.info(f"Fetching RSS from: {rss_url}")
 
-            # HTTP 요청으로 RSS 가져오기
-            response = httpx.get(rss_url, timeout=10.0)
+            # HTTP 요청으로 RSS 가져오기 (공유 클라이언트로 연결 재사용)
+            response = get_sync_client().get(rss_url, timeout=10.0)
             response.raise_for_status()
 
-            # feedparser로 파싱
-            feed = feedparser.parse(response.content)
+            return validate_articles(self.parse_content(response.content, rss_url))
 
-            if not feed.entries:
-                logger.warning(f"No entries found in RSS feed: {rss_url}")
-                return []
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error fetching RSS from {account_id}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Unexpected error parsing RSS from {account_id}: {e}")
+            return []
 
-            # 각 엔트리를 ArticleSchema로 변환
-            articles = []
-            for entry in feed.entries:
-                try:
-                    article = self.normalize(entry)
-                    articles.append(article)
-                except Exception as e:
-                    logger.error(f"Failed to normalize entry: {e}")
-                    continue
+    def conditional_headers(self, cache: Optional[FeedCacheSchema]) -> Dict[str, str]:
+        """
+        캐시된 검증자로 조건부 요청 헤더 생성
 
-            logger.info(f"Parsed {len(articles)} articles from {rss_url}")
-            return articles
+        Args:
+            cache: 이전 수집 시 저장한 캐시 (없으면 None)
+
+        Returns:
+            If-None-Match / If-Modified-Since 헤더
+        """
+        headers = {}
+        if cache is None:
+            return headers
+
+        if cache.etag:
+            headers["If-None-Match"] = cache.etag
+        if cache.last_modified:
+            headers["If-Modified-Since"] = cache.last_modified
+        return headers
+
+    async def parse_async(
+        self,
+        client: httpx.AsyncClient,
+        account_id: str,
+        cache: Optional[FeedCacheSchema] = None,
+        cutoff: Optional[datetime] = None,
+        defer_parse: bool = False,
+    ) -> FeedFetchResult:
+        """
+        공유 AsyncClient로 RSS 피드를 가져와 파싱 (비동기 수집 엔진용)
+
+        캐시가 있으면 조건부 요청을 보내고, 304 응답이거나 본문 해시가
+        이전과 같으면 feedparser를 건너뛴다. cutoff가 주어지면 스트리밍
+        파서로 읽으면서 cutoff 이전 글을 만나는 즉시 읽기를 멈춘다.
+        defer_parse이면 feedparser로 본문 전체를 파싱하는 대신 원본 본문을
+        content에 담아 돌려준다 (호출자가 파싱 프로세스 풀에서 처리).
+
+        Args:
+            client: 공유 httpx.AsyncClient
+            account_id: 플랫폼별 사용자 식별자
+            cache: 이전 수집 시 저장한 캐시
+            cutoff: 이 시각 이후에 발행된 글만 필요할 때 (보통 last_upload)
+            defer_parse: 전체 파싱을 호출자에게 미룰지 여부
+
+        Returns:
+            FeedFetchResult
+        """
+        try:
+            rss_url = self.get_rss_url(account_id)
+            logger.info(f"Fetching RSS from: {rss_url}")
+
+            if cutoff is not None:
+                return await self._parse_stream(client, rss_url, cache, cutoff, defer_parse)
+
+            response = await client.get(rss_url, headers=self.conditional_headers(cache))
+
+            if response.status_code == 304:
+                logger.info(f"Not modified: {rss_url}")
+                return FeedFetchResult([], not_modified=True)
+
+            response.raise_for_status()
+
+            new_cache = FeedCacheSchema(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                body_hash=hashlib.sha256(response.content).hexdigest(),
+            )
+
+            if cache is not None and cache.body_hash == new_cache.body_hash:
+                logger.info(f"Unchanged body: {rss_url}")
+                return FeedFetchResult([], not_modified=True, cache=new_cache)
+
+            if defer_parse:
+                return FeedFetchResult([], cache=new_cache, content=response.content)
+
+            try:
+                articles = self.parse_content(response.content, rss_url)
+            except EmptyFeedError as e:
+                return FeedFetchResult([], error=e)
+
+            return FeedFetchResult(articles, cache=new_cache)
 
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching RSS from {account_id}: {e}")
-            return []
+            return FeedFetchResult([], error=e)
         except Exception as e:
             logger.error(f"Unexpected error parsing RSS from {account_id}: {e}")
-            return []
\ No newline at end of file
+            return FeedFetchResult([], error=e)
+
+    async def _parse_stream(
+        self,
+        client: httpx.AsyncClient,
+        rss_url: str,
+        cache: Optional[FeedCacheSchema],
+        cutoff: datetime,
+        defer_parse: bool = False,
+    ) -> FeedFetchResult:
+        """
+        응답을 받는 대로 엔트리를 만들고, cutoff 이전 글에서 멈추는 스트리밍 파싱
+
+        세 플랫폼 모두 최신 글이 먼저 나오므로 새 글이 없거나 한두 개인
+        대부분의 피드는 앞부분 몇 개 엔트리만 읽고 끝난다. 올바른 XML이
+        아니면 남은 본문을 마저 받아 feedparser로 처리한다.
+        """
+        async with client.stream("GET", rss_url, headers=self.conditional_headers(cache)) as response:
+            if response.status_code == 304:
+                logger.info(f"Not modified: {rss_url}")
+                return FeedFetchResult([], not_modified=True)
+
+            response.raise_for_status()
+
+            # 중간에 멈추면 본문 전체 해시를 알 수 없으므로 이전 해시를 유지
+            # (None으로 덮어쓰면 다음 수집에서 본문 해시 비교를 못 함)
+            new_cache = FeedCacheSchema(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                body_hash=cache.body_hash if cache is not None else None,
+            )
+            stream_parser = StreamingFeedParser()
+            body_hash = hashlib.sha256()
+            received = []
+            articles = []
+            seen_entries = 0
+
+            chunks = response.aiter_bytes()
+            try:
+                async for chunk in chunks:
+                    received.append(chunk)
+                    body_hash.update(chunk)
+
+                    for entry in stream_parser.feed(chunk):
+                        seen_entries += 1
+                        article = self._normalize_entry(entry)
+                        if article is None:
+                            continue
+
+                        if article.published_at <= cutoff:
+                            # 이후 글은 모두 더 오래되었으므로 나머지 본문은 받지 않음
+                            logger.info(f"Parsed {len(articles)} new articles from {rss_url} (stopped at entry {seen_entries})")
+                            return FeedFetchResult(articles, cache=new_cache)
+
+                        articles.append(article)
+
+            except ParseError as e:
+                logger.warning(f"Streaming parse failed ({e}), falling back to feedparser: {rss_url}")
+                async for chunk in chunks:
+                    received.append(chunk)
+                    body_hash.update(chunk)
+
+                content = b"".join(received)
+                new_cache.body_hash = body_hash.hexdigest()
+                if cache is not None and cache.body_hash == new_cache.body_hash:
+                    logger.info(f"Unchanged body: {rss_url}")
+                    return FeedFetchResult([], not_modified=True, cache=new_cache)
+
+                if defer_parse:
+                    return FeedFetchResult([], cache=new_cache, content=content)
+
+                try:
+                    parsed = self.parse_content(content, rss_url)
+                except EmptyFeedError as e:
+                    return FeedFetchResult([], error=e)
+                articles = [article for article in parsed if article.published_at > cutoff]
+                # feedparser가 피드로 읽었으므로 아래의 스트리밍 파서 기준 빈 피드 판정은 건너뜀
+                seen_entries = len(parsed)
+
+            # 끝까지 읽은 경우에만 본문 해시를 새로 계산 (이전과 같으면 변경 없음으로 처리)
+            new_cache.body_hash = body_hash.hexdigest()
+            if cache is not None and cache.body_hash == new_cache.body_hash:
+                logger.info(f"Unchanged body: {rss_url}")
+                return FeedFetchResult([], not_modified=True, cache=new_cache)
+
+            # 피드가 아닌 문서 (오류 페이지 등)만 실패, 글이 없는 피드는 성공
+            if seen_entries == 0 and not stream_parser.is_feed:
+                logger.warning(f"No entries found in RSS feed: {rss_url}")
+                return FeedFetchResult([], error=EmptyFeedError(rss_url))
+
+            logger.info(f"Parsed {len(articles)} new articles from {rss_url}")
+            return FeedFetchResult(articles, cache=new_cache)
@@ -0,0 +1,133 @@
+"""
+Streaming RSS/Atom Parser
+응답 본문을 받는 대로 점진적으로 파싱하여 엔트리를 하나씩 만들어 내는 파서
+"""
+
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+from xml.etree.ElementTree import XMLPullParser
+from feedparser import FeedParserDict
+
+# 엔트리 경계가 되는 태그 (RSS item / Atom entry)
+ENTRY_TAGS = {"item", "entry"}
+
+# 피드 문서의 최상위 태그 (RSS 2.0 / Atom / RSS 1.0)
+FEED_ROOT_TAGS = {"rss", "feed", "RDF"}
+
+# 발행 시각으로 사용할 태그 (앞쪽이 우선)
+DATE_TAGS = ("pubDate", "published", "date", "updated")
+
+def _local_name(tag: str) -> str:
+    """'{namespace}name' 형태의 태그에서 name만 추출"""
+    return tag.rsplit("}", 1)[-1]
+
+def _parse_date(value: str) -> Optional[time.struct_time]:
+    """
+    RFC 822 (RSS) / ISO 8601 (Atom) 날짜를 UTC struct_time으로 변환
+    (feedparser의 published_parsed와 같은 형식)
+    """
+    value = value.strip()
+    if not value:
+        return None
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).timetuple()
+
+class StreamingFeedParser:
+    """
+    XMLPullParser 기반 점진적 RSS/Atom 파서
+
+    feed()로 받은 바이트 조각을 넘기면, 그 사이에 완성된 엔트리를
+    feedparser 엔트리와 같은 모양(FeedParserDict)으로 돌려준다.
+    각 플랫폼 파서의 normalize()를 그대로 사용할 수 있다.
+    """
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._depth = 0
+        self._entry_depth = None
+        # 최상위 태그 이름 (글이 없는 피드와 피드가 아닌 문서를 구분)
+        self.root = None
+
+    def feed(self, chunk: bytes) -> List[FeedParserDict]:
+        """
+        바이트 조각을 파싱하고 새로 완성된 엔트리 반환
+
+        Raises:
+            xml.etree.ElementTree.ParseError: 올바른 XML이 아닌 경우
+        """
+        self._parser.feed(chunk)
+
+        entries = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self.root is None:
+                    self.root = _local_name(element.tag)
+                self._depth += 1
+                if self._entry_depth is None and _local_name(element.tag) in ENTRY_TAGS:
+                    self._entry_depth = self._depth
+                continue
+
+            self._depth -= 1
+            if self._entry_depth is not None and self._depth == self._entry_depth - 1:
+                entries.append(self._to_entry(element))
+                self._entry_depth = None
+                # 처리한 엔트리는 트리에서 비워 메모리를 유지
+                element.clear()
+
+        return entries
+
+    @property
+    def is_feed(self) -> bool:
+        """최상위 태그가 RSS/Atom 피드인지 여부"""
+        return self.root in FEED_ROOT_TAGS
+
+    def _to_entry(self, element) -> FeedParserDict:
+        entry = FeedParserDict()
+        tags = []
+        dates = {}
+
+        for child in element:
+            name = _local_name(child.tag)
+            text = (child.text or "").strip()
+
+            if name == "title":
+                entry["title"] = text
+            elif name == "link":
+                # Atom은 href 속성, RSS는 텍스트 (Atom은 alternate 링크 우선)
+                href = child.get("href")
+                if href is None:
+                    entry.setdefault("link", text)
+                elif child.get("rel", "alternate") == "alternate" or "link" not in entry:
+                    entry["link"] = href
+            elif name == "category":
+                term = child.get("term") or text
+                if term:
+                    tags.append(FeedParserDict(term=term, scheme=None, label=None))
+            elif name == "content" and child.get("url"):
+                entry.setdefault("media_content", []).append({"url": child.get("url")})
+            elif name == "thumbnail" and child.get("url"):
+                entry.setdefault("media_thumbnail", []).append({"url": child.get("url")})
+            elif name in DATE_TAGS and name not in dates:
+                dates[name] = text
+
+        for name in DATE_TAGS:
+            published_parsed = _parse_date(dates.get(name, ""))
+            if published_parsed is not None:
+                entry["published_parsed"] = published_parsed
+                break
+
+        if tags:
+            entry["tags"] = tags
+        return entry
@@ -1,6 +1,5 @@
 from datetime import datetime
-from app.parsers.base import BaseRSSParser
-from app.models.schemas import ArticleSchema
+from app.parsers.base import BaseRSSParser, ArticleRecord
 
 class VelogRSSParser(BaseRSSParser):
     """Velog RSS 파서"""
@@ -17,15 +16,15 @@ class VelogRSSParser(BaseRSSParser):
         """
         return f"https://v2.velog.io/rss/@{account_id}"
 
-    def normalize(self, entry) -> ArticleSchema:
+    def normalize(self, entry) -> ArticleRecord:
         """
-        Velog RSS 엔트리를 ArticleSchema로 변환
+        Velog RSS 엔트리를 ArticleRecord로 변환
 
         Args:
             entry: feedparser entry object
 
         Returns:
-            ArticleSchema
+            ArticleRecord
         """
         # 발행 시간 파싱
         published_at = datetime(*entry.published_parsed[:6])
@@ -40,7 +39,7 @@ class VelogRSSParser(BaseRSSParser):
         if hasattr(entry, 'tags') and entry.tags:
             tags = [tag.term for tag in entry.tags]
 
-        return ArticleSchema(
+        return ArticleRecord(
             title=entry.title,
             link=entry.link,
             published_at=published_at,
@@ -0,0 +1,174 @@
+from collections import deque
+from typing import Iterable, Iterator, Optional
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.db_models import ObserverCheckpoint
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 완료된 체크포인트 보관 기간
+CHECKPOINT_RETENTION = timedelta(days=7)
+
+class RunCheckpoint:
+    """
+    observer 실행 체크포인트 DTO (실행 ID + 샤드 단위)
+
+    last_platform_id / last_account_id는 "이 키까지의 피드는 모두 처리되어
+    DB에 반영됨"을 뜻하는 저수위 표시이며, 재시작하면 이 키 다음 피드부터 수집한다.
+    """
+    def __init__(
+        self,
+        run_id: str,
+        shard_index: int,
+        shard_count: int,
+        last_platform_id=None,
+        last_account_id: Optional[str] = None,
+        published_count: int = 0,
+        feeds_processed: int = 0,
+        completed_at: Optional[datetime] = None,
+    ):
+        self.run_id = run_id
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.last_platform_id = last_platform_id
+        self.last_account_id = last_account_id
+        # 이 실행에서 지금까지 발행한 새 글 수 (재시작 후 refresh init 합산용)
+        self.published_count = published_count
+        self.feeds_processed = feeds_processed
+        self.completed_at = completed_at
+
+    @property
+    def last_key(self):
+        """재개 기준 피드 키 (platform_id, account_id), 처음부터면 None"""
+        if self.last_platform_id is None:
+            return None
+        return (self.last_platform_id, self.last_account_id)
+
+    def __repr__(self):
+        return f"RunCheckpoint(run_id={self.run_id}, shard={self.shard_index}/{self.shard_count}, last_key={self.last_key}, published={self.published_count})"
+
+class CheckpointTracker:
+    """
+    완료 순서가 뒤섞이는 병렬 수집에서 저수위 키 추적
+
+    피드는 키 순서대로 수집을 시작하지만 끝나는 순서는 제각각이므로,
+    앞선 피드가 모두 끝난 구간의 마지막 키만 체크포인트로 남길 수 있다.
+    """
+
+    def __init__(self):
+        self._started = deque()
+        self._done = set()
+        self.low_water = None
+
+    @staticmethod
+    def _key(feed):
+        return (feed.platform_id, feed.account_id)
+
+    def track(self, feeds: Iterable) -> Iterator:
+        """피드를 넘겨주면서 시작 순서 기록"""
+        for feed in feeds:
+            self._started.append(self._key(feed))
+            yield feed
+
+    def complete(self, feed):
+        """처리가 끝난 피드 표시 후 저수위 전진"""
+        self._done.add(self._key(feed))
+        while self._started and self._started[0] in self._done:
+            self.low_water = self._started.popleft()
+            self._done.discard(self.low_water)
+
+def load_checkpoint(run_id: str, shard_index: int) -> Optional[RunCheckpoint]:
+    """
+    실행 ID와 샤드 번호로 체크포인트 조회
+
+    Args:
+        run_id: 실행 ID
+        shard_index: 샤드 번호
+
+    Returns:
+        RunCheckpoint, 없으면 None
+    """
+    db = SessionLocal()
+    try:
+        row = db.query(ObserverCheckpoint).filter(
+            ObserverCheckpoint.run_id == run_id,
+            ObserverCheckpoint.shard_index == shard_index
+        ).first()
+
+        if row is None:
+            return None
+
+        return RunCheckpoint(
+            run_id=row.run_id,
+            shard_index=row.shard_index,
+            shard_count=row.shard_count,
+            last_platform_id=row.last_platform_id,
+            last_account_id=row.last_account_id,
+            published_count=row.published_count,
+            feeds_processed=row.feeds_processed,
+            completed_at=row.completed_at
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to load checkpoint for run {run_id} shard {shard_index}: {e}")
+        return None
+    finally:
+        db.close()
+
+def save_checkpoint(checkpoint: RunCheckpoint):
+    """
+    체크포인트 저장 (upsert)
+
+    Args:
+        checkpoint: 저장할 체크포인트
+    """
+    db = SessionLocal()
+    try:
+        apply_checkpoint(db, checkpoint)
+        db.commit()
+
+    except Exception as e:
+        logger.error(f"Failed to save checkpoint {checkpoint}: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+def apply_checkpoint(db: Session, checkpoint: RunCheckpoint):
+    """
+    주어진 세션에서 체크포인트 upsert (커밋은 호출자가)
+
+    발행할 메시지, last_upload 변경과 같은 트랜잭션에 묶어
+    셋이 함께 반영되거나 함께 취소되도록 할 때 사용한다.
+
+    Args:
+        db: DB 세션
+        checkpoint: 저장할 체크포인트
+    """
+    now = datetime.now()
+    values = {
+        "run_id": checkpoint.run_id,
+        "shard_index": checkpoint.shard_index,
+        "shard_count": checkpoint.shard_count,
+        "last_platform_id": checkpoint.last_platform_id,
+        "last_account_id": checkpoint.last_account_id,
+        "published_count": checkpoint.published_count,
+        "feeds_processed": checkpoint.feeds_processed,
+        "completed_at": checkpoint.completed_at,
+        "updated_at": now,
+    }
+
+    stmt = insert(ObserverCheckpoint).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ObserverCheckpoint.run_id, ObserverCheckpoint.shard_index],
+        set_={key: stmt.excluded[key] for key in values if key not in ("run_id", "shard_index")}
+    )
+    db.execute(stmt)
+
+    # 완료 후 보관 기간이 지난 체크포인트 정리
+    if checkpoint.completed_at is not None:
+        db.query(ObserverCheckpoint).filter(
+            ObserverCheckpoint.updated_at < now - CHECKPOINT_RETENTION
+        ).delete(synchronize_session=False)
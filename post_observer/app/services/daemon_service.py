@@ -0,0 +1,148 @@
+import asyncio
+import os
+import random
+import signal
+import time
+import logging
+from concurrent.futures import Executor
+from datetime import timedelta
+from typing import Awaitable, Callable, List, Optional
+import httpx
+from app.services.shard_service import ShardSpec
+from app.services.fetch_service import FETCH_CONCURRENCY, FETCH_TIMEOUT
+from app.services.observer_service import check_new_posts_async, check_inactive_users, check_pushed_posts
+from app.services import outbox_service, websub_service
+from app.dependencies.http_client import create_async_client
+from app.dependencies.rabbitmq import RabbitMQPublisher
+
+logger = logging.getLogger(__name__)
+
+# 작업별 실행 주기 (초) - 새 글 체크는 몇 분마다, 미업로드 체크는 하루 한 번
+NEW_POSTS_INTERVAL = int(os.getenv("NEW_POSTS_INTERVAL", "300"))
+INACTIVE_USERS_INTERVAL = int(os.getenv("INACTIVE_USERS_INTERVAL", "86400"))
+# WebSub 푸시 수신함 처리 주기 / 허브 탐색 및 구독 갱신 주기 (초)
+PUSH_INBOX_INTERVAL = int(os.getenv("PUSH_INBOX_INTERVAL", "30"))
+WEBSUB_MAINTENANCE_INTERVAL = int(os.getenv("WEBSUB_MAINTENANCE_INTERVAL", "3600"))
+# 실행 시각을 주기의 이 비율 안에서 무작위로 늦춤 (샤드 파드들이 동시에 몰리지 않도록)
+SCHEDULE_JITTER = float(os.getenv("SCHEDULE_JITTER", "0.1"))
+# 유휴 중 남은 아웃박스를 다시 릴레이하는 간격 (초)
+IDLE_TICK_SECONDS = 10
+# 대기 중 릴레이 실패 경고를 남기는 최소 간격 (장애가 이어지는 동안 틱마다 쌓이지 않도록)
+RELAY_WARNING_INTERVAL = 60
+
+class ScheduledJob:
+    """
+    데몬 내부 주기 작업
+
+    실행 시각은 벽시계 기준 주기 경계(slot)에 맞춘 뒤 지터를 더한다.
+    같은 주기에 실행되는 샤드 파드들은 같은 slot을 가지므로
+    이를 실행 ID로 쓰면 ai_server가 샤드들의 refresh init을 한 실행으로 합산할 수 있다.
+    """
+
+    def __init__(self, name: str, interval: int, run: Callable[[int], Awaitable[None]]):
+        self.name = name
+        self.interval = interval
+        self._run = run
+        self.slot = 0
+        self.due_at = 0.0
+        self.schedule_next(time.time())
+
+    def schedule_next(self, now: float):
+        """다음 주기 경계 + 지터로 실행 시각 설정 (시작 직후 바로 실행하지 않아 재시작 시 중복 실행 방지)"""
+        self.slot = (int(now) // self.interval + 1) * self.interval
+        self.due_at = self.slot + random.uniform(0, self.interval * SCHEDULE_JITTER)
+
+    async def run(self):
+        started = time.monotonic()
+        logger.info(f"Running scheduled job '{self.name}' (slot {self.slot})")
+        try:
+            await self._run(self.slot)
+        except Exception as e:
+            logger.exception(f"Scheduled job '{self.name}' failed: {e}")
+        finally:
+            logger.info(f"Scheduled job '{self.name}' took {time.monotonic() - started:.1f}s")
+            self.schedule_next(time.time())
+
+async def _idle(publisher: RabbitMQPublisher, stop: asyncio.Event, seconds: float):
+    """종료 신호를 기다리며 대기 (틈틈이 남은 아웃박스 릴레이)"""
+    deadline = time.monotonic() + seconds
+    last_warning = None
+    while not stop.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=min(remaining, IDLE_TICK_SECONDS))
+        except asyncio.TimeoutError:
+            try:
+                # 이전 작업에서 브로커 장애로 남은 메시지가 있으면 다시 릴레이
+                await asyncio.to_thread(outbox_service.drain_outbox, publisher)
+            except Exception as e:
+                if last_warning is None or time.monotonic() - last_warning >= RELAY_WARNING_INTERVAL:
+                    last_warning = time.monotonic()
+                    logger.warning(f"Outbox relay failed: {e}")
+
+def _build_jobs(
+    publisher: RabbitMQPublisher,
+    client: httpx.AsyncClient,
+    parse_pool: Optional[Executor],
+    shard: ShardSpec,
+) -> List[ScheduledJob]:
+    async def new_posts(slot: int):
+        # 같은 slot의 샤드들이 같은 실행 ID를 공유
+        run_shard = ShardSpec(index=shard.index, count=shard.count, run_id=f"observer-{slot}")
+        await check_new_posts_async(run_shard, client, parse_pool, run_interval=timedelta(seconds=NEW_POSTS_INTERVAL))
+        await asyncio.to_thread(outbox_service.drain_outbox, publisher)
+
+    # 동기 DB/HTTP 작업은 스레드에서 (긴 조회가 데몬 루프와 종료 신호 처리를 막지 않도록)
+    async def inactive_users(slot: int):
+        await asyncio.to_thread(check_inactive_users, publisher, shard)
+
+    async def pushed_posts(slot: int):
+        await asyncio.to_thread(check_pushed_posts, publisher)
+
+    async def websub_maintenance(slot: int):
+        await asyncio.to_thread(websub_service.maintain_subscriptions)
+
+    jobs = [
+        ScheduledJob("check_new_posts", NEW_POSTS_INTERVAL, new_posts),
+        ScheduledJob("check_inactive_users", INACTIVE_USERS_INTERVAL, inactive_users),
+    ]
+    if websub_service.is_enabled():
+        # 수신함은 행 잠금으로 나눠 가지므로 모든 샤드가 처리해도 되지만, 허브 구독은 한 샤드만
+        jobs.append(ScheduledJob("check_pushed_posts", PUSH_INBOX_INTERVAL, pushed_posts))
+        if shard.index == 0:
+            jobs.append(ScheduledJob("maintain_websub", WEBSUB_MAINTENANCE_INTERVAL, websub_maintenance))
+    return jobs
+
+async def run_daemon(shard: ShardSpec, parse_pool: Optional[Executor] = None):
+    """
+    상주 모드 실행: DB 풀, HTTP 커넥션 풀, RabbitMQ 연결, 파싱 프로세스 풀을 유지한 채 내부 일정으로 작업 반복
+
+    작업은 한 번에 하나씩 실행하며 (발행기 연결을 공유하므로),
+    SIGTERM/SIGINT를 받으면 진행 중인 작업을 마친 뒤 발행기를 비우고 종료한다.
+
+    Args:
+        shard: 샤드 정보 (run_id는 주기마다 slot 기반으로 새로 만듦)
+        parse_pool: 본문 파싱용 프로세스 풀 (이벤트 루프를 시작하기 전에 만들어 넘김)
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    with RabbitMQPublisher() as publisher:
+        async with create_async_client(FETCH_CONCURRENCY, FETCH_TIMEOUT) as client:
+            jobs = _build_jobs(publisher, client, parse_pool, shard)
+            for job in jobs:
+                logger.info(f"Scheduled '{job.name}' every {job.interval}s, first run at {time.ctime(job.due_at)}")
+
+            while not stop.is_set():
+                job = min(jobs, key=lambda j: j.due_at)
+                wait = job.due_at - time.time()
+                if wait > 0:
+                    await _idle(publisher, stop, wait)
+                    continue
+                await job.run()
+
+    logger.info("Received shutdown signal, observer daemon stopped")
@@ -0,0 +1,196 @@
+import os
+from typing import Dict, Iterable, List, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from app.models.db_models import FeedFailure, UserPlatform, Platform
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 연속 실패가 이 횟수에 도달하면 격리 시작
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))
+# 첫 격리 기간, 이후 실패할 때마다 2배씩 늘려 재확인 (상한 30일)
+QUARANTINE_BASE = timedelta(hours=int(os.getenv("FEED_QUARANTINE_BASE_HOURS", "6")))
+QUARANTINE_MAX = timedelta(days=30)
+
+# 한 INSERT 문에 담을 최대 행 수 (바인드 파라미터 수 제한)
+SAVE_CHUNK_SIZE = 1000
+
+class FeedFailureReport:
+    """격리된 피드 정보 DTO (리포트용)"""
+    def __init__(self, platform_name, account_id, failure_count, first_failed_at, last_error, quarantined_until, subscribers):
+        self.platform_name = platform_name
+        self.account_id = account_id
+        self.failure_count = failure_count
+        self.first_failed_at = first_failed_at
+        self.last_error = last_error
+        self.quarantined_until = quarantined_until
+        # 이 피드를 등록한 사용자 수
+        self.subscribers = subscribers
+
+    def __repr__(self):
+        return f"FeedFailureReport(platform={self.platform_name}, account_id={self.account_id}, failures={self.failure_count})"
+
+def quarantine_until(failure_count: int, now: datetime):
+    """
+    연속 실패 횟수에 따른 격리 종료 시각
+
+    임계값 전까지는 격리하지 않고 (다음 실행에서 바로 재시도),
+    임계값부터는 QUARANTINE_BASE * 2^(초과 횟수)만큼 건너뛴 뒤 다시 확인한다.
+
+    Args:
+        failure_count: 이번 실패를 포함한 연속 실패 횟수
+        now: 기준 시각
+
+    Returns:
+        격리 종료 시각, 아직 격리하지 않으면 None
+    """
+    if failure_count < FEED_FAILURE_THRESHOLD:
+        return None
+
+    exponent = min(failure_count - FEED_FAILURE_THRESHOLD, 16)
+    return now + min(QUARANTINE_BASE * (2 ** exponent), QUARANTINE_MAX)
+
+def record_feed_failures(failures: Dict[Tuple[str, str], Tuple[int, str]]):
+    """
+    피드 수집 실패 일괄 기록 (upsert)
+
+    Args:
+        failures: {(platform_name, account_id): (이번 실패를 포함한 연속 실패 횟수, 실패 원인)}
+    """
+    if not failures:
+        return
+
+    now = datetime.now()
+    rows = [
+        {
+            "platform_name": platform_name,
+            "account_id": account_id,
+            "failure_count": failure_count,
+            "first_failed_at": now,
+            "last_failed_at": now,
+            "last_error": error[:500],
+            "quarantined_until": quarantine_until(failure_count, now),
+        }
+        for (platform_name, account_id), (failure_count, error) in failures.items()
+    ]
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), SAVE_CHUNK_SIZE):
+            stmt = insert(FeedFailure).values(rows[i:i + SAVE_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[FeedFailure.platform_name, FeedFailure.account_id],
+                # first_failed_at은 처음 실패한 시각을 유지
+                set_={
+                    "failure_count": stmt.excluded.failure_count,
+                    "last_failed_at": stmt.excluded.last_failed_at,
+                    "last_error": stmt.excluded.last_error,
+                    "quarantined_until": stmt.excluded.quarantined_until,
+                }
+            )
+            db.execute(stmt)
+        db.commit()
+
+        quarantined = sum(1 for row in rows if row["quarantined_until"] is not None)
+        logger.info(f"Recorded failures for {len(rows)} feeds ({quarantined} quarantined)")
+
+    except Exception as e:
+        logger.error(f"Failed to record feed failures: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+def clear_feed_failures(keys: Iterable[Tuple[str, str]]):
+    """
+    다시 성공한 피드의 실패 기록 삭제 (격리 해제)
+
+    Args:
+        keys: [(platform_name, account_id), ...]
+    """
+    keys = list(keys)
+    if not keys:
+        return
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(keys), SAVE_CHUNK_SIZE):
+            db.query(FeedFailure).filter(
+                tuple_(FeedFailure.platform_name, FeedFailure.account_id).in_(keys[i:i + SAVE_CHUNK_SIZE])
+            ).delete(synchronize_session=False)
+        db.commit()
+        logger.info(f"Cleared failure records for {len(keys)} recovered feeds")
+
+    except Exception as e:
+        logger.error(f"Failed to clear feed failures: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+def get_quarantined_feeds() -> List[FeedFailureReport]:
+    """
+    격리 중인 피드 목록 조회 (연속 실패 횟수가 많은 순)
+
+    Returns:
+        List[FeedFailureReport]
+    """
+    db = SessionLocal()
+    try:
+        subscribers = db.query(
+            Platform.name.label('platform_name'),
+            UserPlatform.account_id,
+            func.count().label('subscribers')
+        ).join(
+            Platform, UserPlatform.platform_id == Platform.platform_id
+        ).group_by(
+            Platform.name, UserPlatform.account_id
+        ).subquery()
+
+        rows = db.query(
+            FeedFailure,
+            func.coalesce(subscribers.c.subscribers, 0).label('subscribers')
+        ).outerjoin(
+            subscribers,
+            (subscribers.c.platform_name == FeedFailure.platform_name)
+            & (subscribers.c.account_id == FeedFailure.account_id)
+        ).filter(
+            FeedFailure.quarantined_until.isnot(None)
+        ).order_by(
+            FeedFailure.failure_count.desc(), FeedFailure.platform_name, FeedFailure.account_id
+        ).all()
+
+        return [
+            FeedFailureReport(
+                platform_name=failure.platform_name,
+                account_id=failure.account_id,
+                failure_count=failure.failure_count,
+                first_failed_at=failure.first_failed_at,
+                last_error=failure.last_error,
+                quarantined_until=failure.quarantined_until,
+                subscribers=count
+            )
+            for failure, count in rows
+        ]
+
+    except Exception as e:
+        logger.error(f"Failed to fetch quarantined feeds: {e}")
+        return []
+    finally:
+        db.close()
+
+def log_quarantine_report():
+    """격리 중인 피드 리포트 로그 출력"""
+    reports = get_quarantined_feeds()
+
+    logger.info("=" * 60)
+    logger.info(f"Quarantined feeds: {len(reports)}")
+    logger.info("=" * 60)
+
+    for report in reports:
+        logger.info(
+            f"{report.platform_name}/{report.account_id} - {report.failure_count} consecutive failures "
+            f"since {report.first_failed_at}, {report.subscribers} subscribers, "
+            f"next probe after {report.quarantined_until}: {report.last_error}"
+        )
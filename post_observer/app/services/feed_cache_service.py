@@ -0,0 +1,58 @@
+from typing import Dict, Tuple
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
+from app.models.db_models import FeedCache
+from app.models.schemas import FeedCacheSchema
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 한 INSERT 문에 담을 최대 행 수 (바인드 파라미터 수 제한)
+SAVE_CHUNK_SIZE = 1000
+
+def save_feed_cache(entries: Dict[Tuple[str, str], FeedCacheSchema]):
+    """
+    피드별 조건부 요청 캐시 일괄 저장 (upsert)
+
+    Args:
+        entries: {(platform_name, account_id): FeedCacheSchema}
+    """
+    if not entries:
+        return
+
+    now = datetime.now()
+    rows = [
+        {
+            "platform_name": platform_name,
+            "account_id": account_id,
+            "etag": cache.etag,
+            "last_modified": cache.last_modified,
+            "body_hash": cache.body_hash,
+            "updated_at": now,
+        }
+        for (platform_name, account_id), cache in entries.items()
+    ]
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), SAVE_CHUNK_SIZE):
+            stmt = insert(FeedCache).values(rows[i:i + SAVE_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[FeedCache.platform_name, FeedCache.account_id],
+                set_={
+                    "etag": stmt.excluded.etag,
+                    "last_modified": stmt.excluded.last_modified,
+                    "body_hash": stmt.excluded.body_hash,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            )
+            db.execute(stmt)
+        db.commit()
+        logger.info(f"Saved feed cache for {len(rows)} feeds")
+
+    except Exception as e:
+        logger.error(f"Failed to save feed cache: {e}")
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import logging
+from concurrent.futures import Executor
+from typing import AsyncIterable, AsyncIterator, Dict, Optional, Tuple
+import httpx
+from app.parsers.base import FeedFetchResult
+from app.services import rss_service
+from app.services.host_guard import HostGuard, HOST_MAX_RETRIES, is_retryable, is_throttled, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# 전체 동시 요청 수 / 호스트별 동시 요청 수 / 요청 타임아웃
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "50"))
+FETCH_PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", "10"))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", "10.0"))
+
+class FeedFetcher:
+    """
+    RSS 비동기 수집 엔진
+
+    공유 AsyncClient 위에서 전체 동시성 상한과 호스트별 동시성 상한을 지키며
+    피드를 병렬로 가져오고, 완료되는 순서대로 결과를 돌려준다.
+    호스트별 토큰 버킷으로 요청 속도를 제한하고, 429 / 5xx / 타임아웃은
+    지수 백오프로 재시도하며, 계속 실패하는 호스트는 서킷을 열어 이번 실행의
+    남은 피드를 건너뛴다 (skipped 결과로 돌려주고 다음 실행에서 재시도).
+
+    parse_pool이 주어지면 본문 전체 파싱은 네트워크 슬롯을 반납한 뒤
+    프로세스 풀에서 처리한다 (수집 단계와 파싱 단계 분리).
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        concurrency: int = FETCH_CONCURRENCY,
+        per_host_concurrency: int = FETCH_PER_HOST_CONCURRENCY,
+        parse_pool: Optional[Executor] = None,
+    ):
+        self._client = client
+        self._parse_pool = parse_pool
+        self.guard = HostGuard()
+        self._global_limit = asyncio.Semaphore(concurrency)
+        self._per_host_concurrency = per_host_concurrency
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # 동시에 만들어 두는 작업 수 (입력이 아무리 커도 메모리는 이 크기로 제한)
+        self._window = concurrency * 2
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self._per_host_concurrency)
+            self._host_limits[host] = limit
+        return limit
+
+    async def _fetch_one(self, feed) -> Tuple[object, FeedFetchResult]:
+        host = rss_service.get_feed_host(feed.platform_name, feed.account_id) or ""
+
+        # last_upload가 없는 구독자가 있으면 전체 글이 필요하므로 조건부 요청을 보내지 않음
+        cache = feed.feed_cache if feed.last_upload is not None else None
+        # 발행 빈도 통계가 이미 있으면 가장 오래된 last_upload 이후 글만 스트리밍으로 읽음
+        # (처음 보는 피드는 통계를 채우기 위해 전체를 파싱)
+        cutoff = feed.last_upload if feed.feed_schedule is not None else None
+
+        health = self.guard.get(host)
+
+        for attempt in range(HOST_MAX_RETRIES + 1):
+            # 장애 호스트는 요청 없이 건너뜀 (일정을 갱신하지 않으므로 다음 실행에서 다시 수집)
+            if health.is_open:
+                health.skipped += 1
+                return feed, FeedFetchResult([], skipped=True)
+
+            # 속도 제한 대기는 슬롯을 잡기 전에 (대기 중인 작업이 슬롯을 점유하지 않도록)
+            await health.bucket.acquire()
+
+            # 호스트 슬롯을 먼저 잡아야 한 호스트의 대기 작업이 전체 슬롯을 점유하지 않음
+            async with self._host_limit(host):
+                async with self._global_limit:
+                    result = await rss_service.fetch_rss_async(
+                        self._client, feed.platform_name, feed.account_id, cache, cutoff,
+                        defer_parse=self._parse_pool is not None
+                    )
+
+            if not is_retryable(result.error):
+                health.record_success()
+                break
+
+            if is_throttled(result.error):
+                health.record_throttled()
+
+            if attempt < HOST_MAX_RETRIES and not health.is_open:
+                await asyncio.sleep(backoff_delay(result.error, attempt))
+        else:
+            # 재시도를 모두 소진한 피드만 호스트 실패로 집계 (불안정한 피드 몇 개가 시도 수만큼 서킷을 열지 않도록)
+            health.record_failure()
+
+        if result.content is not None:
+            result = await self._parse(feed, result, cutoff)
+
+        return feed, result
+
+    async def _parse(self, feed, result: FeedFetchResult, cutoff) -> FeedFetchResult:
+        """수집한 원본 본문을 파싱 프로세스 풀에서 파싱"""
+        loop = asyncio.get_running_loop()
+        try:
+            records = await loop.run_in_executor(
+                self._parse_pool, rss_service.parse_feed_content,
+                feed.platform_name, feed.account_id, result.content, cutoff
+            )
+        except Exception as e:
+            logger.error(f"Failed to parse RSS for {feed.platform_name}/{feed.account_id}: {e}")
+            return FeedFetchResult([], error=e)
+
+        result.articles = records
+        result.content = None
+        return result
+
+    async def fetch_all(self, feeds: AsyncIterable) -> AsyncIterator[Tuple[object, FeedFetchResult]]:
+        """
+        피드 목록을 병렬로 수집
+
+        Args:
+            feeds: FeedInfo 목록 (async iterable, 피드마다 한 번씩 수집)
+
+        Yields:
+            (FeedInfo, FeedFetchResult) - 완료된 순서대로
+        """
+        pending = set()
+
+        async for feed in feeds:
+            pending.add(asyncio.create_task(self._fetch_one(feed)))
+
+            if len(pending) >= self._window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
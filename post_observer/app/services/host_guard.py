@@ -0,0 +1,139 @@
+import asyncio
+import os
+import random
+import time
+import logging
+from typing import Dict, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 초당 요청 수 상한 / 버스트 크기
+HOST_RATE_PER_SECOND = float(os.getenv("HOST_RATE_PER_SECOND", "20"))
+HOST_BURST = int(os.getenv("HOST_BURST", "20"))
+# 429 / 5xx / 타임아웃 재시도 횟수와 지수 백오프 기준 (초)
+HOST_MAX_RETRIES = int(os.getenv("HOST_MAX_RETRIES", "2"))
+HOST_BACKOFF_BASE = float(os.getenv("HOST_BACKOFF_BASE", "1.0"))
+HOST_BACKOFF_MAX = 30.0
+# 연속 실패가 이 횟수에 도달하면 이번 실행 동안 호스트 차단
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+# 429 이후 줄일 수 있는 최소 요청 속도 (초당)
+MIN_RATE_PER_SECOND = 0.2
+
+class TokenBucket:
+    """비동기 토큰 버킷 (rate는 실행 중 조정 가능)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        토큰 하나를 얻을 때까지 대기
+
+        잠금 안에서는 토큰을 먼저 예약(음수가 되면 빚)하고 기다릴 시간만 계산하며,
+        대기는 잠금 밖에서 하므로 같은 호스트의 다른 요청이 한 대기자 뒤에 줄서지 않는다.
+        """
+        async with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class HostHealth:
+    """
+    호스트 하나의 상태 (토큰 버킷 + 연속 실패 수 + 서킷 브레이커)
+
+    429를 받으면 요청 속도를 절반으로 줄이고, 성공할 때마다 조금씩
+    원래 속도로 되돌린다 (AIMD). 연속 실패가 임계값에 도달하면 서킷을 열어
+    이번 실행에서 남은 요청을 보내지 않는다.
+    """
+
+    def __init__(self, host: str, rate: float = HOST_RATE_PER_SECOND, burst: int = HOST_BURST):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self._max_rate = rate
+        self.consecutive_failures = 0
+        self.is_open = False
+        self.skipped = 0
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.bucket.rate = min(self._max_rate, self.bucket.rate + self._max_rate * 0.1)
+
+    def record_throttled(self):
+        self.bucket.rate = max(MIN_RATE_PER_SECOND, self.bucket.rate / 2)
+        logger.warning(f"Throttled by {self.host}, rate lowered to {self.bucket.rate:.2f}/s")
+
+    def record_failure(self):
+        """재시도를 모두 소진한 피드 하나의 실패 기록 (시도마다가 아니라 피드마다 한 번)"""
+        self.consecutive_failures += 1
+        if not self.is_open and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self.is_open = True
+            logger.error(f"Circuit opened for {self.host} after {self.consecutive_failures} consecutive failures")
+
+def site_of(host: str) -> str:
+    """
+    상태를 함께 관리할 사이트 단위 (blog.tistory.com -> tistory.com)
+
+    티스토리는 계정마다 서브도메인이 다르지만 같은 프런트엔드가 응답하므로
+    속도 제한과 서킷은 사이트 단위로 묶는다.
+    """
+    return ".".join(host.split(".")[-2:])
+
+class HostGuard:
+    """실행 단위 호스트 상태 레지스트리 (실행마다 새로 만들어 서킷을 초기화)"""
+
+    def __init__(self):
+        self._hosts: Dict[str, HostHealth] = {}
+
+    def get(self, host: str) -> HostHealth:
+        site = site_of(host)
+        health = self._hosts.get(site)
+        if health is None:
+            health = HostHealth(site)
+            self._hosts[site] = health
+        return health
+
+    def log_summary(self):
+        """서킷이 열린 호스트와 건너뛴 피드 수 로그 출력"""
+        for health in self._hosts.values():
+            if health.is_open:
+                logger.warning(f"Host {health.host}: circuit open, {health.skipped} feeds deferred to next run")
+
+def is_retryable(error: Optional[Exception]) -> bool:
+    """호스트 상태 문제로 보고 재시도할 오류인지 (429 / 5xx / 타임아웃 / 연결 오류)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+def is_throttled(error: Optional[Exception]) -> bool:
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429
+
+def backoff_delay(error: Optional[Exception], attempt: int) -> float:
+    """
+    재시도 전 대기 시간 (Retry-After가 있으면 우선, 없으면 지수 백오프 + 지터)
+
+    Args:
+        error: 직전 시도의 오류
+        attempt: 0부터 시작하는 재시도 번호
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HOST_BACKOFF_MAX)
+
+    delay = HOST_BACKOFF_BASE * (2 ** attempt)
+    return min(delay + random.uniform(0, delay / 2), HOST_BACKOFF_MAX)
@@ -1,142 +1,445 @@
-from datetime import datetime
-from app.services import platform_service, rss_service
-from app.dependencies.rabbitmq import publish_message
+import asyncio
+import os
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import AsyncIterator, Iterator, Optional
+import httpx
+from app.services import platform_service, feed_cache_service, schedule_service, failure_service, checkpoint_service, outbox_service, rss_service, websub_service
+from app.services.outbox_service import OutboxBuffer
+from app.services.checkpoint_service import CheckpointTracker, RunCheckpoint
+from app.services.shard_service import ShardSpec
+from app.services.fetch_service import FeedFetcher, FETCH_CONCURRENCY, FETCH_TIMEOUT
+from app.dependencies.http_client import create_async_client
+from app.dependencies.parse_pool import create_parse_pool
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.dependencies.database import SessionLocal
+from app.models.schemas import NewPostsBatchMessageSchema
+from app.parsers.base import validate_articles
 import logging
 
 logger = logging.getLogger(__name__)
 
-def check_new_posts():
+# new_posts 메시지 하나에 묶을 최대 글 수 (백필처럼 새 글이 많으면 여러 메시지로 나눔)
+NEW_POSTS_BATCH_MAX = int(os.getenv("NEW_POSTS_BATCH_MAX", "50"))
+
+def _publisher_scope(publisher: Optional[RabbitMQPublisher]):
+    """호출자가 발행기를 넘기지 않으면 이번 호출 동안만 쓰는 발행기 생성"""
+    return nullcontext(publisher) if publisher is not None else RabbitMQPublisher()
+
+def _client_scope(client: Optional[httpx.AsyncClient]):
+    """호출자가 HTTP 클라이언트를 넘기지 않으면 이번 호출 동안만 쓰는 클라이언트 생성"""
+    return nullcontext(client) if client is not None else create_async_client(FETCH_CONCURRENCY, FETCH_TIMEOUT)
+
+def _parse_pool_scope(parse_pool: Optional[Executor]):
+    """호출자가 파싱 풀을 넘기지 않으면 이번 호출 동안만 쓰는 풀 생성 (PARSE_WORKERS=0이면 풀 없음)"""
+    if parse_pool is None:
+        parse_pool = create_parse_pool()
+        if parse_pool is not None:
+            return parse_pool
+    return nullcontext(parse_pool)
+
+async def _iter_in_thread(iterator: Iterator, chunk_size: int = platform_service.USER_PLATFORM_CHUNK_SIZE) -> AsyncIterator:
+    """
+    동기 이터레이터를 스레드에서 chunk_size개씩 꺼내 비동기로 넘김
+
+    iter_feeds는 페이지마다 DB를 조회하므로, 이벤트 루프에서 직접 돌리면 조회 동안
+    진행 중인 수집이 모두 멈추고 타임아웃과 속도 제한 계산이 어긋난다.
+    """
+    while True:
+        chunk = await asyncio.to_thread(list, islice(iterator, chunk_size))
+        if not chunk:
+            return
+        for item in chunk:
+            yield item
+
+def check_new_posts(
+    publisher: Optional[RabbitMQPublisher] = None,
+    shard: Optional[ShardSpec] = None,
+    parse_pool: Optional[Executor] = None,
+):
     """
     메인 비즈니스 로직: 모든 사용자-플랫폼에 대해 새 글 확인
 
     작업 흐름:
-    1. DB에서 모든 사용자-플랫폼 정보 조회
-    2. 각 플랫폼별 RSS 수집
-    3. 마지막 업로드 시각과 비교하여 새 글 필터링
-    4. 새 글이 있으면 로그 출력 # RabbitMQ 발행 구현 해야함
-    5. last_upload 업데이트
+    1. DB에서 사용자-플랫폼 정보를 피드 단위로 묶어 조회
+    2. 피드별 RSS 병렬 수집 (fetch_service, 같은 피드는 한 번만)
+    3. 구독자마다 마지막 업로드 시각과 비교하여 새 글 필터링
+    4. 새 글 메시지와 last_upload 변경을 한 트랜잭션으로 아웃박스에 기록
+    5. 아웃박스를 RabbitMQ로 릴레이 (큰 배치로 확인)
+
+    Args:
+        publisher: 릴레이에 사용할 발행기 (없으면 이번 호출용으로 생성)
+        shard: 샤드 정보 (없으면 전체를 단일 샤드로 처리)
+        parse_pool: 본문 파싱용 프로세스 풀 (없으면 이번 호출용으로 생성)
     """
-    logger.info("=== Starting new posts check ===")
+    shard = shard or ShardSpec()
+    with _parse_pool_scope(parse_pool) as parse_pool:
+        asyncio.run(check_new_posts_async(shard, parse_pool=parse_pool))
 
-    # 모든 사용자-플랫폼 정보 조회
-    user_platforms = platform_service.get_all_user_platforms()
+    # 수집 중에는 브로커를 기다리지 않고, 커밋된 메시지를 모아서 릴레이
+    with _publisher_scope(publisher) as publisher:
+        outbox_service.drain_outbox(publisher)
 
-    if not user_platforms:
-        logger.info("No user platforms found")
-        return
+async def check_new_posts_async(
+    shard: ShardSpec,
+    client: Optional[httpx.AsyncClient] = None,
+    parse_pool: Optional[Executor] = None,
+    run_interval: timedelta = schedule_service.POLL_RUN_INTERVAL,
+):
+    """
+    check_new_posts의 비동기 본체 (수집은 병렬, 필터링/아웃박스 기록은 완료 순서대로)
 
-    total_new_posts = 0
+    메시지는 아웃박스에만 기록하므로, 브로커로 보내려면 호출자가 릴레이해야 한다.
 
-    # 각 사용자-플랫폼에 대해 처리
-    for up in user_platforms:
-        logger.info(f"Checking {up.platform_name} for user {up.user_id} (account: {up.account_id})")
+    Args:
+        shard: 샤드 정보
+        client: 공유 HTTP 클라이언트 (데몬 모드에서 커넥션 풀 유지용, 없으면 이번 실행용으로 생성)
+        parse_pool: 본문 파싱용 프로세스 풀 (없으면 이벤트 루프에서 파싱)
+        run_interval: 이 함수를 실행하는 주기 (수집 대상 판단과 다음 수집 시각 계산에 사용)
+    """
+    started_at = datetime.now()
+    logger.info(f"=== Starting new posts check (shard {shard.index}/{shard.count}) ===")
 
-        # RSS 수집
-        articles = rss_service.fetch_rss(up.platform_name, up.account_id)
+    # 같은 실행 ID로 재시작된 경우 체크포인트 다음 피드부터 이어서 처리
+    # DB 작업은 모두 스레드에서 (이벤트 루프에서는 수집만)
+    checkpoint = await asyncio.to_thread(checkpoint_service.load_checkpoint, shard.run_id, shard.index)
+    if checkpoint is not None and checkpoint.completed_at is not None:
+        logger.info(f"Run {shard.run_id} shard {shard.index} already completed at {checkpoint.completed_at}, skipping")
+        return
+    if checkpoint is not None:
+        logger.info(f"Resuming from checkpoint: {checkpoint}")
+    else:
+        checkpoint = RunCheckpoint(shard.run_id, shard.index, shard.count)
+    tracker = CheckpointTracker()
+    feeds_before = checkpoint.feeds_processed
 
-        if not articles:
-            logger.info(f"No articles found for {up.platform_name}/{up.account_id}")
-            continue
+    # 이 샤드에 속하고 수집 예정 시각이 지난 피드를 페이지 단위로 스트리밍
+    # (같은 피드를 등록한 사용자들은 하나로 묶여 피드당 한 번만 수집, 전체를 메모리에 올리지 않음)
+    feeds = platform_service.iter_feeds(shard, due_at=schedule_service.due_cutoff(started_at, run_interval), start_after=checkpoint.last_key)
 
-        # 새 글 필터링
-        new_articles = []
-        latest_published_at = None
+    total_feeds = 0
+    total_subscriptions = 0
+    # 재시작 전에 발행한 글도 refresh init 개수에 포함
+    total_new_posts = checkpoint.published_count
+    not_modified = 0
+    deferred = 0
+    failed = 0
+    # 변경된 조건부 요청 캐시 {(platform_name, account_id): FeedCacheSchema}
+    cache_updates = {}
+    # 갱신된 발행 빈도 통계 {(platform_name, account_id): FeedScheduleSchema}
+    schedule_updates = {}
+    # 반영 대기 중인 last_upload 변경 [(user_id, platform_name, last_upload_time)]
+    last_upload_changes = []
+    # 실패한 피드 {(platform_name, account_id): (연속 실패 횟수, 원인)} / 실패 기록이 있다가 성공한 피드
+    failures = {}
+    recovered = []
+    # last_upload 변경과 함께 커밋할 메시지
+    outbox = OutboxBuffer()
 
-        for article in articles:
-            # last_upload가 None이면 모든 글이 새 글
-            if up.last_upload is None or article.published_at > up.last_upload:
-                new_articles.append(article)
+    # 공유 클라이언트로 피드를 병렬 수집하고, 끝나는 순서대로 처리
+    async with _client_scope(client) as client:
+        fetcher = FeedFetcher(client, parse_pool=parse_pool)
+        async for feed, result in fetcher.fetch_all(_iter_in_thread(tracker.track(feeds))):
+            total_feeds += 1
+            total_subscriptions += len(feed.subscribers)
+            tracker.complete(feed)
 
-                # 가장 최신 발행 시각 추적
-                if latest_published_at is None or article.published_at > latest_published_at:
-                    latest_published_at = article.published_at
+            # 장애 호스트라 건너뛴 피드는 일정을 그대로 두어 다음 실행에서 재시도
+            if result.skipped:
+                deferred += 1
+                continue
 
-        if not new_articles:
-            logger.info(f"No new posts for {up.platform_name}/{up.account_id}")
-            continue
+            if result.not_modified:
+                not_modified += 1
+            else:
+                # 한 번 파싱한 글을 구독자마다 자신의 last_upload 기준으로 필터링
+                for up in feed.subscribers:
+                    published, latest_published_at = _process_feed(outbox, up, result.articles)
+                    total_new_posts += published
+                    if latest_published_at:
+                        last_upload_changes.append((up.user_id, up.platform_name, latest_published_at))
 
-        logger.info(f"Found {len(new_articles)} new posts for {up.platform_name}/{up.account_id}")
+            # 새 글 처리가 끝난 뒤에만 캐시를 갱신 (실패 시 다음 실행에서 다시 받음)
+            if result.cache is not None and result.cache != feed.feed_cache:
+                cache_updates[(feed.platform_name, feed.account_id)] = result.cache
 
-        # 새 글 발견 시 로그 출력 및 RabbitMQ 발행
-        for article in new_articles:
-            logger.info(f"  - New post: {article.title} ({article.published_at})")
+            # 피드에 보이는 발행 시각으로 통계를 갱신하고 다음 수집 시각을 다시 계산
+            # (수집에 실패한 피드는 일정을 그대로 두고, 연속 실패가 쌓이면 격리)
+            feed_key = (feed.platform_name, feed.account_id)
+            if result.error is None:
+                schedule_updates[feed_key] = schedule_service.update_stats(
+                    feed.feed_schedule,
+                    [article.published_at for article in result.articles]
+                )
+                if feed.failure_count:
+                    recovered.append(feed_key)
+            else:
+                failed += 1
+                failures[feed_key] = (feed.failure_count + 1, f"{type(result.error).__name__}: {result.error}")
 
-            # RabbitMQ 메시지 발행
-            publish_message(
-                queue_name="new_posts",
-                message={
-                    "user_id": str(up.user_id),
-                    "platform": up.platform_name,
-                    "article": article.model_dump(mode='json')
-                }
-            )
+            # 청크 크기만큼 모이면 한 번에 반영 (실패 시 재발행 범위와 메모리를 제한)
+            if len(last_upload_changes) + len(schedule_updates) + len(failures) >= platform_service.LAST_UPLOAD_CHUNK_SIZE:
+                _advance_checkpoint(checkpoint, tracker, total_new_posts, feeds_before + total_feeds)
+                # 반영하는 동안에도 이미 시작한 수집은 계속 진행됨
+                await asyncio.to_thread(_flush_feed_changes, outbox, checkpoint, started_at, last_upload_changes, cache_updates, schedule_updates, failures, recovered)
+                last_upload_changes = []
+                cache_updates = {}
+                schedule_updates = {}
+                failures = {}
+                recovered = []
 
-            total_new_posts += 1
+    _advance_checkpoint(checkpoint, tracker, total_new_posts, feeds_before + total_feeds)
+    await asyncio.to_thread(_flush_feed_changes, outbox, checkpoint, started_at, last_upload_changes, cache_updates, schedule_updates, failures, recovered)
+    fetcher.guard.log_summary()
 
-        # last_upload 업데이트 (가장 최신 글의 발행 시각으로)
-        if latest_published_at:
-            platform_service.update_last_upload(
-                user_id=up.user_id,
-                platform_name=up.platform_name,
-                last_upload_time=latest_published_at
-            )
+    # 빈 샤드도 refresh init(count=0)은 보내야 ai_server가 실행 완료를 판단할 수 있음
+    if total_feeds == 0:
+        logger.info("No user platforms found")
+
+    logger.info(f"Checked {total_feeds} feeds for {total_subscriptions} user-platforms, skipped {not_modified} unchanged feeds (304 / identical body), deferred {deferred} feeds on failing hosts, {failed} feeds failed")
 
     logger.info(f"=== Finished check: {total_new_posts} new posts found ===")
 
     # refresh 큐에 새 글 전체 개수 발행
-    publish_message(
+    # 여러 샤드가 동시에 보내므로 ai_server는 run_id 단위로 shard_count개의 init을 합산
+    outbox.publish(
         queue_name="refresh",
         message={
             "type": "init",
-            "count": total_new_posts
+            "count": total_new_posts,
+            "run_id": shard.run_id,
+            "shard_index": shard.index,
+            "shard_count": shard.count
         }
     )
-    logger.info(f"Published refresh message: count={total_new_posts}")
 
-def check_inactive_users():
+    # refresh init과 완료 표시를 함께 커밋 (같은 실행 ID로 다시 떠도 중복 처리하지 않음)
+    checkpoint.completed_at = datetime.now()
+    await asyncio.to_thread(_commit_messages, outbox, checkpoint)
+    logger.info(f"Queued refresh message: count={total_new_posts}")
+
+def _advance_checkpoint(checkpoint: RunCheckpoint, tracker: CheckpointTracker, published_count: int, feeds_processed: int):
+    """
+    처리가 끝난 구간까지 체크포인트 전진 (저장은 _flush_feed_changes에서 메시지와 함께)
+
+    저수위 키 이전의 피드가 만든 메시지와 last_upload 변경은 모두
+    이번 flush에 포함되므로 같은 트랜잭션으로 커밋된다.
+    """
+    if tracker.low_water is not None:
+        checkpoint.last_platform_id, checkpoint.last_account_id = tracker.low_water
+    checkpoint.published_count = published_count
+    checkpoint.feeds_processed = feeds_processed
+
+def _commit_messages(outbox: OutboxBuffer, checkpoint: RunCheckpoint, last_upload_changes=()):
+    """
+    아웃박스 메시지, last_upload 변경, 체크포인트를 한 트랜잭션으로 커밋
+
+    셋이 함께 반영되거나 함께 취소되므로, 중간에 죽어도 같은 글을 두 번 기록하지 않는다.
+    커밋에 실패하면 예외를 그대로 올려 실행을 멈추고, 재시작 시 체크포인트부터 다시 처리한다.
+    """
+    db = SessionLocal()
+    try:
+        written = outbox.write(db)
+        platform_service.apply_last_upload(db, last_upload_changes)
+        checkpoint_service.apply_checkpoint(db, checkpoint)
+        db.commit()
+        logger.info(f"Committed {written} outbox messages with checkpoint {checkpoint}")
+
+    except Exception as e:
+        logger.error(f"Failed to commit outbox messages: {e}")
+        db.rollback()
+        outbox.discard()
+        raise
+    finally:
+        db.close()
+
+def _flush_feed_changes(outbox: OutboxBuffer, checkpoint: RunCheckpoint, started_at: datetime, last_upload_changes, cache_updates, schedule_updates, failures, recovered):
+    """
+    모인 변경 사항 일괄 반영
+
+    메시지와 last_upload, 체크포인트는 한 트랜잭션으로 커밋하고,
+    캐시/일정/실패 기록은 다시 계산해도 되는 값이라 그 뒤에 따로 저장한다.
+    """
+    _commit_messages(outbox, checkpoint, last_upload_changes)
+    feed_cache_service.save_feed_cache(cache_updates)
+    schedule_service.save_feed_schedules(schedule_updates, started_at)
+    failure_service.record_feed_failures(failures)
+    failure_service.clear_feed_failures(recovered)
+
+def _process_feed(outbox: OutboxBuffer, up, articles, source: Optional[str] = None):
+    """
+    수집된 피드 하나에 대해 새 글 필터링 및 아웃박스 기록
+
+    Args:
+        outbox: 메시지 버퍼 (last_upload 변경과 함께 커밋)
+        up: UserPlatformInfo
+        articles: 수집된 글 목록 (ArticleRecord, 새 글만 발행 직전에 검증)
+        source: 실행 밖에서 들어온 글이면 출처 (예: "websub", refresh 집계에서 제외)
+
+    Returns:
+        (발행한 새 글 수, 가장 최신 발행 시각 또는 None)
+        last_upload 반영은 호출자가 모아서 일괄 처리
+    """
+    logger.info(f"Checking {up.platform_name} for user {up.user_id} (account: {up.account_id})")
+
+    if not articles:
+        logger.info(f"No articles found for {up.platform_name}/{up.account_id}")
+        return 0, None
+
+    # 새 글 필터링 (last_upload가 None이면 모든 글이 새 글)
+    new_articles = validate_articles([
+        article for article in articles
+        if up.last_upload is None or article.published_at > up.last_upload
+    ])
+
+    # 가장 최신 발행 시각 추적
+    latest_published_at = max((article.published_at for article in new_articles), default=None)
+
+    if not new_articles:
+        logger.info(f"No new posts for {up.platform_name}/{up.account_id}")
+        return 0, None
+
+    logger.info(f"Found {len(new_articles)} new posts for {up.platform_name}/{up.account_id}")
+
+    # 새 글 발견 시 로그 출력
+    for article in new_articles:
+        logger.info(f"  - New post: {article.title} ({article.published_at})")
+
+    # 사용자-플랫폼 단위로 묶어서 아웃박스 기록 (스키마로 만들어 메시지 형식과 어긋나지 않도록)
+    # last_upload 변경과 함께 커밋된 뒤 릴레이가 RabbitMQ로 발행
+    for i in range(0, len(new_articles), NEW_POSTS_BATCH_MAX):
+        message = NewPostsBatchMessageSchema(
+            user_id=str(up.user_id),
+            platform=up.platform_name,
+            articles=new_articles[i:i + NEW_POSTS_BATCH_MAX],
+            source=source
+        )
+        outbox.publish(queue_name="new_posts", message=message.model_dump(mode='json', exclude_none=True))
+
+    # last_upload는 가장 최신 글의 발행 시각으로 (호출자가 일괄 반영)
+    return len(new_articles), latest_published_at
+
+def check_pushed_posts(publisher: Optional[RabbitMQPublisher] = None) -> int:
+    """
+    WebSub 푸시로 받은 피드 본문 처리
+
+    main_server가 서명을 검증해 WEBSUB_INBOX에 넣은 본문을 폴링과 같은 경로
+    (파싱 -> 구독자별 last_upload 필터링 -> 아웃박스)로 처리한다.
+    배치마다 수신함 삭제, 메시지, last_upload 변경을 한 트랜잭션으로 커밋한다.
+
+    Args:
+        publisher: 릴레이에 사용할 발행기 (없으면 이번 호출용으로 생성)
+
+    Returns:
+        발행한 새 글 수
+    """
+    total_new_posts = 0
+    while True:
+        published, claimed = _check_pushed_batch()
+        total_new_posts += published
+        if claimed < websub_service.PUSH_INBOX_BATCH_SIZE:
+            break
+
+    if total_new_posts:
+        logger.info(f"Queued {total_new_posts} new posts from WebSub pushes")
+        with _publisher_scope(publisher) as publisher:
+            outbox_service.drain_outbox(publisher)
+    return total_new_posts
+
+def _check_pushed_batch():
+    """수신함 한 배치 처리, (발행한 새 글 수, 선점한 본문 수) 반환"""
+    outbox = OutboxBuffer()
+    db = SessionLocal()
+    try:
+        pushes = websub_service.claim_pushed_content(db)
+        if not pushes:
+            db.rollback()
+            return 0, 0
+
+        subscribers = platform_service.get_feed_subscribers(db, {(push.platform_name, push.account_id) for push in pushes})
+        last_upload_changes = []
+        published_total = 0
+
+        for push in pushes:
+            try:
+                articles = rss_service.parse_feed_content(push.platform_name, push.account_id, push.content)
+            except Exception as e:
+                # 잘못된 본문은 다시 처리해도 같으므로 버림 (다음 폴링이 보완)
+                logger.warning(f"Failed to parse pushed content {push}: {e}")
+                continue
+
+            for up in subscribers.get((push.platform_name, push.account_id), []):
+                published, latest_published_at = _process_feed(outbox, up, articles, source="websub")
+                if latest_published_at is not None:
+                    published_total += published
+                    last_upload_changes.append((up.user_id, up.platform_name, latest_published_at))
+                    # 같은 배치에 같은 피드의 푸시가 또 있으면 이미 기록한 글은 제외
+                    up.last_upload = latest_published_at
+
+        outbox.write(db)
+        platform_service.apply_last_upload(db, last_upload_changes)
+        websub_service.delete_pushed_content(db, [push.id for push in pushes])
+        db.commit()
+        return published_total, len(pushes)
+
+    except Exception as e:
+        logger.error(f"Failed to process WebSub pushes: {e}")
+        db.rollback()
+        outbox.discard()
+        raise
+    finally:
+        db.close()
+
+def check_inactive_users(publisher: Optional[RabbitMQPublisher] = None, shard: Optional[ShardSpec] = None):
     """
     1달 이상 글을 올리지 않은 사용자 조회 및 독촉 메일 발행
 
     작업 흐름:
-    1. DB에서 1달 이상 미업로드 사용자 조회
-    2. 각 사용자에 대해 Mail 서버로 RabbitMQ 메시지 발행
-    3. last_upload를 오늘 날짜로 업데이트 (스팸 방지)
+    1. 1달 이상 미업로드 사용자를 배치 단위로 선점하면서 last_upload를 오늘 날짜로 갱신 (스팸 방지)
+    2. 선점한 배치의 독촉 메시지를 같은 트랜잭션으로 아웃박스에 기록 후 커밋
+    3. 아웃박스를 Mail 서버 큐로 릴레이
+
+    선점은 FOR UPDATE SKIP LOCKED로 이루어지므로 여러 샤드가 동시에 실행해도
+    같은 사용자를 나눠 처리할 뿐 중복 발행하지 않는다.
+
+    Args:
+        publisher: 릴레이에 사용할 발행기 (없으면 이번 호출용으로 생성)
+        shard: 샤드 정보 (로그용, 분배는 행 잠금으로 이루어짐)
     """
+    _check_inactive_users(shard)
+
+    with _publisher_scope(publisher) as publisher:
+        outbox_service.drain_outbox(publisher)
+
+def _check_inactive_users(shard: Optional[ShardSpec]):
     logger.info("=== Starting inactive users check ===")
 
-    # 1달 이상 안 쓴 사용자 조회
-    inactive_users = platform_service.get_inactive_users(days=30)
+    def write_reminders(db, users):
+        outbox = OutboxBuffer()
+        for user in users:
+            logger.info(f"Inactive user: {user.name} ({user.email}) - {user.days_inactive} days since last upload")
 
-    if not inactive_users:
-        logger.info("No inactive users found")
-        return
+            # Mail 서버로 보낼 메시지 기록
+            outbox.publish(
+                queue_name="mail_reminders",
+                message={
+                    "user_id": str(user.user_id),
+                    "email": user.email,
+                    "name": user.name,
+                    "platform": user.platform_name,
+                    "days_inactive": user.days_inactive,
+                    "last_upload": user.last_upload.isoformat() if user.last_upload else None
+                }
+            )
 
-    total_reminders = 0
-
-    # 각 미업로드 사용자에 대해 처리
-    for user in inactive_users:
-        logger.info(f"Inactive user: {user.name} ({user.email}) - {user.days_inactive} days since last upload")
-
-        # Mail 서버로 RabbitMQ 메시지 발행
-        publish_message(
-            queue_name="mail_reminders",
-            message={
-                "user_id": str(user.user_id),
-                "email": user.email,
-                "name": user.name,
-                "platform": user.platform_name,
-                "days_inactive": user.days_inactive,
-                "last_upload": user.last_upload.isoformat() if user.last_upload else None
-            }
-        )
+        # 선점한 배치의 last_upload 갱신과 같은 트랜잭션으로 커밋됨
+        outbox.write(db)
 
-        # last_upload를 오늘 날짜로 업데이트 (스팸 방지)
-        platform_service.update_last_upload(
-            user_id=user.user_id,
-            platform_name=user.platform_name,
-            last_upload_time=datetime.now()
-        )
+    total_reminders = platform_service.claim_inactive_users(write_reminders, days=30)
 
-        total_reminders += 1
+    if total_reminders == 0:
+        logger.info("No inactive users found")
 
-    logger.info(f"=== Finished inactive check: {total_reminders} reminders sent ===")
+    logger.info(f"=== Finished inactive check: {total_reminders} reminders queued ===")
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models.db_models import ObserverOutbox
+from app.dependencies.database import SessionLocal
+from app.dependencies.rabbitmq import RabbitMQPublisher
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 릴레이가 한 트랜잭션에서 가져와 발행할 최대 메시지 수
+OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", "1000"))
+# 상주 릴레이가 아웃박스가 비었을 때 다시 확인하기까지 대기 시간 (초)
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+
+# 한 INSERT 문에 담을 최대 행 수 (바인드 파라미터 수 제한)
+SAVE_CHUNK_SIZE = 1000
+
+class OutboxBuffer:
+    """
+    DB 트랜잭션과 함께 기록할 메시지 버퍼
+
+    RabbitMQPublisher와 같은 publish() 인터페이스로 메시지를 모았다가,
+    write()로 last_upload 변경 등과 같은 세션에 기록한다.
+    실제 발행은 릴레이(relay_batch)가 커밋된 메시지만 가져가서 한다.
+    """
+
+    def __init__(self):
+        self._messages: List[Tuple[str, str]] = []
+
+    def publish(self, queue_name: str, message: Dict[str, Any]):
+        """
+        메시지를 버퍼에 추가
+
+        Args:
+            queue_name: 큐 이름
+            message: 발행할 메시지 (dict)
+        """
+        self._messages.append((queue_name, json.dumps(message, ensure_ascii=False)))
+
+    def __len__(self):
+        return len(self._messages)
+
+    def write(self, db: Session) -> int:
+        """
+        버퍼의 메시지를 주어진 세션에 기록하고 버퍼 비우기 (커밋은 호출자가)
+
+        Returns:
+            기록한 메시지 수
+        """
+        if not self._messages:
+            return 0
+
+        now = datetime.now()
+        rows = [
+            {"queue_name": queue_name, "payload": payload, "created_at": now}
+            for queue_name, payload in self._messages
+        ]
+        for i in range(0, len(rows), SAVE_CHUNK_SIZE):
+            db.bulk_insert_mappings(ObserverOutbox, rows[i:i + SAVE_CHUNK_SIZE])
+
+        self._messages = []
+        return len(rows)
+
+    def discard(self):
+        """트랜잭션이 롤백된 경우 버퍼 비우기"""
+        self._messages = []
+
+def relay_batch(publisher: RabbitMQPublisher, batch_size: int = OUTBOX_RELAY_BATCH_SIZE) -> int:
+    """
+    아웃박스에서 메시지를 한 배치 가져와 발행 후 삭제
+
+    FOR UPDATE SKIP LOCKED로 가져오므로 릴레이가 여러 개 떠 있어도 같은 메시지를
+    나눠 갖지 않는다. 브로커 확인을 모두 받은 뒤에 삭제하고 커밋하므로,
+    발행에 실패하면 롤백되어 메시지가 아웃박스에 남는다.
+
+    Args:
+        publisher: RabbitMQ 발행기
+        batch_size: 한 번에 가져올 최대 메시지 수
+
+    Returns:
+        발행한 메시지 수
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(
+            ObserverOutbox.id, ObserverOutbox.queue_name, ObserverOutbox.payload
+        ).order_by(
+            ObserverOutbox.id
+        ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+        if not rows:
+            db.rollback()
+            return 0
+
+        # 발행기 버퍼를 거치지 않음 (실패 시 메시지는 아웃박스에만 남아 한 번만 다시 발행됨)
+        publisher.publish_batch([(row.queue_name, row.payload) for row in rows])
+
+        db.query(ObserverOutbox).filter(
+            ObserverOutbox.id.in_([row.id for row in rows])
+        ).delete(synchronize_session=False)
+        db.commit()
+        return len(rows)
+
+    except Exception as e:
+        logger.error(f"Failed to relay outbox batch: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def drain_outbox(publisher: RabbitMQPublisher, batch_size: int = OUTBOX_RELAY_BATCH_SIZE) -> int:
+    """
+    아웃박스가 빌 때까지 릴레이
+
+    Args:
+        publisher: RabbitMQ 발행기
+        batch_size: 배치 크기
+
+    Returns:
+        발행한 메시지 수
+    """
+    total = 0
+    while True:
+        relayed = relay_batch(publisher, batch_size)
+        total += relayed
+        if relayed < batch_size:
+            break
+
+    if total:
+        logger.info(f"Relayed {total} outbox messages to RabbitMQ")
+    return total
+
+def run_relay(publisher: RabbitMQPublisher, should_stop: Callable[[], bool]):
+    """
+    상주 릴레이 (아웃박스를 계속 비우고, 비어 있으면 잠시 대기)
+
+    Args:
+        publisher: RabbitMQ 발행기
+        should_stop: True를 반환하면 루프 종료
+    """
+    logger.info(f"Outbox relay started (batch {OUTBOX_RELAY_BATCH_SIZE}, poll {OUTBOX_POLL_INTERVAL}s)")
+
+    while not should_stop():
+        try:
+            relayed = relay_batch(publisher)
+        except Exception as e:
+            # 브로커/DB 장애는 잠시 후 다시 시도 (메시지는 아웃박스에 남아 있음)
+            logger.warning(f"Outbox relay failed, retrying in {OUTBOX_POLL_INTERVAL}s: {e}")
+            time.sleep(OUTBOX_POLL_INTERVAL)
+            continue
+
+        if relayed < OUTBOX_RELAY_BATCH_SIZE:
+            # 종료 신호에 바로 반응하도록 짧게 나눠 대기 (하트비트는 발행기 스레드가 처리)
+            deadline = time.monotonic() + OUTBOX_POLL_INTERVAL
+            while not should_stop() and time.monotonic() < deadline:
+                time.sleep(min(1.0, OUTBOX_POLL_INTERVAL))
+
+    logger.info("Outbox relay stopped")
@@ -1,156 +1,559 @@
-from typing import List
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from sqlalchemy import text, tuple_
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from app.models.db_models import UserPlatform, Platform, User
+from app.models.db_models import UserPlatform, Platform, User, FeedCache, FeedSchedule, FeedFailure, WebSubSubscription
+from app.models.schemas import FeedCacheSchema, FeedScheduleSchema
 from app.dependencies.database import SessionLocal
+from app.services.shard_service import ShardSpec
+from app.services.websub_service import STATE_ACTIVE, WEBSUB_FALLBACK_POLL
 import logging
 
 logger = logging.getLogger(__name__)
 
+# UPDATE ... FROM (VALUES ...) 한 문장에 담을 최대 행 수
+LAST_UPLOAD_CHUNK_SIZE = 1000
+# 키셋 페이지네이션으로 한 번에 읽을 USER_PLATFORM 행 수
+USER_PLATFORM_CHUNK_SIZE = 1000
+# 미업로드 사용자를 한 문장으로 선점할 최대 행 수
+INACTIVE_CLAIM_BATCH_SIZE = 1000
+
 class UserPlatformInfo:
     """사용자-플랫폼 정보 DTO"""
-    def __init__(self, user_id, platform_name, account_id, last_upload):
+    # 대량 스캔에서 행마다 __dict__를 만들지 않도록 슬롯 사용
+    __slots__ = ("user_id", "platform_id", "platform_name", "account_id", "last_upload", "feed_cache", "feed_schedule", "failure_count")
+
+    def __init__(self, user_id, platform_name, account_id, last_upload, feed_cache=None, feed_schedule=None, failure_count=0, platform_id=None):
         self.user_id = user_id
+        self.platform_id = platform_id
         self.platform_name = platform_name
         self.account_id = account_id
         self.last_upload = last_upload
+        # 조건부 요청 캐시 (FEED_CACHE, 없으면 None)
+        self.feed_cache = feed_cache
+        # 발행 빈도 통계 (FEED_SCHEDULE, 없으면 None)
+        self.feed_schedule = feed_schedule
+        # 피드 연속 실패 횟수 (FEED_FAILURE, 없으면 0)
+        self.failure_count = failure_count
 
     def __repr__(self):
         return f"UserPlatformInfo(user_id={self.user_id}, platform={self.platform_name}, account_id={self.account_id})"
 
+class FeedInfo:
+    """
+    피드 단위 정보 DTO (같은 피드를 등록한 사용자-플랫폼 묶음)
+
+    피드는 한 번만 수집하고, 결과는 subscribers 각각의 last_upload로 필터링한다.
+    """
+    __slots__ = ("platform_id", "platform_name", "account_id", "subscribers", "feed_cache", "feed_schedule", "failure_count")
+
+    def __init__(self, platform_name, account_id, subscribers, feed_cache=None, feed_schedule=None, failure_count=0, platform_id=None):
+        self.platform_id = platform_id
+        self.platform_name = platform_name
+        self.account_id = account_id
+        self.subscribers: List[UserPlatformInfo] = subscribers
+        # 피드 단위로 공유되는 조건부 요청 캐시 / 발행 빈도 통계 / 연속 실패 횟수
+        self.feed_cache = feed_cache
+        self.feed_schedule = feed_schedule
+        self.failure_count = failure_count
+
+    @property
+    def last_upload(self):
+        """
+        모든 구독자에게 필요한 글의 기준 시각 (가장 오래된 last_upload)
+
+        last_upload가 없는 구독자가 있으면 전체 글이 필요하므로 None
+        """
+        uploads = [up.last_upload for up in self.subscribers]
+        if any(upload is None for upload in uploads):
+            return None
+        return min(uploads)
+
+    def __repr__(self):
+        return f"FeedInfo(platform={self.platform_name}, account_id={self.account_id}, subscribers={len(self.subscribers)})"
+
 class InactiveUserInfo:
     """미업로드 사용자 정보 DTO"""
-    def __init__(self, user_id, email, name, platform_name, last_upload, days_inactive):
+    __slots__ = ("user_id", "email", "name", "platform_name", "account_id", "last_upload", "days_inactive")
+
+    def __init__(self, user_id, email, name, platform_name, last_upload, days_inactive, account_id=None):
         self.user_id = user_id
         self.email = email
         self.name = name
         self.platform_name = platform_name
+        self.account_id = account_id
         self.last_upload = last_upload
         self.days_inactive = days_inactive
 
     def __repr__(self):
         return f"InactiveUserInfo(user_id={self.user_id}, email={self.email}, days_inactive={self.days_inactive})"
 
-def get_all_user_platforms() -> List[UserPlatformInfo]:
+def _to_feed_cache(row):
+    """조회 결과 행에서 조건부 요청 캐시 추출 (캐시가 없으면 None)"""
+    if row.etag is None and row.last_modified is None and row.body_hash is None:
+        return None
+    return FeedCacheSchema(etag=row.etag, last_modified=row.last_modified, body_hash=row.body_hash)
+
+def _to_feed_schedule(row):
+    """조회 결과 행에서 발행 빈도 통계 추출 (통계가 없으면 None)"""
+    if row.last_published_at is None and row.avg_interval_seconds is None:
+        return None
+    return FeedScheduleSchema(last_published_at=row.last_published_at, avg_interval_seconds=row.avg_interval_seconds)
+
+def get_all_user_platforms(shard: ShardSpec = None) -> List[UserPlatformInfo]:
     """
-    DB에서 모든 사용자-플랫폼 정보 조회
+    DB에서 모든 사용자-플랫폼 정보 조회 (iter_user_platforms를 리스트로 모음)
+
+    Args:
+        shard: 샤드 정보 (주어지면 이 샤드에 속한 행만 반환)
 
     Returns:
         List[UserPlatformInfo]: 사용자-플랫폼 정보 리스트
     """
-    db = SessionLocal()
-    try:
-        # USER_PLATFORM과 PLATFORM JOIN
-        results = db.query(
-            UserPlatform.user_id,
-            Platform.name.label('platform_name'),
-            UserPlatform.account_id,
-            UserPlatform.last_upload
-        ).join(
-            Platform, UserPlatform.platform_id == Platform.platform_id
-        ).all()
+    user_platforms = list(iter_user_platforms(shard))
+    logger.info(f"Found {len(user_platforms)} user-platform mappings")
+    return user_platforms
+
+def iter_user_platforms(
+    shard: ShardSpec = None,
+    due_at: datetime = None,
+    chunk_size: int = USER_PLATFORM_CHUNK_SIZE,
+    start_after: Tuple = None,
+) -> Iterator[UserPlatformInfo]:
+    """
+    사용자-플랫폼 정보를 키셋 페이지 단위로 읽어 하나씩 반환
 
-        user_platforms = [
-            UserPlatformInfo(
+    (platform_id, account_id, user_id) 순서로 chunk_size개씩 조회하고, 다음 페이지는
+    마지막 키 이후부터 읽는다. 페이지마다 세션을 새로 열어 수집 파이프라인이
+    도는 동안 트랜잭션을 붙잡지 않으며, 메모리는 페이지 크기로 제한된다.
+    같은 피드를 등록한 행은 연속으로 나오므로 iter_feeds가 묶을 수 있다.
+
+    Args:
+        shard: 샤드 정보 (주어지면 이 샤드에 속한 행만 반환)
+        due_at: 주어지면 next_check_at이 이 시각 이전인 (또는 일정이 없는) 행만 반환
+                (격리 기간이 남은 피드, WebSub 푸시를 받는 피드도 제외하되
+                 푸시 피드는 WEBSUB_FALLBACK_POLL마다 한 번은 폴링)
+        chunk_size: 한 번에 조회할 행 수
+        start_after: 주어지면 이 피드 키 (platform_id, account_id) 다음부터 반환 (체크포인트 재개용)
+
+    Yields:
+        UserPlatformInfo
+    """
+    last_key = None
+
+    while True:
+        db = SessionLocal()
+        try:
+            # USER_PLATFORM과 PLATFORM JOIN (+ 조건부 요청 캐시, 수집 일정 LEFT JOIN)
+            query = db.query(
+                UserPlatform.user_id,
+                UserPlatform.platform_id,
+                Platform.name.label('platform_name'),
+                UserPlatform.account_id,
+                UserPlatform.last_upload,
+                FeedCache.etag,
+                FeedCache.last_modified,
+                FeedCache.body_hash,
+                FeedSchedule.last_published_at,
+                FeedSchedule.avg_interval_seconds,
+                FeedFailure.failure_count
+            ).join(
+                Platform, UserPlatform.platform_id == Platform.platform_id
+            ).outerjoin(
+                FeedCache,
+                (FeedCache.platform_name == Platform.name) & (FeedCache.account_id == UserPlatform.account_id)
+            ).outerjoin(
+                FeedSchedule,
+                (FeedSchedule.platform_name == Platform.name) & (FeedSchedule.account_id == UserPlatform.account_id)
+            ).outerjoin(
+                FeedFailure,
+                (FeedFailure.platform_name == Platform.name) & (FeedFailure.account_id == UserPlatform.account_id)
+            ).filter(
+                # 계정 ID가 없으면 피드 주소를 만들 수 없음
+                UserPlatform.account_id.isnot(None)
+            )
+
+            # 샤드 조건은 DB에서 (샤드마다 전체 행을 읽지 않도록)
+            if shard is not None and shard.count > 1:
+                query = query.filter(shard.clause(Platform.name, UserPlatform.account_id))
+
+            if due_at is not None:
+                query = query.outerjoin(
+                    WebSubSubscription,
+                    (WebSubSubscription.platform_name == Platform.name)
+                    & (WebSubSubscription.account_id == UserPlatform.account_id)
+                    & (WebSubSubscription.state == STATE_ACTIVE)
+                    & (WebSubSubscription.lease_expires_at > due_at)
+                ).filter(
+                    FeedSchedule.next_check_at.is_(None) | (FeedSchedule.next_check_at <= due_at)
+                ).filter(
+                    FeedFailure.quarantined_until.is_(None) | (FeedFailure.quarantined_until <= due_at)
+                ).filter(
+                    WebSubSubscription.subscription_id.is_(None)
+                    | FeedSchedule.last_checked_at.is_(None)
+                    | (FeedSchedule.last_checked_at <= due_at - WEBSUB_FALLBACK_POLL)
+                )
+
+            if start_after is not None:
+                query = query.filter(tuple_(UserPlatform.platform_id, UserPlatform.account_id) > tuple_(*start_after))
+
+            if last_key is not None:
+                query = query.filter(
+                    tuple_(UserPlatform.platform_id, UserPlatform.account_id, UserPlatform.user_id) > last_key
+                )
+
+            rows = query.order_by(
+                UserPlatform.platform_id, UserPlatform.account_id, UserPlatform.user_id
+            ).limit(chunk_size).all()
+
+        except Exception as e:
+            logger.error(f"Failed to fetch user platforms: {e}")
+            return
+        finally:
+            db.close()
+
+        for row in rows:
+            yield UserPlatformInfo(
                 user_id=row.user_id,
+                platform_id=row.platform_id,
                 platform_name=row.platform_name,
                 account_id=row.account_id,
-                last_upload=row.last_upload
+                last_upload=row.last_upload,
+                feed_cache=_to_feed_cache(row),
+                feed_schedule=_to_feed_schedule(row),
+                failure_count=row.failure_count or 0
             )
-            for row in results
-        ]
 
-        logger.info(f"Found {len(user_platforms)} user-platform mappings")
-        return user_platforms
+        if len(rows) < chunk_size:
+            return
+        last_key = tuple_(rows[-1].platform_id, rows[-1].account_id, rows[-1].user_id)
 
-    except Exception as e:
-        logger.error(f"Failed to fetch user platforms: {e}")
-        return []
-    finally:
-        db.close()
+def iter_feeds(
+    shard: ShardSpec = None,
+    due_at: datetime = None,
+    chunk_size: int = USER_PLATFORM_CHUNK_SIZE,
+    start_after: Tuple = None,
+) -> Iterator[FeedInfo]:
+    """
+    수집할 피드를 하나씩 반환 (같은 피드를 등록한 사용자-플랫폼을 묶어서)
+
+    iter_user_platforms가 피드 순서로 정렬해 돌려주므로 인접한 행만 묶으면 되며,
+    페이지 경계에 걸친 피드도 하나로 합쳐진다.
 
-def get_inactive_users(days: int = 30) -> List[InactiveUserInfo]:
+    Args:
+        shard: 샤드 정보 (주어지면 이 샤드에 속한 피드만 반환)
+        due_at: 주어지면 next_check_at이 이 시각 이전인 (또는 일정이 없는) 피드만 반환
+        chunk_size: 한 번에 조회할 행 수
+        start_after: 주어지면 이 피드 키 (platform_id, account_id) 다음부터 반환
+
+    Yields:
+        FeedInfo
+    """
+    user_platforms = iter_user_platforms(shard, due_at, chunk_size, start_after)
+
+    for (platform_name, account_id), group in groupby(user_platforms, key=lambda up: (up.platform_name, up.account_id)):
+        subscribers = list(group)
+        yield FeedInfo(
+            platform_id=subscribers[0].platform_id,
+            platform_name=platform_name,
+            account_id=account_id,
+            subscribers=subscribers,
+            feed_cache=subscribers[0].feed_cache,
+            feed_schedule=subscribers[0].feed_schedule,
+            failure_count=subscribers[0].failure_count
+        )
+
+def get_feed_subscribers(db: Session, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], List[UserPlatformInfo]]:
     """
-    1달 이상 글을 올리지 않은 사용자 조회
+    주어진 피드를 등록한 사용자-플랫폼 조회 (푸시 수신 경로용, 호출자의 트랜잭션에서)
 
     Args:
-        days: 기준 일수 (기본값: 30일)
+        db: DB 세션
+        keys: [(platform_name, account_id), ...]
 
     Returns:
-        List[InactiveUserInfo]: 미업로드 사용자 정보 리스트
+        {(platform_name, account_id): [UserPlatformInfo, ...]}
     """
-    db = SessionLocal()
-    try:
-        cutoff_date = datetime.now() - timedelta(days=days)
+    keys = list(keys)
+    subscribers = {}
 
-        # USER_PLATFORM, PLATFORM, USER 3-way JOIN
-        results = db.query(
+    for i in range(0, len(keys), USER_PLATFORM_CHUNK_SIZE):
+        rows = db.query(
             UserPlatform.user_id,
-            User.email,
-            User.name,
+            UserPlatform.platform_id,
             Platform.name.label('platform_name'),
+            UserPlatform.account_id,
             UserPlatform.last_upload
         ).join(
             Platform, UserPlatform.platform_id == Platform.platform_id
-        ).join(
-            User, UserPlatform.user_id == User.user_id
         ).filter(
-            UserPlatform.last_upload < cutoff_date
+            tuple_(Platform.name, UserPlatform.account_id).in_(keys[i:i + USER_PLATFORM_CHUNK_SIZE])
         ).all()
 
-        inactive_users = [
-            InactiveUserInfo(
+        for row in rows:
+            subscribers.setdefault((row.platform_name, row.account_id), []).append(
+                UserPlatformInfo(
+                    user_id=row.user_id,
+                    platform_id=row.platform_id,
+                    platform_name=row.platform_name,
+                    account_id=row.account_id,
+                    last_upload=row.last_upload
+                )
+            )
+
+    return subscribers
+
+def get_inactive_users(days: int = 30, shard: ShardSpec = None) -> List[InactiveUserInfo]:
+    """
+    1달 이상 글을 올리지 않은 사용자 조회 (iter_inactive_users를 리스트로 모음)
+
+    Args:
+        days: 기준 일수 (기본값: 30일)
+        shard: 샤드 정보 (주어지면 이 샤드에 속한 행만 반환)
+
+    Returns:
+        List[InactiveUserInfo]: 미업로드 사용자 정보 리스트
+    """
+    inactive_users = list(iter_inactive_users(days, shard))
+    logger.info(f"Found {len(inactive_users)} inactive users (>{days} days)")
+    return inactive_users
+
+def iter_inactive_users(days: int = 30, shard: ShardSpec = None, chunk_size: int = USER_PLATFORM_CHUNK_SIZE) -> Iterator[InactiveUserInfo]:
+    """
+    1달 이상 글을 올리지 않은 사용자를 키셋 페이지 단위로 읽어 하나씩 반환
+
+    Args:
+        days: 기준 일수 (기본값: 30일)
+        shard: 샤드 정보 (주어지면 이 샤드에 속한 행만 반환)
+        chunk_size: 한 번에 조회할 행 수
+
+    Yields:
+        InactiveUserInfo
+    """
+    cutoff_date = datetime.now() - timedelta(days=days)
+    last_key = None
+
+    while True:
+        db = SessionLocal()
+        try:
+            # USER_PLATFORM, PLATFORM, USER 3-way JOIN
+            query = db.query(
+                UserPlatform.user_id,
+                UserPlatform.platform_id,
+                User.email,
+                User.name,
+                Platform.name.label('platform_name'),
+                UserPlatform.account_id,
+                UserPlatform.last_upload
+            ).join(
+                Platform, UserPlatform.platform_id == Platform.platform_id
+            ).join(
+                User, UserPlatform.user_id == User.user_id
+            ).filter(
+                UserPlatform.last_upload < cutoff_date
+            )
+
+            if shard is not None and shard.count > 1:
+                query = query.filter(shard.clause(Platform.name, UserPlatform.account_id))
+
+            if last_key is not None:
+                query = query.filter(tuple_(UserPlatform.user_id, UserPlatform.platform_id) > last_key)
+
+            rows = query.order_by(UserPlatform.user_id, UserPlatform.platform_id).limit(chunk_size).all()
+
+        except Exception as e:
+            logger.error(f"Failed to fetch inactive users: {e}")
+            return
+        finally:
+            db.close()
+
+        now = datetime.now()
+        for row in rows:
+            yield InactiveUserInfo(
                 user_id=row.user_id,
                 email=row.email,
                 name=row.name,
                 platform_name=row.platform_name,
                 last_upload=row.last_upload,
-                days_inactive=(datetime.now() - row.last_upload).days if row.last_upload else None
+                days_inactive=(now - row.last_upload).days if row.last_upload else None,
+                account_id=row.account_id
             )
-            for row in results
-        ]
 
-        logger.info(f"Found {len(inactive_users)} inactive users (>{days} days)")
-        return inactive_users
+        if len(rows) < chunk_size:
+            return
+        last_key = tuple_(rows[-1].user_id, rows[-1].platform_id)
 
-    except Exception as e:
-        logger.error(f"Failed to fetch inactive users: {e}")
-        return []
-    finally:
-        db.close()
+def claim_inactive_users(
+    handler: Callable[[Session, List[InactiveUserInfo]], None],
+    days: int = 30,
+    batch_size: int = INACTIVE_CLAIM_BATCH_SIZE,
+) -> int:
+    """
+    미업로드 사용자를 선점하여 독촉 처리 (조회 + last_upload 갱신을 한 문장으로)
+
+    배치마다 WITH ... FOR UPDATE SKIP LOCKED로 대상 행을 잠그고
+    UPDATE ... RETURNING으로 last_upload를 지금 시각으로 바꾸면서 사용자 정보를 돌려받는다.
+    handler는 같은 세션을 받아 (예: 아웃박스에 메시지 기록) 같은 트랜잭션에서 처리하며,
+    handler가 성공한 뒤에만 커밋하므로 실패하면 롤백되어 다음 실행에서 다시 선점된다.
+    동시에 도는 다른 샤드는 잠긴 행을 건너뛰므로 같은 사용자를 두 번 처리하지 않는다.
+
+    Args:
+        handler: 선점한 배치를 처리할 함수 handler(db, batch) (예: 메일 메시지를 아웃박스에 기록)
+        days: 기준 일수 (기본값: 30일)
+        batch_size: 한 번에 선점할 최대 행 수
+
+    Returns:
+        처리한 행 수
+    """
+    cutoff_date = datetime.now() - timedelta(days=days)
+    total = 0
+
+    while True:
+        db = SessionLocal()
+        try:
+            reminded_at = datetime.now()
+            rows = db.execute(text("""
+                WITH due AS (
+                    SELECT user_id, platform_id, last_upload
+                    FROM "USER_PLATFORM"
+                    WHERE last_upload < :cutoff
+                    ORDER BY user_id, platform_id
+                    LIMIT :batch_size
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE "USER_PLATFORM" AS up
+                SET last_upload = :reminded_at
+                FROM due
+                JOIN "USER" AS u ON u.user_id = due.user_id
+                JOIN "PLATFORM" AS p ON p.platform_id = due.platform_id
+                WHERE up.user_id = due.user_id
+                  AND up.platform_id = due.platform_id
+                RETURNING up.user_id, u.email, u.name, p.name AS platform_name,
+                          up.id AS account_id, due.last_upload AS previous_upload
+            """), {"cutoff": cutoff_date, "batch_size": batch_size, "reminded_at": reminded_at}).all()
+
+            batch = [
+                InactiveUserInfo(
+                    user_id=row.user_id,
+                    email=row.email,
+                    name=row.name,
+                    platform_name=row.platform_name,
+                    last_upload=row.previous_upload,
+                    days_inactive=(reminded_at - row.previous_upload).days,
+                    account_id=row.account_id
+                )
+                for row in rows
+            ]
+
+            if batch:
+                handler(db, batch)
+            db.commit()
+
+        except Exception as e:
+            logger.error(f"Failed to claim inactive users: {e}")
+            db.rollback()
+            return total
+        finally:
+            db.close()
+
+        total += len(batch)
+        if len(batch) < batch_size:
+            return total
 
 def update_last_upload(user_id, platform_name: str, last_upload_time):
     """
-    사용자-플랫폼의 last_upload 시각 업데이트
+    사용자-플랫폼의 last_upload 시각 업데이트 (단건)
 
     Args:
         user_id: 사용자 ID
         platform_name: 플랫폼 이름
         last_upload_time: 마지막 업로드 시각
     """
-    db = SessionLocal()
-    try:
-        # Platform ID 조회
-        platform = db.query(Platform).filter(Platform.name == platform_name).first()
-        if not platform:
-            logger.error(f"Platform not found: {platform_name}")
-            return
+    bulk_update_last_upload([(user_id, platform_name, last_upload_time)])
 
-        # UserPlatform 업데이트
-        user_platform = db.query(UserPlatform).filter(
-            UserPlatform.user_id == user_id,
-            UserPlatform.platform_id == platform.platform_id
-        ).first()
+def bulk_update_last_upload(changes: List[Tuple]) -> int:
+    """
+    여러 사용자-플랫폼의 last_upload를 한 트랜잭션에서 일괄 업데이트
 
-        if user_platform:
-            user_platform.last_upload = last_upload_time
-            db.commit()
-            logger.info(f"Updated last_upload for user {user_id}, platform {platform_name}")
-        else:
-            logger.error(f"UserPlatform not found: user={user_id}, platform={platform_name}")
+    Args:
+        changes: [(user_id, platform_name, last_upload_time), ...]
+                 같은 (user_id, platform_name)이 여러 번 있으면 가장 최근 값 사용
+
+    WebSub 푸시와 폴링이 같은 피드를 동시에 처리할 수 있으므로 last_upload는 앞으로만 움직인다
+    (먼저 시작한 폴링의 오래된 값이 나중에 커밋되어도 되돌리지 않음).
+
+    Returns:
+        업데이트된 행 수
+    """
+    db = SessionLocal()
+    try:
+        updated = apply_last_upload(db, changes)
+        db.commit()
+        return updated
 
     except Exception as e:
-        logger.error(f"Failed to update last_upload: {e}")
+        logger.error(f"Failed to bulk update last_upload: {e}")
         db.rollback()
+        return 0
     finally:
         db.close()
+
+def apply_last_upload(db: Session, changes: List[Tuple]) -> int:
+    """
+    주어진 세션에서 last_upload 일괄 업데이트 (커밋은 호출자가)
+
+    청크마다 UPDATE ... FROM (VALUES ...) 한 문장으로 처리하며,
+    PLATFORM 조회도 같은 문장 안에서 JOIN으로 해결한다.
+    아웃박스 메시지와 같은 트랜잭션에 묶을 때 사용한다.
+
+    Args:
+        db: DB 세션
+        changes: [(user_id, platform_name, last_upload_time), ...]
+                 같은 (user_id, platform_name)이 여러 번 있으면 가장 최근 값 사용
+
+    WebSub 푸시와 폴링이 같은 피드를 동시에 처리할 수 있으므로 last_upload는 앞으로만 움직인다
+    (먼저 시작한 폴링의 오래된 값이 나중에 커밋되어도 되돌리지 않음).
+
+    Returns:
+        업데이트된 행 수
+    """
+    # 같은 키가 여러 번 들어오면 VALUES 안에서 중복되지 않도록 정리
+    latest = {}
+    for user_id, platform_name, last_upload_time in changes:
+        key = (str(user_id), platform_name)
+        if key not in latest or last_upload_time > latest[key]:
+            latest[key] = last_upload_time
+
+    if not latest:
+        return 0
+
+    rows = [(user_id, platform_name, ts) for (user_id, platform_name), ts in latest.items()]
+
+    updated = 0
+    for i in range(0, len(rows), LAST_UPLOAD_CHUNK_SIZE):
+        chunk = rows[i:i + LAST_UPLOAD_CHUNK_SIZE]
+
+        values = []
+        params = {}
+        for j, (user_id, platform_name, ts) in enumerate(chunk):
+            values.append(f"(CAST(:u{j} AS uuid), :p{j}, CAST(:t{j} AS timestamp))")
+            params[f"u{j}"] = user_id
+            params[f"p{j}"] = platform_name
+            params[f"t{j}"] = ts
+
+        result = db.execute(text(f"""
+            UPDATE "USER_PLATFORM" AS up
+            SET last_upload = GREATEST(COALESCE(up.last_upload, v.last_upload), v.last_upload)
+            FROM (VALUES {", ".join(values)}) AS v(user_id, platform_name, last_upload)
+            JOIN "PLATFORM" AS p ON p.name = v.platform_name
+            WHERE up.user_id = v.user_id
+              AND up.platform_id = p.platform_id
+        """), params)
+        updated += result.rowcount
+
+    if updated != len(rows):
+        logger.warning(f"Updated last_upload for {updated}/{len(rows)} user-platforms (missing rows skipped)")
+    else:
+        logger.info(f"Updated last_upload for {updated} user-platforms")
+    return updated
@@ -1,5 +1,8 @@
-from typing import List
-from app.models.schemas import ArticleSchema
+from typing import List, Optional
+from datetime import datetime
+import httpx
+from app.models.schemas import ArticleSchema, FeedCacheSchema
+from app.parsers.base import FeedFetchResult, ArticleRecord
 from app.parsers.naver import NaverRSSParser
 from app.parsers.tistory import TistoryRSSParser
 from app.parsers.velog import VelogRSSParser
@@ -37,3 +40,78 @@ def fetch_rss(platform_name: str, account_id: str) -> List[ArticleSchema]:
     except Exception as e:
         logger.error(f"Failed to fetch RSS for {platform_name}/{account_id}: {e}")
         return []
+
+async def fetch_rss_async(
+    client: httpx.AsyncClient,
+    platform_name: str,
+    account_id: str,
+    cache: Optional[FeedCacheSchema] = None,
+    cutoff: Optional[datetime] = None,
+    defer_parse: bool = False,
+) -> FeedFetchResult:
+    """
+    플랫폼별 RSS 비동기 수집 및 파싱 (조건부 요청)
+
+    Args:
+        client: 공유 httpx.AsyncClient
+        platform_name: 플랫폼 이름 (Naver, Tistory, Velog)
+        account_id: 플랫폼별 사용자 식별자
+        cache: 이전 수집 시 저장한 조건부 요청 캐시
+        cutoff: 이 시각 이후의 글만 필요하면 지정 (스트리밍 파싱 후 조기 종료)
+        defer_parse: 전체 파싱이 필요하면 파싱하지 않고 원본 본문(content)으로 반환
+
+    Returns:
+        FeedFetchResult: 파싱된 글 목록 및 갱신된 캐시
+    """
+    parser = PARSER_MAP.get(platform_name)
+
+    if not parser:
+        logger.error(f"Unknown platform: {platform_name}")
+        return FeedFetchResult([], error=ValueError(f"Unknown platform: {platform_name}"))
+
+    try:
+        return await parser.parse_async(client, account_id, cache, cutoff, defer_parse)
+    except Exception as e:
+        logger.error(f"Failed to fetch RSS for {platform_name}/{account_id}: {e}")
+        return FeedFetchResult([], error=e)
+
+def parse_feed_content(
+    platform_name: str,
+    account_id: str,
+    content: bytes,
+    cutoff: Optional[datetime] = None,
+) -> List[ArticleRecord]:
+    """
+    수집한 RSS 본문 파싱 (파싱 프로세스 풀 워커에서 실행)
+
+    워커에 넘기고 받는 값은 바이트와 튜플뿐이라 직렬화 비용이 작다.
+
+    Args:
+        platform_name: 플랫폼 이름
+        account_id: 플랫폼별 사용자 식별자
+        content: RSS 응답 본문
+        cutoff: 주어지면 이 시각 이후에 발행된 글만 반환
+
+    Returns:
+        List[ArticleRecord]: (title, link, published_at, thumbnail, tags) 튜플 리스트
+    """
+    parser = PARSER_MAP[platform_name]
+    return parser.parse_records(content, parser.get_rss_url(account_id), cutoff)
+
+def get_feed_host(platform_name: str, account_id: str) -> Optional[str]:
+    """
+    RSS 피드의 호스트 이름 조회 (호스트별 동시성 제한용)
+
+    Args:
+        platform_name: 플랫폼 이름
+        account_id: 플랫폼별 사용자 식별자
+
+    Returns:
+        호스트 이름, 알 수 없는 플랫폼이면 None
+    """
+    parser = PARSER_MAP.get(platform_name)
+
+    if not parser:
+        return None
+
+    return httpx.URL(parser.get_rss_url(account_id)).host
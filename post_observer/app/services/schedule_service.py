@@ -0,0 +1,140 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
+from app.models.db_models import FeedSchedule
+from app.models.schemas import FeedScheduleSchema
+from app.dependencies.database import SessionLocal
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 수집 주기 하한 / 상한 / 통계가 없을 때 기본값
+POLL_MIN_INTERVAL = timedelta(minutes=int(os.getenv("POLL_MIN_INTERVAL_MINUTES", "60")))
+POLL_MAX_INTERVAL = timedelta(hours=int(os.getenv("POLL_MAX_INTERVAL_HOURS", "168")))
+POLL_DEFAULT_INTERVAL = timedelta(hours=24)
+# 수집 실행 주기 (크론잡은 하루 한 번, 데몬은 NEW_POSTS_INTERVAL을 넘김)
+POLL_RUN_INTERVAL = timedelta(minutes=int(os.getenv("POLL_RUN_INTERVAL_MINUTES", "1440")))
+
+# 글 간격 지수이동평균 가중치 (클수록 최근 간격을 많이 반영)
+INTERVAL_EWMA_ALPHA = 0.3
+
+# 한 INSERT 문에 담을 최대 행 수 (바인드 파라미터 수 제한)
+SAVE_CHUNK_SIZE = 1000
+
+def update_stats(schedule: Optional[FeedScheduleSchema], published_times: List[datetime]) -> FeedScheduleSchema:
+    """
+    새로 본 발행 시각으로 피드의 발행 빈도 통계 갱신
+
+    이전에 본 가장 최신 글 이후의 발행 시각만 시간 순으로 반영한다.
+    처음 보는 피드는 피드에 남아 있는 글 전체로 평균 간격을 추정한다.
+
+    Args:
+        schedule: 기존 통계 (처음 보는 피드면 None)
+        published_times: 이번에 수집한 글들의 발행 시각
+
+    Returns:
+        FeedScheduleSchema: 갱신된 통계
+    """
+    last_published_at = schedule.last_published_at if schedule else None
+    avg_interval = schedule.avg_interval_seconds if schedule else None
+
+    for published_at in sorted(set(published_times)):
+        if last_published_at is not None and published_at <= last_published_at:
+            continue
+
+        if last_published_at is not None:
+            interval = (published_at - last_published_at).total_seconds()
+            if avg_interval is None:
+                avg_interval = interval
+            else:
+                avg_interval = INTERVAL_EWMA_ALPHA * interval + (1 - INTERVAL_EWMA_ALPHA) * avg_interval
+
+        last_published_at = published_at
+
+    return FeedScheduleSchema(last_published_at=last_published_at, avg_interval_seconds=avg_interval)
+
+def next_check_at(schedule: FeedScheduleSchema, now: datetime) -> datetime:
+    """
+    발행 빈도 통계로 다음 수집 시각 계산
+
+    평균 글 간격의 절반마다 확인한다. 마지막 글 이후 평균보다 오래
+    조용한 피드는 그 경과 시간을 간격으로 보고 점점 드물게 확인한다.
+
+    Args:
+        schedule: 피드 발행 빈도 통계
+        now: 현재 시각
+
+    Returns:
+        다음 수집 예정 시각
+    """
+    if schedule.avg_interval_seconds is None or schedule.last_published_at is None:
+        return now + POLL_DEFAULT_INTERVAL
+
+    expected = timedelta(seconds=schedule.avg_interval_seconds)
+    since_last = now - schedule.last_published_at
+    interval = max(expected, since_last) / 2
+
+    return now + min(max(interval, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL)
+
+def due_cutoff(started_at: datetime, run_interval: timedelta = POLL_RUN_INTERVAL) -> datetime:
+    """
+    이번 실행에서 수집할 피드의 예정 시각 상한
+
+    다음 실행보다 이번 실행에 가까운 피드까지 포함한다. 예정 시각이 실행 시작 직후인 피드를
+    빼면 한 주기를 통째로 건너뛰게 된다 (하루 1회 크론에서 24시간 주기 피드가 48시간마다 수집됨).
+
+    Args:
+        started_at: 실행 시작 시각
+        run_interval: 수집 실행 주기
+
+    Returns:
+        next_check_at이 이 시각 이전인 피드가 이번 실행 대상
+    """
+    return started_at + run_interval / 2
+
+def save_feed_schedules(entries: Dict[Tuple[str, str], FeedScheduleSchema], checked_at: datetime):
+    """
+    피드별 발행 빈도 통계와 다음 수집 시각 일괄 저장 (upsert)
+
+    Args:
+        entries: {(platform_name, account_id): FeedScheduleSchema}
+        checked_at: 실행 시작 시각 (다음 수집 시각의 기준, 저장 시점 기준이면 실행 시간만큼 밀림)
+    """
+    if not entries:
+        return
+
+    rows = [
+        {
+            "platform_name": platform_name,
+            "account_id": account_id,
+            "last_published_at": schedule.last_published_at,
+            "avg_interval_seconds": schedule.avg_interval_seconds,
+            "next_check_at": next_check_at(schedule, checked_at),
+            "last_checked_at": checked_at,
+        }
+        for (platform_name, account_id), schedule in entries.items()
+    ]
+
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), SAVE_CHUNK_SIZE):
+            stmt = insert(FeedSchedule).values(rows[i:i + SAVE_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[FeedSchedule.platform_name, FeedSchedule.account_id],
+                set_={
+                    "last_published_at": stmt.excluded.last_published_at,
+                    "avg_interval_seconds": stmt.excluded.avg_interval_seconds,
+                    "next_check_at": stmt.excluded.next_check_at,
+                    "last_checked_at": stmt.excluded.last_checked_at,
+                }
+            )
+            db.execute(stmt)
+        db.commit()
+        logger.info(f"Saved feed schedule for {len(rows)} feeds")
+
+    except Exception as e:
+        logger.error(f"Failed to save feed schedule: {e}")
+        db.rollback()
+    finally:
+        db.close()
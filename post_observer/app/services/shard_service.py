@@ -0,0 +1,76 @@
+import os
+import uuid
+import hashlib
+import logging
+from sqlalchemy import BigInteger, cast, func, literal
+from sqlalchemy.dialects.postgresql import BIT
+
+logger = logging.getLogger(__name__)
+
+def shard_of(platform_name: str, account_id: str, shard_count: int) -> int:
+    """
+    피드 식별자 (플랫폼 이름 + 계정 ID)의 안정적인 샤드 번호 계산
+
+    프로세스마다 값이 달라지는 hash() 대신 md5 앞 32비트를 사용하므로
+    모든 파드가 같은 행을 같은 샤드로 분류한다. 같은 피드를 등록한
+    사용자들은 항상 같은 샤드에 모인다. DB에서도 같은 값을 계산할 수 있어
+    (shard_of_sql) 샤드 조건을 쿼리에 넣을 수 있다.
+
+    Args:
+        platform_name: 플랫폼 이름
+        account_id: 플랫폼별 사용자 식별자
+        shard_count: 전체 샤드 수
+
+    Returns:
+        0 이상 shard_count 미만의 샤드 번호
+    """
+    key = f"{platform_name}:{account_id}".encode("utf-8")
+    return int(hashlib.md5(key).hexdigest()[:8], 16) % shard_count
+
+def shard_of_sql(platform_name_column, account_id_column, shard_count: int):
+    """
+    shard_of와 같은 값을 계산하는 SQL 식 (PostgreSQL)
+
+    ('x' || md5 앞 8자리)::bit(32)::bigint 는 md5 앞 32비트를 부호 없는 정수로 읽은 값이다.
+
+    Args:
+        platform_name_column: 플랫폼 이름 컬럼
+        account_id_column: 계정 ID 컬럼
+        shard_count: 전체 샤드 수
+    """
+    key = platform_name_column + literal(":") + account_id_column
+    prefix = func.substr(func.md5(key), 1, 8)
+    return func.mod(cast(cast(literal("x") + prefix, BIT(32)), BigInteger), shard_count)
+
+class ShardSpec:
+    """observer 실행 샤드 정보 DTO"""
+    def __init__(self, index: int = 0, count: int = 1, run_id: str = None):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard: index={index}, count={count}")
+        self.index = index
+        self.count = count
+        # 같은 실행의 샤드들이 공유하는 실행 ID (refresh init 집계용)
+        self.run_id = run_id or uuid.uuid4().hex
+
+    @classmethod
+    def from_env(cls) -> "ShardSpec":
+        """
+        환경변수에서 샤드 정보 생성
+
+        SHARD_INDEX가 없으면 Kubernetes Indexed Job이 주입하는
+        JOB_COMPLETION_INDEX를 사용한다.
+        """
+        index = int(os.getenv("SHARD_INDEX", os.getenv("JOB_COMPLETION_INDEX", "0")))
+        count = int(os.getenv("SHARD_COUNT", "1"))
+        return cls(index=index, count=count, run_id=os.getenv("OBSERVER_RUN_ID"))
+
+    def owns(self, platform_name: str, account_id: str) -> bool:
+        """이 샤드가 처리할 피드인지 여부"""
+        return self.count == 1 or shard_of(platform_name, account_id, self.count) == self.index
+
+    def clause(self, platform_name_column, account_id_column):
+        """이 샤드가 처리할 행만 남기는 WHERE 조건 (owns와 같은 결과)"""
+        return shard_of_sql(platform_name_column, account_id_column, self.count) == self.index
+
+    def __repr__(self):
+        return f"ShardSpec(index={self.index}, count={self.count}, run_id={self.run_id})"
@@ -0,0 +1,282 @@
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import feedparser
+import httpx
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.models.db_models import WebSubSubscription, WebSubInbox, UserPlatform, Platform
+from app.dependencies.database import SessionLocal
+from app.dependencies.http_client import get_sync_client
+from app.services.rss_service import PARSER_MAP
+import logging
+
+logger = logging.getLogger(__name__)
+
+# main_server 콜백의 외부 기준 URL (예: https://jandi.example.com), 비어 있으면 WebSub 구독 안 함
+WEBSUB_CALLBACK_BASE = os.getenv("WEBSUB_CALLBACK_BASE", "").rstrip("/")
+# 허브에 요청할 구독 기간 (초) / 만료 전 갱신 여유
+WEBSUB_LEASE_SECONDS = int(os.getenv("WEBSUB_LEASE_SECONDS", "864000"))
+WEBSUB_RENEW_BEFORE = timedelta(days=1)
+# 한 번에 허브를 탐색할 최대 피드 수 / 허브가 없던 피드를 다시 탐색하기까지 기간
+WEBSUB_DISCOVERY_BATCH = int(os.getenv("WEBSUB_DISCOVERY_BATCH", "100"))
+WEBSUB_REDISCOVER_AFTER = timedelta(days=7)
+# 허브 확인이 오지 않은 구독 요청을 다시 보내기까지 대기
+WEBSUB_PENDING_TIMEOUT = timedelta(hours=1)
+# 푸시 구독 중인 피드도 이 주기로는 폴링 (허브가 알림을 빠뜨려도 복구되도록)
+WEBSUB_FALLBACK_POLL = timedelta(hours=int(os.getenv("WEBSUB_FALLBACK_POLL_HOURS", "24")))
+# observer가 한 트랜잭션에서 처리할 푸시 본문 수
+PUSH_INBOX_BATCH_SIZE = int(os.getenv("PUSH_INBOX_BATCH_SIZE", "100"))
+
+# 구독 상태
+STATE_UNSUPPORTED = "unsupported"  # 피드가 허브를 광고하지 않음
+STATE_PENDING = "pending"  # 구독 요청 후 허브의 확인(GET 콜백) 대기
+STATE_ACTIVE = "active"  # 허브가 확인함, lease_expires_at까지 푸시 수신
+STATE_DENIED = "denied"  # 허브가 거부함
+STATE_FAILED = "failed"  # 구독 요청 자체가 실패함
+
+class PushedContent:
+    """푸시로 받은 피드 본문 DTO"""
+    __slots__ = ("id", "platform_name", "account_id", "content")
+
+    def __init__(self, id, platform_name, account_id, content):
+        self.id = id
+        self.platform_name = platform_name
+        self.account_id = account_id
+        self.content = content
+
+    def __repr__(self):
+        return f"PushedContent(id={self.id}, platform={self.platform_name}, account_id={self.account_id}, bytes={len(self.content)})"
+
+def is_enabled() -> bool:
+    return bool(WEBSUB_CALLBACK_BASE)
+
+def callback_url(subscription_id) -> str:
+    """구독별 콜백 URL (main_server의 websub 라우터)"""
+    return f"{WEBSUB_CALLBACK_BASE}/api/websub/callback/{subscription_id}"
+
+def discover_hub(response: httpx.Response) -> Tuple[Optional[str], Optional[str]]:
+    """
+    피드 응답에서 허브와 구독 주소(self) 탐색
+
+    Link 헤더를 먼저 보고, 없으면 본문의 <atom:link rel="hub"> / <link rel="hub">를 본다.
+
+    Args:
+        response: 피드 응답
+
+    Returns:
+        (hub_url, self_url), 없으면 None
+    """
+    hub = response.links.get("hub", {}).get("url")
+    topic = response.links.get("self", {}).get("url")
+
+    if hub is None:
+        feed = feedparser.parse(response.content).feed
+        for link in feed.get("links", []):
+            if link.get("rel") == "hub" and hub is None:
+                hub = link.get("href")
+            elif link.get("rel") == "self" and topic is None:
+                topic = link.get("href")
+
+    return hub, topic
+
+def request_subscription(hub_url: str, topic: str, subscription_id, secret: Optional[str]):
+    """
+    허브에 구독 요청 전송 (갱신도 같은 요청)
+
+    허브는 202를 돌려준 뒤 콜백으로 GET 확인 요청을 보내며, 확인은 main_server가 처리한다.
+
+    Raises:
+        httpx.HTTPError: 요청 실패 또는 허브가 거부한 경우
+    """
+    data = {
+        "hub.mode": "subscribe",
+        "hub.topic": topic,
+        "hub.callback": callback_url(subscription_id),
+        "hub.lease_seconds": str(WEBSUB_LEASE_SECONDS),
+    }
+    if secret:
+        data["hub.secret"] = secret
+
+    response = get_sync_client().post(hub_url, data=data)
+    response.raise_for_status()
+
+def _subscribe(db: Session, subscription: WebSubSubscription, now: datetime):
+    """구독 요청 후 상태 기록 (커밋은 호출자가)"""
+    try:
+        request_subscription(subscription.hub_url, subscription.topic, subscription.subscription_id, subscription.secret)
+        # 갱신 중인 active 구독은 확인이 올 때까지 기존 만료 시각으로 계속 수신
+        if subscription.state != STATE_ACTIVE:
+            subscription.state = STATE_PENDING
+        subscription.requested_at = now
+        subscription.last_error = None
+        logger.info(f"Requested WebSub subscription for {subscription.platform_name}/{subscription.account_id} via {subscription.hub_url}")
+    except httpx.HTTPError as e:
+        subscription.state = STATE_FAILED
+        subscription.last_error = f"{type(e).__name__}: {e}"[:500]
+        logger.warning(f"WebSub subscription failed for {subscription.platform_name}/{subscription.account_id}: {e}")
+
+def discover_feeds(limit: int = WEBSUB_DISCOVERY_BATCH) -> int:
+    """
+    아직 탐색하지 않았거나 탐색한 지 오래된 피드의 허브를 찾아 구독 요청
+
+    Args:
+        limit: 이번에 탐색할 최대 피드 수
+
+    Returns:
+        구독을 요청한 피드 수
+    """
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        feeds = db.query(
+            Platform.name.label('platform_name'),
+            UserPlatform.account_id
+        ).join(
+            Platform, UserPlatform.platform_id == Platform.platform_id
+        ).outerjoin(
+            WebSubSubscription,
+            (WebSubSubscription.platform_name == Platform.name)
+            & (WebSubSubscription.account_id == UserPlatform.account_id)
+        ).filter(
+            UserPlatform.account_id.isnot(None),
+            or_(
+                WebSubSubscription.subscription_id.is_(None),
+                and_(
+                    WebSubSubscription.state.in_([STATE_UNSUPPORTED, STATE_DENIED, STATE_FAILED]),
+                    WebSubSubscription.checked_at < now - WEBSUB_REDISCOVER_AFTER
+                )
+            )
+        ).distinct().limit(limit).all()
+
+        requested = 0
+        for feed in feeds:
+            parser = PARSER_MAP.get(feed.platform_name)
+            if parser is None:
+                continue
+
+            feed_url = parser.get_rss_url(feed.account_id)
+            subscription = db.query(WebSubSubscription).filter(
+                WebSubSubscription.platform_name == feed.platform_name,
+                WebSubSubscription.account_id == feed.account_id
+            ).first()
+            if subscription is None:
+                subscription = WebSubSubscription(
+                    platform_name=feed.platform_name,
+                    account_id=feed.account_id,
+                    topic=feed_url,
+                    state=STATE_UNSUPPORTED
+                )
+                db.add(subscription)
+                db.flush()
+            subscription.checked_at = now
+
+            try:
+                response = get_sync_client().get(feed_url)
+                response.raise_for_status()
+                hub, topic = discover_hub(response)
+            except httpx.HTTPError as e:
+                subscription.last_error = f"{type(e).__name__}: {e}"[:500]
+                continue
+
+            if hub is None:
+                subscription.state = STATE_UNSUPPORTED
+                continue
+
+            subscription.hub_url = hub
+            subscription.topic = topic or feed_url
+            subscription.secret = subscription.secret or secrets.token_hex(32)
+            _subscribe(db, subscription, now)
+            if subscription.state == STATE_PENDING:
+                requested += 1
+
+        db.commit()
+        logger.info(f"Discovered hubs for {len(feeds)} feeds, {requested} subscriptions requested")
+        return requested
+
+    except Exception as e:
+        logger.error(f"Failed to discover WebSub hubs: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
+def renew_subscriptions() -> int:
+    """
+    만료가 가까운 구독과 확인이 오지 않은 구독 요청을 다시 보냄
+
+    Returns:
+        다시 요청한 구독 수
+    """
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        subscriptions = db.query(WebSubSubscription).filter(
+            or_(
+                and_(
+                    WebSubSubscription.state == STATE_ACTIVE,
+                    WebSubSubscription.lease_expires_at < now + WEBSUB_RENEW_BEFORE
+                ),
+                and_(
+                    WebSubSubscription.state == STATE_PENDING,
+                    WebSubSubscription.requested_at < now - WEBSUB_PENDING_TIMEOUT
+                )
+            )
+        ).all()
+
+        for subscription in subscriptions:
+            _subscribe(db, subscription, now)
+
+        db.commit()
+        if subscriptions:
+            logger.info(f"Renewed {len(subscriptions)} WebSub subscriptions")
+        return len(subscriptions)
+
+    except Exception as e:
+        logger.error(f"Failed to renew WebSub subscriptions: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
+def maintain_subscriptions():
+    """허브 탐색 + 구독 갱신 (WEBSUB_CALLBACK_BASE가 없으면 아무것도 하지 않음)"""
+    if not is_enabled():
+        return
+
+    logger.info("=== Maintaining WebSub subscriptions ===")
+    discover_feeds()
+    renew_subscriptions()
+
+def claim_pushed_content(db: Session, batch_size: int = PUSH_INBOX_BATCH_SIZE) -> List[PushedContent]:
+    """
+    수신함에서 푸시 본문을 한 배치 선점 (FOR UPDATE SKIP LOCKED, 커밋은 호출자가)
+
+    Args:
+        db: DB 세션 (처리 결과와 같은 트랜잭션에서 delete_pushed_content 호출)
+        batch_size: 한 번에 가져올 최대 본문 수
+
+    Returns:
+        List[PushedContent]
+    """
+    rows = db.query(
+        WebSubInbox.id,
+        WebSubSubscription.platform_name,
+        WebSubSubscription.account_id,
+        WebSubInbox.content
+    ).join(
+        WebSubSubscription, WebSubSubscription.subscription_id == WebSubInbox.subscription_id
+    ).order_by(
+        WebSubInbox.id
+    ).limit(batch_size).with_for_update(of=WebSubInbox, skip_locked=True).all()
+
+    return [
+        PushedContent(id=row.id, platform_name=row.platform_name, account_id=row.account_id, content=row.content)
+        for row in rows
+    ]
+
+def delete_pushed_content(db: Session, ids: List[int]):
+    """처리한 푸시 본문 삭제 (커밋은 호출자가)"""
+    if ids:
+        db.query(WebSubInbox).filter(WebSubInbox.id.in_(ids)).delete(synchronize_session=False)
@@ -1,7 +1,20 @@
 import os
+import signal
+import asyncio
+import argparse
 import logging
 from dotenv import load_dotenv
-from app.services.observer_service import check_new_posts, check_inactive_users
+from sqlalchemy import text
+from app.dependencies.database import Base, engine
+from app.models import db_models
+from app.dependencies.rabbitmq import RabbitMQPublisher
+from app.services.shard_service import ShardSpec
+from app.services.observer_service import check_new_posts, check_inactive_users, check_pushed_posts
+from app.services.daemon_service import run_daemon
+from app.dependencies.parse_pool import create_parse_pool
+from app.services.failure_service import log_quarantine_report
+from app.services.outbox_service import run_relay
+from app.services import websub_service
 
 # 환경변수 로드
 load_dotenv()
@@ -16,21 +29,135 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Post Observer 메인 실행 함수 (인프라 크론잡에서 호출)"""
+    # 샤드 정보 (SHARD_INDEX / JOB_COMPLETION_INDEX, SHARD_COUNT, OBSERVER_RUN_ID)
+    shard = ShardSpec.from_env()
+
     logger.info("=" * 60)
-    logger.info("Post Observer Service Starting...")
+    logger.info(f"Post Observer Service Starting... ({shard})")
     logger.info("=" * 60)
 
-    # 새 글 체크
-    logger.info("Running check_new_posts...")
-    check_new_posts()
+    # 실행 전체에서 RabbitMQ 연결 하나를 공유 (종료 시 큐별 발행 통계 출력)
+    with RabbitMQPublisher() as publisher:
+        # 새 글 체크
+        logger.info("Running check_new_posts...")
+        check_new_posts(publisher, shard)
+
+        # 미업로드 사용자 체크
+        logger.info("Running check_inactive_users...")
+        check_inactive_users(publisher, shard) #여기서 rabbitmq메시지 발행됨 (아웃박스 경유)
+
+        if websub_service.is_enabled():
+            # WebSub 푸시로 쌓인 본문 처리
+            logger.info("Running check_pushed_posts...")
+            check_pushed_posts(publisher)
 
-    # 미업로드 사용자 체크
-    logger.info("Running check_inactive_users...")
-    check_inactive_users() #여기서 rabbitmq메시지 발행됨
+            # 허브 탐색 및 구독 갱신은 첫 샤드만
+            if shard.index == 0:
+                websub_service.maintain_subscriptions()
 
     logger.info("=" * 60)
     logger.info("Post Observer Service Completed")
     logger.info("=" * 60)
 
+def daemon():
+    """Post Observer 상주 모드 (내부 일정으로 반복 실행, SIGTERM 시 정상 종료)"""
+    shard = ShardSpec.from_env()
+
+    logger.info("=" * 60)
+    logger.info(f"Post Observer Daemon Starting... ({shard})")
+    logger.info("=" * 60)
+
+    # 파싱 워커는 이벤트 루프와 브로커/HTTP 연결을 만들기 전에 fork
+    parse_pool = create_parse_pool()
+    try:
+        asyncio.run(run_daemon(shard, parse_pool))
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+# main_server가 만들고 소유하는 테이블 (관측기는 만들지 않음)
+MAIN_SERVER_TABLES = {"USER", "PLATFORM", "USER_PLATFORM"}
+
+def _ensure_user_platform_index():
+    """
+    USER_PLATFORM의 피드 순서 인덱스 보장 (main_server 모델에 정의, 기존 DB에는 여기서 추가)
+
+    운영 중인 테이블의 쓰기를 막지 않도록 CONCURRENTLY로 만들며 (트랜잭션 밖에서 실행),
+    이전에 중단되어 INVALID로 남은 인덱스는 지우고 다시 만든다.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        invalid = conn.execute(text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = 'ix_user_platform_feed' AND NOT i.indisvalid
+        """)).first()
+        if invalid:
+            logger.warning("Dropping invalid index ix_user_platform_feed left by an interrupted build")
+            conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_user_platform_feed"))
+
+        conn.execute(text(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_platform_feed ON "USER_PLATFORM" (platform_id, id, user_id)'
+        ))
+
+def migrate():
+    """
+    관측기 전용 테이블 생성 (FEED_CACHE 등) + USER_PLATFORM 인덱스 보장
+
+    샤드 파드들이 동시에 시작하면서 DDL을 경쟁적으로 실행하지 않도록,
+    배포 때 한 번만 실행한다 (Helm pre-install / pre-upgrade 훅).
+    """
+    logger.info("Creating observer tables...")
+    tables = [table for name, table in Base.metadata.tables.items() if name not in MAIN_SERVER_TABLES]
+    Base.metadata.create_all(bind=engine, tables=tables)
+
+    logger.info("Ensuring USER_PLATFORM index...")
+    _ensure_user_platform_index()
+    logger.info("Migration completed")
+
+def relay():
+    """아웃박스 릴레이 단독 실행 (수집 파드와 분리해서 띄울 때, SIGTERM 시 정상 종료)"""
+    stopped = []
+
+    def request_stop(signum, frame):
+        stopped.append(signum)
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, request_stop)
+
+    with RabbitMQPublisher() as publisher:
+        run_relay(publisher, lambda: bool(stopped))
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Post Observer")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        default=os.getenv("OBSERVER_MODE") == "daemon",
+        help="상주 모드로 실행 (OBSERVER_MODE=daemon 과 동일)"
+    )
+    parser.add_argument(
+        "--report-quarantine",
+        action="store_true",
+        help="격리 중인 피드 목록만 출력하고 종료"
+    )
+    parser.add_argument(
+        "--relay",
+        action="store_true",
+        help="아웃박스 릴레이만 상주 실행"
+    )
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="관측기 테이블을 만들고 종료 (배포 시 한 번)"
+    )
+    args = parser.parse_args()
+
+    if args.migrate:
+        migrate()
+    elif args.report_quarantine:
+        log_quarantine_report()
+    elif args.relay:
+        relay()
+    elif args.daemon:
+        daemon()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,189 @@
+#로컬 WebSub 허브 대역: main_server 콜백의 구독 확인/서명 검증과 observer의 푸시 처리 경로를 실제 허브 없이 확인
+#
+# 사용 순서
+#   1. python simulate_websub_hub.py serve                          # 허브 실행 (기본 http://localhost:8765)
+#   2. python simulate_websub_hub.py subscribe tistory <blogId>     # 구독 행 생성 + 허브에 구독 요청 -> 허브가 main_server 콜백으로 확인
+#   3. python simulate_websub_hub.py publish tistory <blogId> feed.xml   # 허브가 서명한 본문을 구독자 콜백으로 전달
+#   4. python -c "from app.services.observer_service import check_pushed_posts; check_pushed_posts()"
+#
+# WEBSUB_CALLBACK_BASE (예: http://localhost:8000)와 DATABASE_URL이 설정되어 있어야 함
+import os
+import sys
+import hmac
+import hashlib
+import secrets
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from datetime import datetime
+import httpx
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('WebSubHubSimulator')
+
+# --- 설정 ---
+HUB_PORT = int(os.getenv("WEBSUB_HUB_PORT", "8765"))
+HUB_URL = f"http://localhost:{HUB_PORT}/"
+
+# topic -> {callback: secret}
+subscriptions = {}
+subscriptions_lock = threading.Lock()
+
+def _verify_and_store(topic: str, callback: str, secret: str, lease_seconds: str):
+    """구독자 콜백으로 확인 요청을 보내고, challenge가 그대로 돌아오면 구독 등록"""
+    challenge = secrets.token_urlsafe(16)
+    try:
+        response = httpx.get(callback, params={
+            "hub.mode": "subscribe",
+            "hub.topic": topic,
+            "hub.challenge": challenge,
+            "hub.lease_seconds": lease_seconds,
+        }, timeout=10.0)
+    except httpx.HTTPError as e:
+        logger.error(f"❌ 확인 요청 실패: {callback} ({e})")
+        return
+
+    if response.status_code == 200 and response.text == challenge:
+        with subscriptions_lock:
+            subscriptions.setdefault(topic, {})[callback] = secret
+        logger.info(f"✅ 구독 확인 완료: {topic} -> {callback}")
+    else:
+        logger.warning(f"❌ 구독 확인 거절: {callback} (status={response.status_code})")
+
+def _distribute(topic: str, body: bytes) -> int:
+    """topic 구독자 모두에게 서명한 본문 전달"""
+    with subscriptions_lock:
+        targets = dict(subscriptions.get(topic, {}))
+
+    for callback, secret in targets.items():
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        try:
+            response = httpx.post(callback, content=body, headers={
+                "Content-Type": "application/rss+xml",
+                "X-Hub-Signature": f"sha256={signature}",
+                "Link": f'<{HUB_URL}>; rel="hub", <{topic}>; rel="self"',
+            }, timeout=10.0)
+            logger.info(f"   전달: {callback} (status={response.status_code})")
+        except httpx.HTTPError as e:
+            logger.error(f"❌ 전달 실패: {callback} ({e})")
+
+    return len(targets)
+
+class HubHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        url = urlparse(self.path)
+
+        # 시뮬레이터 전용: 발행 (본문을 구독자에게 전달)
+        if url.path == "/publish":
+            topic = parse_qs(url.query).get("topic", [""])[0]
+            delivered = _distribute(topic, body)
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(str(delivered).encode())
+            return
+
+        # WebSub 구독 요청
+        form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        if form.get("hub.mode") != "subscribe" or not form.get("hub.callback") or not form.get("hub.topic"):
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        self.send_response(202)
+        self.end_headers()
+
+        # 확인은 응답 후 비동기로 (실제 허브와 같은 순서)
+        threading.Thread(target=_verify_and_store, args=(
+            form["hub.topic"], form["hub.callback"], form.get("hub.secret", ""), form.get("hub.lease_seconds", "864000")
+        ), daemon=True).start()
+
+    def log_message(self, format, *args):
+        logger.info(f"hub: {format % args}")
+
+def serve():
+    logger.info("=" * 50)
+    logger.info(f"WebSub 허브 시뮬레이터 시작 ({HUB_URL})")
+    logger.info("=" * 50)
+    ThreadingHTTPServer(("0.0.0.0", HUB_PORT), HubHandler).serve_forever()
+
+def subscribe(platform_name: str, account_id: str):
+    """구독 행을 만들고 로컬 허브에 구독 요청 (허브 탐색 단계를 대신함)"""
+    from app.dependencies.database import Base, engine, SessionLocal
+    from app.models.db_models import WebSubSubscription
+    from app.services import websub_service
+    from app.services.rss_service import PARSER_MAP
+
+    if not websub_service.is_enabled():
+        logger.error("❌ WEBSUB_CALLBACK_BASE 환경 변수가 설정되지 않았습니다.")
+        sys.exit(1)
+
+    Base.metadata.create_all(bind=engine)
+    topic = PARSER_MAP[platform_name].get_rss_url(account_id)
+
+    db = SessionLocal()
+    try:
+        subscription = db.query(WebSubSubscription).filter(
+            WebSubSubscription.platform_name == platform_name,
+            WebSubSubscription.account_id == account_id
+        ).first()
+        if subscription is None:
+            subscription = WebSubSubscription(platform_name=platform_name, account_id=account_id, topic=topic, state="pending")
+            db.add(subscription)
+
+        subscription.hub_url = HUB_URL
+        subscription.topic = topic
+        subscription.secret = subscription.secret or secrets.token_hex(32)
+        subscription.state = "pending"
+        subscription.requested_at = datetime.now()
+        db.commit()
+
+        websub_service.request_subscription(HUB_URL, topic, subscription.subscription_id, subscription.secret)
+        logger.info(f"✅ 구독 요청 완료: {topic} (콜백 {websub_service.callback_url(subscription.subscription_id)})")
+        logger.warning("   (허브 로그에서 구독 확인 결과를 확인하세요)")
+    finally:
+        db.close()
+
+def publish(platform_name: str, account_id: str, feed_path: str):
+    """로컬 허브에 발행 요청 (허브가 서명해서 구독자 콜백으로 전달)"""
+    from app.services.rss_service import PARSER_MAP
+
+    topic = PARSER_MAP[platform_name].get_rss_url(account_id)
+    with open(feed_path, "rb") as f:
+        body = f.read()
+
+    response = httpx.post(f"{HUB_URL}publish", params={"topic": topic}, content=body, timeout=30.0)
+    response.raise_for_status()
+    logger.info(f"✅ {topic} 구독자 {response.text}곳에 전달")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSub 허브 시뮬레이터")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve")
+    sub = commands.add_parser("subscribe")
+    sub.add_argument("platform")
+    sub.add_argument("account_id")
+    pub = commands.add_parser("publish")
+    pub.add_argument("platform")
+    pub.add_argument("account_id")
+    pub.add_argument("feed_path")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve()
+    elif args.command == "subscribe":
+        subscribe(args.platform, args.account_id)
+    else:
+        publish(args.platform, args.account_id, args.feed_path)